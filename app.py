@@ -1,45 +1,84 @@
-import altair as alt
+"""Streamlit page for the SOPL dashboard (``streamlit run app.py``).
+
+Importing this module has no side effects: the page is configured and drawn by ``main()``.
+Data loading and aggregation live in ``sopl_dashboard.core``, chart specs in
+``sopl_dashboard.charts``.
+"""
+import base64
+import contextvars
+import functools
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
-import re
-import base64
-from pathlib import Path
 
-# ==================== PAGE CONFIG ====================
-st.set_page_config(
-    page_title="SOPL 2025 - Partnership Analytics",
-    page_icon="PL_transparent_1080.ico",
-    layout="wide",
+import report_export
+from sopl_dashboard.charts import (
+    bar_chart_spec,
+    chart_rows,
+    donut_chart_spec,
+    grouped_bar_chart_spec,
+    with_comparison,
+    with_split,
+)
+from sopl_dashboard.core import (
+    CURRENT_SURVEY_YEAR,
+    DASHBOARD_TABS,
+    EMPLOYEE_ORDER,
+    FETCH_TIMEOUT_S,
+    NORMALIZATION_RULES,
+    REFRESH_BACKOFF_MAX_S,
+    REFRESH_INTERVAL_S,
+    REFRESH_RETRY_S,
+    REVENUE_ORDER,
+    SEGMENT_ORDERS,
+    SNAPSHOT_MAX_AGE_S,
+    AggregateCache,
+    DatasetStore,
+    RerunProfile,
+    RowSubset,
+    aggregate_rows,
+    annotate_profile,
+    build_column_catalog,
+    dataset_version,
+    layout_charts,
+    ordered_pct,
+    profile_columns,
+    profiling,
+    resolve_chart_spec,
+    schema_hash,
+    selection_key,
+    short_label,
+    spec_columns,
+    timed,
 )
 
-# ==================== BRAND COLORS ====================
-PL_CORE = {
-    "amaranth": "#EC3D72",
-    "casablanca": "#F9A644",
-    "minsk": "#3B308F",
-}
-PL_TINTS = {
-    "amaranth_light": "#F25A8A",
-    "casablanca_light": "#FBB85F",
-    "minsk_light": "#5146A1",
-}
-
-PL_COLORS = [
-    PL_CORE["minsk"],
-    PL_CORE["amaranth"],
-    PL_CORE["casablanca"],
-    PL_TINTS["minsk_light"],
-    PL_TINTS["amaranth_light"],
-    PL_TINTS["casablanca_light"],
-]
+# re-exported for scripts and tests that import them from app
+from sopl_dashboard.core import (  # noqa: F401
+    ACTIVE_PARTNERS_MAP,
+    TOTAL_PARTNERS_MAP,
+    mid_from_bins,
+    normalize,
+)
+from sopl_dashboard.core import repair_replacement_chars as _repair_replacement_chars  # noqa: F401
 
 TOP_N_DEFAULT = 4  # default max categories per chart
+EXTRA_INSIGHTS_MAX = 10  # charts on the Additional Insights tab
+CHART_SPEC_CACHE_SIZE = 1024  # finished Vega-Lite JSON specs
+REPORT_CACHE_SIZE = 16  # finished report ZIPs, keyed by (dataset version, selection, format)
+SPLIT_GROUPED_MAX = 4  # segment splits with more segments are drawn as one panel per segment
 
+# "Split charts by" choices (label -> filter dimension) and the order segments are drawn in
+SPLIT_DIMENSIONS = {"Region": "region", "Annual revenue": "revenue", "Employees": "employees"}
 
-# ==================== CSS / THEME ====================
-st.markdown(
-    """
+
+# ==================== PAGE CONFIG / CSS ====================
+PAGE_CSS = """
 <style>
 html, body, .stApp {
     background-color: #f8fafc !important;
@@ -217,6 +256,34 @@ main.block-container {
     background: linear-gradient(90deg, #ec3d72, #f97373);
 }
 
+/* Lazy tab selector: radio styled like the tab bar */
+.stRadio [role="radiogroup"] {
+    gap: 8px;
+    background-color: #020617;
+    padding: 4px;
+    border-radius: 12px;
+}
+.stRadio [role="radiogroup"] label {
+    font-size: 0.95rem;
+    font-weight: 600;
+    border-radius: 999px;
+    padding: 8px 18px;
+    margin: 0;
+    color: #e5e7eb !important;
+    transition: all 0.18s ease;
+}
+.stRadio [role="radiogroup"] label > div:first-child {
+    display: none;
+}
+.stRadio [role="radiogroup"] label:has(input:checked) {
+    background-color: #3b308f;
+    color: #ffffff !important;
+    box-shadow: 0 0 0 1px #3b308f, 0 10px 18px rgba(0,0,0,0.35);
+}
+.stRadio [role="radiogroup"] label p {
+    color: inherit !important;
+}
+
 /* Altair / Vega */
 .vega-embed .vega-actions {
     background: #ffffff !important;
@@ -292,168 +359,145 @@ main.block-container {
     display: none !important;
 }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
 
-# ==================== ALTAIR THEME ====================
-def atlas_light_theme():
-    return {
-        "config": {
-            "view": {"stroke": "transparent"},
-            "background": "#ffffff",
-            "range": {"category": PL_COLORS},
-            "axis": {
-                "labelColor": "#475569",
-                "titleColor": "#020617",
-                "titleFontWeight": 600,
-                "labelFontWeight": 600,
-                "gridColor": "#f1f5f9",
-                "domainColor": "#d4d4d8",
-                "labelLimit": 0,
-                "labelFontSize": 11,
-                "titleFontSize": 12,
-            },
-            "legend": {
-                "labelColor": "#475569",
-                "titleColor": "#020617",
-                "titleFontWeight": 700,
-                "labelFontWeight": 600,
-                "labelFontSize": 14,
-                "titleFontSize": 14,
-                "symbolSize": 200,
-                "symbolType": "circle",
-            },
-            "title": {
-                "color": "#020617",
-                "fontSize": 16,
-                "fontWeight": 700,
-                "anchor": "start",
-                "offset": 12,
-            },
-        }
-    }
 
-alt.themes.register("atlas_light", atlas_light_theme)
-alt.themes.enable("atlas_light")
+def setup_page(year: int):
+    """Page config and the global stylesheet; must run before anything else is drawn."""
+    st.set_page_config(
+        page_title=f"SOPL {year} - Partnership Analytics",
+        page_icon="PL_transparent_1080.ico",
+        layout="wide",
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
-alt.data_transformers.disable_max_rows()
-alt.renderers.set_embed_options(
-    actions={"export": True, "source": False, "compiled": False, "editor": False}
-)
 
-# ==================== DATA / UTILS ====================
-@st.cache_data(show_spinner=True)
-def load_data() -> pd.DataFrame:
-    url = st.secrets.get("gsheet_url", None)
-    if not url:
-        st.error(
-            "❌ Missing gsheet_url in Streamlit secrets. Add it in your app settings as `gsheet_url = \"...\"`."
-        )
-        return pd.DataFrame()
+# ==================== UI HELPERS ====================
+DIAGNOSTICS_QUERY_PARAM = "diagnostics"
+profile_logger = logging.getLogger("sopl.profile")
 
-    encodings = ["utf-8", "utf-8-sig", "cp1252", "latin-1"]
-    for enc in encodings:
-        try:
-            df = pd.read_csv(url, encoding=enc)
-            return df
-        except Exception:
-            continue
 
-    st.error("❌ Could not load Google Sheet. Check the export URL and sharing settings.")
-    return pd.DataFrame()
+@functools.lru_cache(maxsize=16)
+def _encode_file_base64(path: str, mtime_ns: int) -> str | None:
+    # mtime_ns is part of the cache key only: a replaced file gets re-encoded
+    try:
+        return base64.b64encode(Path(path).read_bytes()).decode("utf-8")
+    except Exception:
+        return None
 
 
 def img_to_base64(path: str) -> str | None:
-    p = Path(path)
-    if not p.exists():
-        return None
+    """Base64 of an image, encoded once per process and file version."""
     try:
-        data = p.read_bytes()
-        return base64.b64encode(data).decode("utf-8")
-    except Exception:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except OSError:
         return None
+    return _encode_file_base64(str(path), mtime_ns)
 
 
-def value_counts_pct(series: pd.Series) -> pd.DataFrame:
-    s = series.dropna()
-    if s.empty:
-        return pd.DataFrame(columns=["category", "pct"])
-    counts = s.value_counts()
-    total_non_null = len(s)
-    pct = (counts / total_non_null) * 100.0
-    out = pct.reset_index()
-    out.columns = ["category", "pct"]
-    return out
-
-
-def binned_pct_custom(series: pd.Series, edges: list[float], labels: list[str]) -> pd.DataFrame:
-    s = pd.to_numeric(series, errors="coerce").dropna()
-    if s.empty:
-        return pd.DataFrame(columns=["bin", "pct"])
-    binned = pd.cut(s, bins=edges, labels=labels, include_lowest=True, right=False)
-    pct_df = value_counts_pct(binned).rename(columns={"category": "bin"})
-    return pct_df
-
-
-def _default_label_from_col(col_name: str) -> str:
-    if '"' in col_name:
-        parts = col_name.split('"')
-        if len(parts) >= 3:
-            return parts[1].strip()
-    if " – " in col_name:
-        return col_name.split(" – ", 1)[0].split("?")[-1].strip()
-    if "? " in col_name:
-        return col_name.split("? ", 1)[1].strip()
-    return col_name.strip()
-
-
-def multi_select_to_pct(
-    df: pd.DataFrame, cols: list[str], label_parser=_default_label_from_col
-) -> pd.DataFrame:
-    if not cols:
-        return pd.DataFrame(columns=["category", "pct"])
-    sub = df[cols].apply(pd.to_numeric, errors="coerce")
-    n_resp = sub.notna().any(axis=1).sum()
-    if n_resp == 0:
-        return pd.DataFrame(columns=["category", "pct"])
-    counts = sub.sum(skipna=True)
-    out = counts.reset_index()
-    out.columns = ["col", "count"]
-    out["category"] = out["col"].apply(label_parser)
-    out["pct"] = (out["count"] / n_resp) * 100.0
-    return out[["category", "pct"]].sort_values("pct", ascending=False)
+@st.cache_resource(show_spinner=False)
+def get_aggregate_cache() -> AggregateCache:
+    return AggregateCache()
 
 
 def create_section_header(title: str):
     st.markdown(f'<div class="section-header">{title}</div>', unsafe_allow_html=True)
 
 
-def donut_chart_clean(df_pct: pd.DataFrame, cat_field: str, pct_field: str, title: str):
-    if df_pct.empty:
+_REPORT_COLLECTOR: contextvars.ContextVar = contextvars.ContextVar("sopl_report", default=None)
+
+
+@st.cache_resource(show_spinner=False)
+def get_chart_spec_cache() -> AggregateCache:
+    return AggregateCache(maxsize=CHART_SPEC_CACHE_SIZE)
+
+
+def cached_chart_spec(key: tuple, build) -> str:
+    """Vega-Lite JSON for ``key``, built (and schema-validated) by Altair only on a miss."""
+    with timed(f"chart spec · {short_label(key[1])}") as rec:
+        rec["cache"] = "hit"
+
+        def build_and_flag():
+            rec["cache"] = "miss"
+            return build()
+
+        spec = get_chart_spec_cache().get_or_compute(key, build_and_flag)
+        rec["bytes"] = len(spec)
+    return spec
+
+
+def render_vega_spec(spec_json: str, title: str = ""):
+    collector = _REPORT_COLLECTOR.get()
+    if collector is not None:
+        collector.append((title, spec_json))
         return
-    data = df_pct.copy().rename(columns={pct_field: "Percent"})
-    data[cat_field] = data[cat_field].astype(str)
-
-    base = alt.Chart(data).encode(
-        theta=alt.Theta("Percent:Q", stack=True),
-        color=alt.Color(
-            f"{cat_field}:N",
-            legend=alt.Legend(title=None, orient="right"),
-            scale=alt.Scale(range=PL_COLORS),
+    with timed(f"serialize · {short_label(title)}") as rec:
+        rec["bytes"] = len(spec_json)
+        # st.vega_lite_chart pops the datasets out of the dict it is given, so always pass a fresh one
+        st.vega_lite_chart(json.loads(spec_json), use_container_width=True)
+
+
+def comparison_chart(df_pct: pd.DataFrame, cat_field: str, pct_field: str, title: str):
+    """Grouped bars of the current wave next to the compared one, in ``df_pct``'s category order."""
+    compare = df_pct.attrs["compare"]
+    years, prior = compare["years"], compare["prior"]
+    rows = tuple(
+        (cat, year, pct)
+        for cat, current in chart_rows(df_pct, cat_field, pct_field)
+        for year, pct in ((years[0], current), (years[1], prior.get(cat, 0.0)))
+    )
+    render_vega_spec(
+        cached_chart_spec(
+            ("compare", title, rows, cat_field),
+            lambda: grouped_bar_chart_spec(rows, cat_field, "Year", title, years),
         ),
-        tooltip=[f"{cat_field}:N", alt.Tooltip("Percent:Q", format=".1f")],
+        title,
     )
 
-    donut = base.mark_arc(innerRadius=70, stroke="#fff", strokeWidth=2)
 
-    chart = donut.properties(
-        width=400,
-        height=320,
-        title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
-    ).configure_view(strokeWidth=0)
+def split_chart(df_pct: pd.DataFrame, cat_field: str, title: str):
+    """One bar per segment for each of ``df_pct``'s categories; panels instead of groups for many segments."""
+    split = df_pct.attrs["split"]
+    segments = split["segments"]
+    cat_rank = {cat: i for i, cat in enumerate(df_pct[cat_field].astype(str))}
+    seg_rank = {seg: i for i, seg in enumerate(segments)}
+    rows = tuple(
+        sorted(
+            ((cat, seg, pct) for seg, cat, pct in split["rows"] if cat in cat_rank and seg in seg_rank),
+            key=lambda r: (cat_rank[r[0]], seg_rank[r[1]]),
+        )
+    )
+    facet = len(segments) > SPLIT_GROUPED_MAX
+    render_vega_spec(
+        cached_chart_spec(
+            ("split", title, rows, cat_field, split["dim"], facet),
+            lambda: grouped_bar_chart_spec(rows, cat_field, split["dim"], title, segments, facet),
+        ),
+        title,
+    )
+
 
-    st.altair_chart(chart, use_container_width=True)
+def grouped_view(df_pct: pd.DataFrame, cat_field: str, pct_field: str, title: str) -> bool:
+    """Draw ``df_pct`` as a segment split or a year comparison if it is tagged for one."""
+    if df_pct.attrs.get("split"):
+        split_chart(df_pct, cat_field, title)
+        return True
+    if df_pct.attrs.get("compare"):
+        comparison_chart(df_pct, cat_field, pct_field, title)
+        return True
+    return False
+
+
+def donut_chart_clean(df_pct: pd.DataFrame, cat_field: str, pct_field: str, title: str):
+    if df_pct.empty:
+        return
+    if grouped_view(df_pct, cat_field, pct_field, title):
+        return
+    rows = chart_rows(df_pct, cat_field, pct_field)
+    render_vega_spec(
+        cached_chart_spec(("donut", title, rows, cat_field), lambda: donut_chart_spec(rows, cat_field, title)),
+        title,
+    )
 
 
 def bar_chart_from_pct(
@@ -468,146 +512,86 @@ def bar_chart_from_pct(
     if df_pct.empty:
         return
 
-    data = df_pct.copy().rename(columns={pct_field: "Percent"})
-    data[cat_field] = data[cat_field].astype(str)
-
-    data = data.sort_values("Percent", ascending=False)
+    data = df_pct.sort_values(pct_field, ascending=False)
     if min_pct is not None:
-        data = data[data["Percent"] >= min_pct]
+        data = data[data[pct_field] >= min_pct]
     if max_categories is not None and len(data) > max_categories:
         data = data.iloc[:max_categories]
 
     if data.empty:
         return
+    if grouped_view(data, cat_field, pct_field, title):
+        return
 
-    data["PercentLabel"] = data["Percent"].map(lambda v: f"{v:.1f}%")
-
-    if horizontal:
-        base = alt.Chart(data).encode(
-            x=alt.X(
-                "Percent:Q",
-                title="Share of respondents (%)",
-                axis=alt.Axis(format=".0f", grid=True, gridColor="#f1f5f9"),
-            ),
-            y=alt.Y(
-                f"{cat_field}:N",
-                sort="-x",
-                title=None,
-                axis=alt.Axis(labelOverlap=False),
-            ),
-            color=alt.Color(
-                f"{cat_field}:N",
-                legend=None,
-                scale=alt.Scale(range=PL_COLORS),
-            ),
-            tooltip=[
-                f"{cat_field}:N",
-                alt.Tooltip("Percent:Q", format=".1f", title="Percentage"),
-            ],
-        )
+    rows = chart_rows(data, cat_field, pct_field)
+    render_vega_spec(
+        cached_chart_spec(
+            ("bar", title, rows, cat_field, horizontal),
+            lambda: bar_chart_spec(rows, cat_field, title, horizontal),
+        ),
+        title,
+    )
 
-        bars = base.mark_bar(cornerRadius=4)
-        labels = base.mark_text(
-            align="left",
-            baseline="middle",
-            dx=4,
-            color="#020617",
-            fontWeight=600,
-        ).encode(text=alt.Text("PercentLabel:N"))
-
-        chart = (bars + labels).properties(
-            height=max(260, 32 * len(data)),
-            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
-        ).configure_axisY(labelPadding=8)
-    else:
-        base = alt.Chart(data).encode(
-            x=alt.X(
-                f"{cat_field}:N",
-                sort="-y",
-                title=None,
-                axis=alt.Axis(labelOverlap=False, labelAngle=0),
-            ),
-            y=alt.Y(
-                "Percent:Q",
-                title="Share of respondents (%)",
-                axis=alt.Axis(format=".0f", grid=True, gridColor="#f1f5f9"),
-            ),
-            color=alt.Color(
-                f"{cat_field}:N",
-                legend=None,
-                scale=alt.Scale(range=PL_COLORS),
-            ),
-            tooltip=[
-                f"{cat_field}:N",
-                alt.Tooltip("Percent:Q", format=".1f", title="Percentage"),
-            ],
-        )
 
-        bars = base.mark_bar(cornerRadius=4)
-        labels = base.mark_text(
-            align="center",
-            baseline="bottom",
-            dy=-6,
-            color="#020617",
-            fontWeight=600,
-        ).encode(text=alt.Text("PercentLabel:N"))
-
-        chart = (bars + labels).properties(
-            height=320,
-            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
-        )
+@st.cache_resource(show_spinner=False)
+def get_dataset_store(url: str, partition: str = "") -> DatasetStore:
+    return DatasetStore(
+        url,
+        partition,
+        refresh_interval=float(st.secrets.get("refresh_interval_seconds", REFRESH_INTERVAL_S)),
+        fetch_timeout=float(st.secrets.get("fetch_timeout_seconds", FETCH_TIMEOUT_S)),
+        retry_after=float(st.secrets.get("refresh_retry_seconds", REFRESH_RETRY_S)),
+        backoff_max=float(st.secrets.get("refresh_backoff_max_seconds", REFRESH_BACKOFF_MAX_S)),
+        max_age=float(st.secrets.get("snapshot_max_age_seconds", SNAPSHOT_MAX_AGE_S)),
+    )
 
-    st.altair_chart(chart, use_container_width=True)
 
+def survey_sources() -> dict[int, tuple[str, str]]:
+    """Survey year -> (sheet URL, snapshot partition), newest first.
 
-def normalize_region_label(x):
-    if pd.isna(x):
+    ``gsheet_url`` is the current wave and keeps the unpartitioned snapshot; earlier
+    waves come from the ``[gsheet_urls]`` table (year = URL) and each get their own.
+    """
+    sources = {int(year): (url, str(year)) for year, url in dict(st.secrets.get("gsheet_urls", {})).items() if url}
+    url = st.secrets.get("gsheet_url", None)
+    if url:
+        sources[int(st.secrets.get("survey_year", CURRENT_SURVEY_YEAR))] = (url, "")
+    return dict(sorted(sources.items(), reverse=True))
+
+
+def shown_survey_year(years: list[int]) -> int:
+    """The wave the page is about: the one picked in "Survey year", else the newest configured."""
+    year = st.session_state.get("survey_year") if len(years) > 1 else None
+    return year or (years[0] if years else CURRENT_SURVEY_YEAR)
+
+
+def load_data(year: int | None = None) -> DatasetStore | None:
+    """The shared store for ``year`` (default: newest), with a snapshot unless its very first load failed.
+
+    Stores are created on first use, so a wave nobody selects is never fetched or parsed.
+    """
+    sources = survey_sources()
+    if not sources:
+        st.error(
+            "❌ Missing gsheet_url in Streamlit secrets. Add it in your app settings as `gsheet_url = \"...\"`."
+        )
         return None
-    s = str(x)
-    if "North America" in s:
-        return "North America"
-    if "Latin America" in s:
-        return "Latin America"
-    if "Asia-Pacific" in s or "Asia Pacific" in s or "APAC" in s:
-        return "Asia Pacific"
-    if "Europe" in s or "EMEA" in s:
-        return "Europe"
-    return s
-
-
-def find_col(df: pd.DataFrame, exact: str | None = None, substrings: list[str] | None = None):
-    if exact and exact in df.columns:
-        return exact
-    if substrings:
-        for s in substrings:
-            matches = [c for c in df.columns if s in c]
-            if matches:
-                return matches[0]
-    return None
-
-
-def normalize_yes_no(series: pd.Series) -> pd.Series:
-    s = series.dropna()
-    if s.empty:
-        return series
-    coerced = pd.to_numeric(series, errors="coerce")
-    if coerced.notna().any() and coerced.dropna().isin([0, 1]).all():
-        return coerced.map({1: "Yes", 0: "No"})
-    lower = series.astype(str).str.strip().str.lower()
-    mapping = {
-        "1": "Yes",
-        "1.0": "Yes",
-        "true": "Yes",
-        "yes": "Yes",
-        "y": "Yes",
-        "0": "No",
-        "0.0": "No",
-        "false": "No",
-        "no": "No",
-        "n": "No",
-    }
-    mapped = lower.map(mapping)
-    return mapped.where(mapped.notna(), series.astype(str))
+    url, partition = sources.get(year, next(iter(sources.values())))
+    store = get_dataset_store(url, partition)
+    if store.snapshot is None:
+        with st.spinner("Loading survey data…"):
+            store.current()
+    if store.snapshot is None:
+        st.error("❌ Could not load Google Sheet. Check the export URL and sharing settings.")
+        return None
+    if store.failures:
+        st.warning("⚠️ Could not reach the Google Sheet; showing the last loaded data while retrying.")
+    return store
+
+
+@st.cache_data(show_spinner=False)
+def build_column_profile(_df: pd.DataFrame, version: str) -> pd.DataFrame:
+    return profile_columns(_df)
 
 
 def render_chart_card(chart_fn):
@@ -628,6 +612,46 @@ def two_up_grid(left_has: bool, left_fn, right_has: bool, right_fn):
             render_chart_card(right_fn)
 
 
+def render_registered_chart(chart_def: dict, pct: pd.DataFrame):
+    cat_field = "bin" if "bin" in pct.columns else "category"
+    pct = ordered_pct(chart_def, pct)
+    max_categories = chart_def.get("max_categories", TOP_N_DEFAULT)
+    if chart_def["kind"] == "bin_or_vc" and cat_field != "bin":
+        max_categories = TOP_N_DEFAULT  # text answers that couldn't be binned: a plain answer-share chart
+    if chart_def["view"] == "donut":
+        donut_chart_clean(pct, cat_field, "pct", chart_def["title"])
+    else:
+        bar_chart_from_pct(
+            pct,
+            cat_field,
+            "pct",
+            chart_def["title"],
+            horizontal=chart_def.get("horizontal", True),
+            max_categories=max_categories,
+        )
+
+
+def render_layout(layout: list, results: dict[str, pd.DataFrame]):
+    """Draw a tab layout; charts without a (non-empty) aggregate in ``results`` are left out."""
+
+    def card(chart_def):
+        pct = results.get(chart_def["title"])
+        has = pct is not None and not pct.empty
+        return has, (lambda: render_registered_chart(chart_def, pct))
+
+    for entry in layout:
+        if isinstance(entry, str):
+            create_section_header(entry)
+        elif isinstance(entry, tuple):
+            left_has, left_fn = card(entry[0])
+            right_has, right_fn = card(entry[1]) if len(entry) > 1 else (False, lambda: None)
+            two_up_grid(left_has, left_fn, right_has, right_fn)
+        else:
+            has, fn = card(entry)
+            if has:
+                render_chart_card(fn)
+
+
 def clean_question_title(col_name: str) -> str:
     title = re.sub(r"_Column\d+", "", col_name)
     title = title.replace("_", " ")
@@ -674,18 +698,192 @@ def render_filter_pills(selected_regions, selected_revenue, selected_employees):
     st.markdown(html, unsafe_allow_html=True)
 
 
+def render_year_picker(years: list[int]) -> tuple[int | None, int | None]:
+    """Survey wave to show and an optional wave to compare it with; only offered once there are two."""
+    if len(years) < 2:
+        return (years[0] if years else None), None
+    col_year, col_compare = st.columns(2)
+    with col_year:
+        year = st.selectbox("Survey year", years, key="survey_year")
+    with col_compare:
+        compare_year = st.selectbox(
+            "Compare with",
+            [None] + [y for y in years if y != year],
+            format_func=lambda y: "No comparison" if y is None else f"SOPL {y}",
+            key="compare_year",
+        )
+    return year, compare_year
+
+
+def render_data_as_of(as_of: float | None, n_rows: int):
+    stamp = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(as_of)) if as_of else "unknown"
+    st.caption(f"Data as of {stamp} · {n_rows:,} responses")
+
+
+def render_tabs(tabs: list[tuple[str, callable]], lazy: bool = True):
+    """Render (label, builder) sections.
+
+    Lazy mode shows a tab-styled selector and only runs the selected builder, so
+    aggregates and chart specs for hidden sections are never computed. Eager mode
+    keeps native ``st.tabs`` and runs every builder on each rerun.
+    """
+    labels = [label for label, _ in tabs]
+    if not lazy:
+        for container, (label, build) in zip(st.tabs(labels), tabs):
+            with container, timed(f"tab · {label}"):
+                build()
+        return
+    active = st.radio(
+        "Dashboard section",
+        labels,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed",
+    )
+    with timed(f"tab · {active}"):
+        dict(tabs)[active]()
+
+
+@st.cache_resource(show_spinner=False)
+def get_report_cache() -> AggregateCache:
+    return AggregateCache(maxsize=REPORT_CACHE_SIZE)
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_pool():
+    return report_export.make_pool(int(st.secrets.get("report_workers", report_export.DEFAULT_MAX_WORKERS)))
+
+
+def collect_report_specs(tabs: list[tuple[str, callable]]) -> list[tuple[str, str, str]]:
+    """Run every tab builder with chart rendering switched to collection.
+
+    Returns ``(tab, title, spec_json)`` in render order. Builders still emit their
+    cards and captions, so they run in a scratch container that is cleared afterwards.
+    """
+    charts: list[tuple[str, str, str]] = []
+    collected: list[tuple[str, str]] = []
+    token = _REPORT_COLLECTOR.set(collected)
+    scratch = st.empty()
+    try:
+        with scratch.container():
+            for label, build in tabs:
+                start = len(collected)
+                build()
+                charts.extend((label, title, spec) for title, spec in collected[start:])
+    finally:
+        _REPORT_COLLECTOR.reset(token)
+        scratch.empty()
+    return charts
+
+
+def render_report_export(tabs: list[tuple[str, callable]], selection: dict, version: str, view: str):
+    """Every chart for the current filters as one ZIP of SVG, PNG or PDF files, cached per slice.
+
+    ``view`` names what the charts show: the wave (``"2025"``), a comparison (``"2025-vs-2024"``)
+    or a split (``"2025-by-region"``).
+    """
+    create_section_header("Download full report")
+    col_fmt, col_action = st.columns([1, 3])
+    with col_fmt:
+        fmt = st.selectbox(
+            "Format",
+            report_export.REPORT_FORMATS,
+            format_func=str.upper,
+            key="report_format",
+            label_visibility="collapsed",
+        )
+    key = ("report", version, view, selection_key(selection), fmt)
+    cache = get_report_cache()
+
+    with col_action:
+        if not cache.contains(key) and not st.button("Prepare report", key="report_prepare"):
+            st.caption("Renders every chart for the current filters on the server and bundles them as one ZIP.")
+            return
+
+        def build():
+            charts = collect_report_specs(tabs)
+            with timed("report export", rows=len(charts)) as rec, st.spinner(f"Rendering {len(charts)} charts…"):
+                data = report_export.build_report_zip(
+                    charts,
+                    fmt,
+                    manifest={"dataset_version": version, "view": view, "selection": selection},
+                    pool=get_export_pool(),
+                )
+                rec["bytes"] = len(data)
+            return data
+
+        data = cache.get_or_compute(key, build)
+        st.download_button(
+            f"Download full report ({fmt.upper()}, ZIP)",
+            data,
+            file_name=f"sopl-{view}-report-{fmt}.zip",
+            mime="application/zip",
+            key="report_download",
+        )
+
+
+def diagnostics_requested() -> bool:
+    return st.query_params.get(DIAGNOSTICS_QUERY_PARAM, "").lower() in ("1", "true", "yes")
+
+
+def render_diagnostics(profile: RerunProfile):
+    """Hidden panel (``?diagnostics=1``) with this rerun's stage timings and cache counters."""
+    with st.expander("Diagnostics", expanded=True):
+        st.caption(f"Rerun total: {profile.total_ms():.1f} ms")
+        st.dataframe(profile.to_frame(), use_container_width=True, hide_index=True)
+        st.json(
+            {
+                **profile.meta,
+                "aggregate_cache": get_aggregate_cache().stats(),
+                "chart_spec_cache": get_chart_spec_cache().stats(),
+            }
+        )
+
+
+def log_profile(profile: RerunProfile):
+    profile_logger.info(
+        json.dumps(
+            {
+                "event": "rerun_profile",
+                "total_ms": round(profile.total_ms(), 3),
+                "stages": profile.records,
+                **profile.meta,
+            },
+            default=str,
+        )
+    )
+
+
 # ==================== MAIN APP ====================
 def main():
+    setup_page(shown_survey_year(list(survey_sources())))
+    show_panel = diagnostics_requested()
+    log_json = bool(st.secrets.get("profile_log", False))
+    profile = RerunProfile() if show_panel or log_json else None
+    try:
+        with profiling(profile):
+            render_dashboard()
+    finally:
+        if profile is not None:
+            if log_json:
+                log_profile(profile)
+            if show_panel:
+                render_diagnostics(profile)
+
+
+def render_dashboard():
     st.markdown('<div class="app-wrapper">', unsafe_allow_html=True)
+    years = list(survey_sources())
+    shown_year = shown_survey_year(years)
 
     # ----- Header with logos -----
     col_head_left, col_head_right = st.columns([4, 1.5])
 
     with col_head_left:
         st.markdown(
-            """
+            f"""
             <div>
-              <div class="main-header">STATE OF PARTNERSHIP LEADERS 2025</div>
+              <div class="main-header">STATE OF PARTNERSHIP LEADERS {shown_year}</div>
               <div class="sub-header">Strategic Insights Dashboard • Partnership Performance Analytics</div>
             </div>
             """,
@@ -720,9 +918,9 @@ def main():
 
     # ----- Intro card -----
     st.markdown(
-        """
+        f"""
         <div class="card">
-          <p><strong>Welcome to the State of Partnership Leaders 2025 Dashboard.</strong></p>
+          <p><strong>Welcome to the State of Partnership Leaders {shown_year} Dashboard.</strong></p>
           <p>
           In prior years, we have released a 40+ page document with all of the data but with the advancements in AI adoption,
           we are trying something new.
@@ -762,72 +960,36 @@ def main():
     components.html(pickaxe_html, height=650, scrolling=False)
 
     # ----- Data -----
-    df = load_data()
+    year, compare_year = render_year_picker(years)
+    with timed("load_data") as rec:
+        store = load_data(year)
+        snapshot = store.snapshot if store is not None else None
+        df = snapshot.df if snapshot is not None else pd.DataFrame()
+        rec["rows"] = len(df)
+        annotate_profile("memory", df.attrs.get("sopl_memory"))
+        annotate_profile("repairs", df.attrs.get("sopl_repairs"))
+        annotate_profile("data", store.status() if store is not None else None)
     if df.empty:
         st.markdown("</div>", unsafe_allow_html=True)
         st.stop()
 
-    # ----- Column mappings -----
-    COL_REGION = "Please select the region where your company is headquartered."
-    COL_INDUSTRY = "What industry sector does your company operate in?"
-    COL_REVENUE = find_col(
-        df,
-        exact="What is your companys estimated annual revenue?",
-        substrings=[
-            "company’s estimated annual revenue",
-            "company's estimated annual revenue",
-            "estimated annual revenue",
-        ],
-    )
-    COL_EMPLOYEES = find_col(
-        df,
-        exact="What is your companys total number of employees?",
-        substrings=[
-            "total number of employees",
-            "company’s total number of employees",
-            "company's total number of employees",
-        ],
-    )
-    COL_DEAL_SIZE = "How does your average deal size involving partners compare to direct or non-partner deals?"
-    COL_CAC = "How does your customer acquisition cost (CAC) from partners compared to direct sales and marketing?"
-    COL_SALES_CYCLE = "How does your partner-led sales cycle compare to your direct sales cycle?"
-    COL_WIN_RATE = "What’s your win rate for deals where partners are involved?"
-
-    COL_PRIMARY_GOAL = find_col(df, substrings=["main goal for partnerships in the next 12 months"])
-    COL_EXEC_EXPECT = find_col(df, substrings=["executive teams expectations of partnerships", "executive team’s expectations of partnerships"])
-    COL_EXPECTED_REV = find_col(df, substrings=["expected to come from partnerships in the next 12 months"])
-    COL_RETENTION = find_col(df, substrings=["retention rate for partner-referred customers"])
-    COL_MOST_IMPACTFUL_TYPE = find_col(df, substrings=["most impact", "most impactful type"])
-    COL_BIGGEST_CHALLENGE = find_col(df, substrings=["biggest challenge in scaling your partner program"])
-    COL_MISS_GOALS_REASON = find_col(df, substrings=["most likely reason your Partnerships team could miss its goals"])
-    COL_TEAM_SIZE = find_col(df, substrings=["people are on your Partnerships team"])
-    COL_BUDGET = find_col(df, substrings=["annual budget", "Partnerships teams annual budget"])
-    COL_USE_TECH = find_col(df, substrings=["technology or automation tools to manage your partner ecosystem"])
-    COL_USE_AI = find_col(df, substrings=["using AI in your partner organization"])
-    COL_MARKETPLACE_LISTED = find_col(df, substrings=["company listed in", "listed in marketplaces"])
-    COL_MARKETPLACE_REV = find_col(df, substrings=["total revenue comes through cloud marketplaces", "revenue comes through cloud marketplaces"])
-    COL_PARTNER_FOCUS = find_col(df, substrings=["focus next 12 months"])
-    COL_STRATEGIC_BET = find_col(df, substrings=["Strategic bet", "strategic bet next 12 months"])
-    COL_FORECAST_PERF = find_col(df, substrings=["Forecasted performance", "forecasting your performance"])
-    COL_REPORTING = find_col(df, substrings=["report to", "majority of your partner organization report"])
-    COL_TRAINING = find_col(df, substrings=["level of training", "training or enablement"])
-
-    COL_TOTAL_PARTNERS = "How many total partners do you have?"
-    COL_ACTIVE_PARTNERS = "How many active partners generated revenue in the last 12 months?"
-
-    INFLUENCE_PREFIX = "Besides Sourced Revenue, how else does your company measure"
-    PARTNERSHIP_HAVE_PREFIX = "Which of the following Partnership types does your company have?"
-    PARTNERSHIP_EXPAND_PREFIX = "Which partnership types are you planning to expand into"
-    ROLES_PREFIX = "What roles exist on your Partner Team?"
-    COL_TOP3_BUDGET_PREFIX = "What are the top 3 budget line items for your Partnerships organization, excluding headcount?"
-    SAT_PREFIX = "How do you measure partner satisfaction?"
-
-    # RegionStd column
-    if COL_REGION in df.columns:
-        df = df.copy()
-        df["RegionStd"] = df[COL_REGION].map(normalize_region_label)
-    else:
-        df["RegionStd"] = None
+    # ----- Column mappings (resolved once per schema) -----
+    columns = tuple(df.columns)
+    catalog = build_column_catalog(schema_hash(columns), columns)
+
+    findex, cube = snapshot.findex, snapshot.cube
+
+    # ----- Comparison wave (loaded only when one is picked) -----
+    prior = prior_catalog = None
+    if compare_year is not None:
+        with timed("load_data · compare") as rec:
+            prior_store = load_data(compare_year)
+            prior = prior_store.snapshot if prior_store is not None else None
+            rec["rows"] = len(prior.df) if prior is not None else 0
+        if prior is not None:
+            prior_columns = tuple(prior.df.columns)
+            prior_catalog = build_column_catalog(schema_hash(prior_columns), prior_columns)
+    survey_label = f"{year}-vs-{compare_year}" if prior is not None else str(year or CURRENT_SURVEY_YEAR)
 
     # ----- Filters card -----
     st.markdown('<div class="card">', unsafe_allow_html=True)
@@ -845,7 +1007,7 @@ def main():
     # Region
     with f1:
         if "RegionStd" in df.columns:
-            region_options = sorted(df["RegionStd"].dropna().unique().tolist())
+            region_options = sorted(findex.options("region"))
             sentinel_region = "All Regions"
             region_display_options = [sentinel_region] + region_options
             selected_regions_raw = st.multiselect(
@@ -862,17 +1024,10 @@ def main():
 
     # Revenue
     with f2:
-        if COL_REVENUE in df.columns:
-            revenue_options = df[COL_REVENUE].dropna().unique().tolist()
-            revenue_order = [
-                "Less than $50 million",
-                "$50M – $250M",
-                "$250M – $1B",
-                "$1B – $10B",
-                "More than $10B",
-            ]
-            ordered_revenue = [r for r in revenue_order if r in revenue_options] + [
-                r for r in revenue_options if r not in revenue_order
+        if catalog["COL_REVENUE"] in df.columns:
+            revenue_options = findex.options("revenue")
+            ordered_revenue = [r for r in REVENUE_ORDER if r in revenue_options] + [
+                r for r in revenue_options if r not in REVENUE_ORDER
             ]
             sentinel_rev = "All Revenue Bands"
             revenue_display_options = [sentinel_rev] + ordered_revenue
@@ -890,16 +1045,10 @@ def main():
 
     # Employees
     with f3:
-        if COL_EMPLOYEES in df.columns:
-            emp_options = df[COL_EMPLOYEES].dropna().unique().tolist()
-            emp_order = [
-                "Less than 100 employees",
-                "100 – 500 employees",
-                "501 – 5,000 employees",
-                "More than 5,000 employees",
-            ]
-            ordered_emp = [e for e in emp_order if e in emp_options] + [
-                e for e in emp_options if e not in emp_order
+        if catalog["COL_EMPLOYEES"] in df.columns:
+            emp_options = findex.options("employees")
+            ordered_emp = [e for e in EMPLOYEE_ORDER if e in emp_options] + [
+                e for e in emp_options if e not in EMPLOYEE_ORDER
             ]
             sentinel_emp = "All Sizes"
             emp_display_options = [sentinel_emp] + ordered_emp
@@ -915,18 +1064,95 @@ def main():
         else:
             selected_employees = None
 
+    # Split: every chart broken down by one dimension, from the same cube cells
+    split_choices = {label: dim for label, dim in SPLIT_DIMENSIONS.items() if dim in cube.dim_values}
+    with st.columns(3)[0]:
+        split_label = st.selectbox("Split charts by", ["No split"] + list(split_choices), key="split_by")
+    split_dim = split_choices.get(split_label)
+
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # Apply filters
-    flt = df.copy()
-    if selected_regions:
-        flt = flt[flt["RegionStd"].isin(selected_regions)]
-    if selected_revenue and COL_REVENUE in flt.columns:
-        flt = flt[flt[COL_REVENUE].isin(selected_revenue)]
-    if selected_employees and COL_EMPLOYEES in flt.columns:
-        flt = flt[flt[COL_EMPLOYEES].isin(selected_employees)]
+    # Apply filters: bitmap lookups give row positions; columns are gathered only when a chart needs them
+    selection = {"region": selected_regions, "revenue": selected_revenue, "employees": selected_employees}
+    with timed("apply filters") as rec:
+        flt = RowSubset(df, findex.rows(selection))
+        rec["rows"] = len(flt)
+
+    agg_cache = get_aggregate_cache()
+    agg_base_key = (dataset_version(df), selection_key(selection))
+
+    def aggregate_batch(specs: list[tuple], label: str) -> list[pd.DataFrame]:
+        """Every aggregate one tab needs, memoized under (dataset version, selection, spec).
+
+        Uncached specs the cube can count are answered together from a single cell mask; the
+        rest are computed from one gather of the filtered rows' columns they read.
+        """
+        keys = [agg_base_key + spec for spec in specs]
+        todo = [spec for spec in dict.fromkeys(specs) if not agg_cache.contains(agg_base_key + spec)]
+        with timed(f"aggregate · {label}", rows=len(flt)) as rec:
+            cubed = [spec for spec in todo if cube.ensure(spec)]
+            fresh = dict(zip(cubed, cube.pct_many(cubed, selection)))
+            by_rows = [spec for spec in todo if spec not in fresh]
+            if by_rows:
+                cols = dict.fromkeys(c for spec in by_rows for c in spec_columns(spec, catalog.prefix_cols))
+                rows = flt[list(cols)]
+                fresh.update((spec, aggregate_rows(spec, rows, catalog.prefix_cols)) for spec in by_rows)
+            rec["cache"] = f"{len(specs) - len(todo)} hit · {len(cubed)} cube · {len(by_rows)} rows"
+            pcts = [
+                agg_cache.get_or_compute(key, lambda spec=spec: fresh.pop(spec) if spec in fresh else single(spec))
+                for key, spec in zip(keys, specs)
+            ]
+        return [decorate(spec, pct) for spec, pct in zip(specs, pcts)]
+
+    def single(spec: tuple) -> pd.DataFrame:
+        if cube.ensure(spec):
+            return cube.pct(spec, selection)
+        return aggregate_rows(spec, flt[spec_columns(spec, catalog.prefix_cols)], catalog.prefix_cols)
+
+    def decorate(spec: tuple, pct: pd.DataFrame) -> pd.DataFrame:
+        """Tag ``pct`` with the active segment split or year comparison, if any."""
+        if split_dim is not None:
+            return with_split(pct, segment_pct(spec), split_label, SEGMENT_ORDERS.get(split_dim))
+        if prior is None:
+            return pct
+        return with_comparison(pct, prior_pct(spec), (str(year), str(compare_year)))
+
+    def segment_pct(spec: tuple) -> pd.DataFrame | None:
+        """Every segment of the split dimension for ``spec`` in one cube reduction (None if not cubeable)."""
+        if not cube.ensure(spec):
+            return None
+        with timed(f"aggregate · split · {short_label(spec[1])}") as rec:
+            rec["cache"] = "hit"
+
+            def from_cube():
+                rec["cache"] = "miss (cube)"
+                return cube.split_pct(spec, selection, split_dim)
+
+            return agg_cache.get_or_compute(agg_base_key + ("split", split_dim) + spec, from_cube)
+
+    def prior_pct(spec: tuple) -> pd.DataFrame | None:
+        """``spec`` on the compared wave under the same filters, cached under that wave's own version.
+
+        Columns are mapped through the catalogs; specs its cube can't answer get no comparison.
+        """
+        if spec[0] != "multi":
+            col = catalog.counterpart(spec[1], prior_catalog)
+            if col is None:
+                return None
+            spec = (spec[0], col) + spec[2:]
+        with timed(f"aggregate · compare · {short_label(spec[1])}") as rec:
+            rec["cache"] = "hit"
+
+            def from_prior_cube():
+                rec["cache"] = "miss (cube)"
+                return prior.cube.pct(spec, selection)
+
+            if not prior.cube.ensure(spec):
+                return None
+            return agg_cache.get_or_compute((prior.version, selection_key(selection)) + spec, from_prior_cube)
 
     render_filter_pills(selected_regions, selected_revenue, selected_employees)
+    render_data_as_of(store.as_of, len(df))
 
     # ----- About this dataset -----
     create_section_header("About this dashboard and dataset")
@@ -951,571 +1177,25 @@ def main():
     )
 
     # Track columns used to avoid duplicates in Additional Insights
-    used_cols = {
-        c
-        for c in [
-            COL_REGION,
-            COL_INDUSTRY,
-            COL_REVENUE,
-            COL_EMPLOYEES,
-            COL_DEAL_SIZE,
-            COL_CAC,
-            COL_SALES_CYCLE,
-            COL_WIN_RATE,
-            COL_PRIMARY_GOAL,
-            COL_EXEC_EXPECT,
-            COL_EXPECTED_REV,
-            COL_RETENTION,
-            COL_MOST_IMPACTFUL_TYPE,
-            COL_BIGGEST_CHALLENGE,
-            COL_MISS_GOALS_REASON,
-            COL_TEAM_SIZE,
-            COL_BUDGET,
-            COL_USE_TECH,
-            COL_USE_AI,
-            COL_MARKETPLACE_LISTED,
-            COL_MARKETPLACE_REV,
-            COL_PARTNER_FOCUS,
-            COL_STRATEGIC_BET,
-            COL_FORECAST_PERF,
-            COL_REPORTING,
-            COL_TRAINING,
-            COL_TOTAL_PARTNERS,
-            COL_ACTIVE_PARTNERS,
-            "RegionStd",
-        ]
-        if c is not None
-    }
-    for col in df.columns:
-        if (
-            INFLUENCE_PREFIX in col
-            or PARTNERSHIP_HAVE_PREFIX in col
-            or PARTNERSHIP_EXPAND_PREFIX in col
-            or ROLES_PREFIX in col
-            or COL_TOP3_BUDGET_PREFIX in col
-            or SAT_PREFIX in col
-        ):
-            used_cols.add(col)
+    used_cols = {c for c in (*catalog.cols.values(), *NORMALIZATION_RULES) if c is not None}
+    for prefix_cols in catalog.prefix_cols.values():
+        used_cols.update(prefix_cols)
 
     # ----- Tabs -----
-    tab_firmo, tab_perf, tab_strategy, tab_portfolio, tab_ops, tab_team, tab_tech, tab_market, tab_extra = st.tabs(
-        [
-            "Firmographics",
-            "Performance",
-            "Strategic Direction",
-            "Partnership Portfolio",
-            "Challenges & Risks",
-            "Team & Investment",
-            "Technology & AI",
-            "Marketplaces",
-            "Additional Insights",
-        ]
-    )
+    # Each tab body is a deferred builder; render_tabs decides which ones actually run.
+    def registered_tab(label: str, layout: list):
+        def build():
+            charts = [(c, resolve_chart_spec(c, catalog)) for c in layout_charts(layout)]
+            wanted = [(c, spec) for c, spec in charts if spec is not None]
+            pcts = aggregate_batch([spec for _, spec in wanted], label)
+            render_layout(layout, {c["title"]: pct for (c, _), pct in zip(wanted, pcts)})
 
-    # ======================================================
-    # Firmographics
-    # ======================================================
-    with tab_firmo:
-        create_section_header("Company profile")
-
-        # HQ region + revenue
-        reg_has = "RegionStd" in flt.columns and not flt["RegionStd"].dropna().empty
-
-        def reg_chart():
-            reg_pct = value_counts_pct(flt["RegionStd"])
-            donut_chart_clean(reg_pct, "category", "pct", "HQ region")
-
-        rev_has = COL_REVENUE in flt.columns and not flt[COL_REVENUE].dropna().empty
-
-        def rev_chart():
-            rev_pct = value_counts_pct(flt[COL_REVENUE])
-            order = [
-                "Less than $50 million",
-                "$50M – $250M",
-                "$250M – $1B",
-                "$1B – $10B",
-                "More than $10B",
-            ]
-            rev_pct["category"] = pd.Categorical(rev_pct["category"], categories=order, ordered=True)
-            rev_pct_sorted = rev_pct.sort_values("category")
-            donut_chart_clean(rev_pct_sorted, "category", "pct", "Company annual revenue")
-
-        two_up_grid(reg_has, reg_chart, rev_has, rev_chart)
-
-        # Employees + industry
-        emp_has = COL_EMPLOYEES in flt.columns and not flt[COL_EMPLOYEES].dropna().empty
-
-        def emp_chart():
-            emp_pct = value_counts_pct(flt[COL_EMPLOYEES])
-            emp_order = [
-                "Less than 100 employees",
-                "100 – 500 employees",
-                "501 – 5,000 employees",
-                "More than 5,000 employees",
-            ]
-            emp_pct["category"] = pd.Categorical(emp_pct["category"], categories=emp_order, ordered=True)
-            emp_pct_sorted = emp_pct.sort_values("category")
-            donut_chart_clean(emp_pct_sorted, "category", "pct", "Total employee count")
-
-        ind_has = COL_INDUSTRY in flt.columns and not flt[COL_INDUSTRY].dropna().empty
-
-        def ind_chart():
-            ind_pct = value_counts_pct(flt[COL_INDUSTRY])
-            donut_chart_clean(ind_pct, "category", "pct", "Industry sector")
-
-        two_up_grid(emp_has, emp_chart, ind_has, ind_chart)
-
-    # ======================================================
-    # Performance
-    # ======================================================
-    with tab_perf:
-        create_section_header("Partner impact & performance")
-
-        ds_has = COL_DEAL_SIZE in flt.columns and not flt[COL_DEAL_SIZE].dropna().empty
-
-        def ds_chart():
-            ds_pct = value_counts_pct(flt[COL_DEAL_SIZE])
-            donut_chart_clean(ds_pct, "category", "pct", "Deal size vs direct")
-
-        cac_has = COL_CAC in flt.columns and not flt[COL_CAC].dropna().empty
-
-        def cac_chart():
-            cac_pct = value_counts_pct(flt[COL_CAC])
-            donut_chart_clean(cac_pct, "category", "pct", "CAC vs direct")
-
-        two_up_grid(ds_has, ds_chart, cac_has, cac_chart)
-
-        wr_has = COL_WIN_RATE in flt.columns and not flt[COL_WIN_RATE].dropna().empty
-
-        def wr_chart():
-            edges = [0, 25, 50, 75, 101]
-            labels = ["0–25%", "26–50%", "51–75%", "76–100%"]
-            pct_df = binned_pct_custom(flt[COL_WIN_RATE], edges, labels)
-            if pct_df.empty:
-                return
-            bar_chart_from_pct(
-                pct_df,
-                "bin",
-                "pct",
-                "Win rate with partners",
-                horizontal=False,
-                max_categories=TOP_N_DEFAULT,
-            )
-
-        ret_has = COL_RETENTION and COL_RETENTION in flt.columns and not flt[COL_RETENTION].dropna().empty
-
-        def ret_chart():
-            edges = [0, 50, 75, 95, 100, 201]
-            labels = ["0–50%", "51–75%", "76–95%", "96–100%", "More than 100%"]
-            pct_df = binned_pct_custom(flt[COL_RETENTION], edges, labels)
-            if pct_df.empty:
-                return
-            bar_chart_from_pct(
-                pct_df,
-                "bin",
-                "pct",
-                "Partner-referred customer retention",
-                horizontal=False,
-                max_categories=5,
-            )
-
-        two_up_grid(wr_has, wr_chart, ret_has, ret_chart)
-
-        # Influence measures
-        create_section_header("Measuring partner influence beyond sourced revenue")
-        influence_cols = [c for c in flt.columns if INFLUENCE_PREFIX in c]
-        inf_pct = multi_select_to_pct(flt, influence_cols) if influence_cols else pd.DataFrame()
-
-        if not inf_pct.empty:
-            render_chart_card(
-                lambda: bar_chart_from_pct(
-                    inf_pct,
-                    "category",
-                    "pct",
-                    "Partner influence impact measures",
-                    horizontal=True,
-                    max_categories=None,
-                )
-            )
-
-    # ======================================================
-    # Strategic Direction
-    # ======================================================
-    with tab_strategy:
-        create_section_header("Strategic direction")
-
-        pg_has = COL_PRIMARY_GOAL and COL_PRIMARY_GOAL in flt.columns and not flt[COL_PRIMARY_GOAL].dropna().empty
-
-        def pg_chart():
-            pg_pct = value_counts_pct(flt[COL_PRIMARY_GOAL])
-            bar_chart_from_pct(pg_pct, "category", "pct", "Primary goal for partnerships", horizontal=True)
-
-        ex_has = COL_EXEC_EXPECT and COL_EXEC_EXPECT in flt.columns and not flt[COL_EXEC_EXPECT].dropna().empty
-
-        def ex_chart():
-            s = flt[COL_EXEC_EXPECT].dropna().astype(str)
-            short = s.str.split(" - ", n=1).str[0]
-            ex_pct = value_counts_pct(short)
-            bar_chart_from_pct(ex_pct, "category", "pct", "Executive expectations", horizontal=True)
-
-        two_up_grid(pg_has, pg_chart, ex_has, ex_chart)
-
-        er_has = COL_EXPECTED_REV and COL_EXPECTED_REV in flt.columns and not flt[COL_EXPECTED_REV].dropna().empty
-
-        def er_chart():
-            edges = [0, 50, 75, 100, 201]
-            labels = ["Less than 50%", "50–75%", "75–100%", "More than 100%"]
-            pct_df = binned_pct_custom(flt[COL_EXPECTED_REV], edges, labels)
-            if pct_df.empty:
-                return
-            bar_chart_from_pct(
-                pct_df,
-                "bin",
-                "pct",
-                "Expected share of revenue from partnerships",
-                horizontal=False,
-                max_categories=4,
-            )
-
-        pf_has = COL_PARTNER_FOCUS and COL_PARTNER_FOCUS in flt.columns and not flt[COL_PARTNER_FOCUS].dropna().empty
-
-        def pf_chart():
-            pf_pct = value_counts_pct(flt[COL_PARTNER_FOCUS])
-            bar_chart_from_pct(
-                pf_pct,
-                "category",
-                "pct",
-                "Partnership focus in the next 12 months",
-                horizontal=True,
-            )
-
-        two_up_grid(er_has, er_chart, pf_has, pf_chart)
-
-        sb_has = COL_STRATEGIC_BET and COL_STRATEGIC_BET in flt.columns and not flt[COL_STRATEGIC_BET].dropna().empty
-
-        def sb_chart():
-            sb_pct = value_counts_pct(flt[COL_STRATEGIC_BET])
-            bar_chart_from_pct(
-                sb_pct,
-                "category",
-                "pct",
-                "Strategic bet for the next 12 months",
-                horizontal=True,
-            )
-
-        fp_has = COL_FORECAST_PERF and COL_FORECAST_PERF in flt.columns and not flt[COL_FORECAST_PERF].dropna().empty
-
-        def fp_chart():
-            fp_pct = value_counts_pct(flt[COL_FORECAST_PERF])
-            bar_chart_from_pct(
-                fp_pct,
-                "category",
-                "pct",
-                "Forecasted performance vs goals",
-                horizontal=True,
-            )
-
-        two_up_grid(sb_has, sb_chart, fp_has, fp_chart)
-
-    # ======================================================
-    # Partnership Portfolio
-    # ======================================================
-    with tab_portfolio:
-        create_section_header("Partnership portfolio")
-
-        mi_has = COL_MOST_IMPACTFUL_TYPE and COL_MOST_IMPACTFUL_TYPE in flt.columns and not flt[COL_MOST_IMPACTFUL_TYPE].dropna().empty
-
-        def mi_chart():
-            mi_pct = value_counts_pct(flt[COL_MOST_IMPACTFUL_TYPE])
-            donut_chart_clean(mi_pct, "category", "pct", "Most impactful partnership type")
-
-        part_cols = [c for c in flt.columns if PARTNERSHIP_HAVE_PREFIX in c]
-        df_part = multi_select_to_pct(flt, part_cols) if part_cols else pd.DataFrame()
-
-        def part_chart():
-            bar_chart_from_pct(
-                df_part,
-                "category",
-                "pct",
-                "Current partnership types",
-                horizontal=True,
-                max_categories=None,
-            )
-
-        two_up_grid(mi_has, mi_chart, not df_part.empty, part_chart)
-
-        expand_cols = [c for c in flt.columns if PARTNERSHIP_EXPAND_PREFIX in c]
-        df_expand = multi_select_to_pct(flt, expand_cols) if expand_cols else pd.DataFrame()
-
-        def expand_chart():
-            bar_chart_from_pct(
-                df_expand,
-                "category",
-                "pct",
-                "Partnership types planned for expansion",
-                horizontal=True,
-                max_categories=None,
-            )
-
-        total_has = COL_TOTAL_PARTNERS and COL_TOTAL_PARTNERS in flt.columns and not flt[COL_TOTAL_PARTNERS].dropna().empty
-
-        def total_chart():
-            total_pct = value_counts_pct(flt[COL_TOTAL_PARTNERS])
-            bar_chart_from_pct(
-                total_pct,
-                "category",
-                "pct",
-                "Number of total partners",
-                horizontal=False,
-                max_categories=TOP_N_DEFAULT,
-            )
-
-        two_up_grid(not df_expand.empty, expand_chart, total_has, total_chart)
-
-        active_has = COL_ACTIVE_PARTNERS and COL_ACTIVE_PARTNERS in flt.columns and not flt[COL_ACTIVE_PARTNERS].dropna().empty
-
-        def active_chart():
-            active_pct = value_counts_pct(flt[COL_ACTIVE_PARTNERS])
-            bar_chart_from_pct(
-                active_pct,
-                "category",
-                "pct",
-                "Active partners generating revenue (last 12 months)",
-                horizontal=False,
-                max_categories=TOP_N_DEFAULT,
-            )
-
-        two_up_grid(active_has, active_chart, False, lambda: None)
-
-    # ======================================================
-    # Challenges & Risks
-    # ======================================================
-    with tab_ops:
-        create_section_header("Challenges & risks")
-
-        bc_has = COL_BIGGEST_CHALLENGE and COL_BIGGEST_CHALLENGE in flt.columns and not flt[COL_BIGGEST_CHALLENGE].dropna().empty
-
-        def bc_chart():
-            bc_pct = value_counts_pct(flt[COL_BIGGEST_CHALLENGE])
-            bar_chart_from_pct(
-                bc_pct,
-                "category",
-                "pct",
-                "Biggest challenge in scaling the program",
-                horizontal=True,
-            )
-
-        mg_has = COL_MISS_GOALS_REASON and COL_MISS_GOALS_REASON in flt.columns and not flt[COL_MISS_GOALS_REASON].dropna().empty
-
-        def mg_chart():
-            mg_pct = value_counts_pct(flt[COL_MISS_GOALS_REASON])
-            bar_chart_from_pct(
-                mg_pct,
-                "category",
-                "pct",
-                "Most likely reason goals may be missed",
-                horizontal=True,
-            )
-
-        two_up_grid(bc_has, bc_chart, mg_has, mg_chart)
-
-        sat_cols = [c for c in flt.columns if SAT_PREFIX in c]
-        df_sat = multi_select_to_pct(flt, sat_cols) if sat_cols else pd.DataFrame()
-
-        if not df_sat.empty:
-            render_chart_card(
-                lambda: bar_chart_from_pct(
-                    df_sat,
-                    "category",
-                    "pct",
-                    "How partner satisfaction is measured",
-                    horizontal=True,
-                    max_categories=None,
-                )
-            )
-
-    # ======================================================
-    # Team & Investment
-    # ======================================================
-    with tab_team:
-        create_section_header("Team & investment")
-
-        ts_has = COL_TEAM_SIZE and COL_TEAM_SIZE in flt.columns and not flt[COL_TEAM_SIZE].dropna().empty
-
-        def ts_chart():
-            ts_pct = value_counts_pct(flt[COL_TEAM_SIZE])
-            donut_chart_clean(ts_pct, "category", "pct", "Partnerships team size")
-
-        if COL_BUDGET and COL_BUDGET in flt.columns:
-            bud_series = flt[COL_BUDGET].dropna().astype(str)
-            bud_series = bud_series[
-                ~bud_series.str.contains("I don’t have this data|I don't have this data", case=False, na=False)
-            ]
-            bud_pct = value_counts_pct(bud_series)
-        else:
-            bud_pct = pd.DataFrame()
-        bud_has = not bud_pct.empty
-
-        def bud_chart():
-            bar_chart_from_pct(
-                bud_pct,
-                "category",
-                "pct",
-                "Annual partnerships budget",
-                horizontal=True,
-            )
-
-        two_up_grid(ts_has, ts_chart, bud_has, bud_chart)
-
-        rep_has = COL_REPORTING and COL_REPORTING in flt.columns and not flt[COL_REPORTING].dropna().empty
-
-        def rep_chart():
-            rep_series = flt[COL_REPORTING].dropna().astype(str)
-            rep_pct = value_counts_pct(rep_series)
-            bar_chart_from_pct(
-                rep_pct,
-                "category",
-                "pct",
-                "Where the Partnerships team reports",
-                horizontal=True,
-                max_categories=8,
-            )
-
-        budget_item_cols = [c for c in flt.columns if COL_TOP3_BUDGET_PREFIX in c]
-        df_bud = multi_select_to_pct(flt, budget_item_cols) if budget_item_cols else pd.DataFrame()
-
-        def budget_items_chart():
-            bar_chart_from_pct(
-                df_bud,
-                "category",
-                "pct",
-                "Top 3 budget line items (excluding headcount)",
-                horizontal=True,
-                max_categories=None,
-            )
-
-        two_up_grid(rep_has, rep_chart, not df_bud.empty, budget_items_chart)
-
-        tr_has = COL_TRAINING and COL_TRAINING in flt.columns and not flt[COL_TRAINING].dropna().empty
-
-        def tr_chart():
-            tr_series = flt[COL_TRAINING].dropna().astype(str)
-            tr_pct = value_counts_pct(tr_series)
-            bar_chart_from_pct(
-                tr_pct,
-                "category",
-                "pct",
-                "Partner training & enablement level",
-                horizontal=True,
-                max_categories=8,
-            )
-
-        roles_cols = [c for c in flt.columns if ROLES_PREFIX in c]
-        df_roles = multi_select_to_pct(flt, roles_cols) if roles_cols else pd.DataFrame()
-
-        def roles_chart():
-            bar_chart_from_pct(
-                df_roles,
-                "category",
-                "pct",
-                "Roles that exist on the Partner Team",
-                horizontal=True,
-                max_categories=None,
-            )
-
-        two_up_grid(tr_has, tr_chart, not df_roles.empty, roles_chart)
-
-    # ======================================================
-    # Technology & AI
-    # ======================================================
-    with tab_tech:
-        create_section_header("Technology & AI")
-
-        ut_has = COL_USE_TECH and COL_USE_TECH in flt.columns
-
-        def ut_chart():
-            ut_pct = value_counts_pct(flt[COL_USE_TECH])
-            donut_chart_clean(
-                ut_pct,
-                "category",
-                "pct",
-                "Currently using partner tech/automation",
-            )
-
-        ai_has = COL_USE_AI and COL_USE_AI in flt.columns
-
-        def ai_chart():
-            ai_pct = value_counts_pct(flt[COL_USE_AI])
-            donut_chart_clean(
-                ai_pct,
-                "category",
-                "pct",
-                "Currently using AI in the partner organization",
-            )
-
-        two_up_grid(ut_has, ut_chart, ai_has, ai_chart)
-
-    # ======================================================
-    # Marketplaces
-    # ======================================================
-    with tab_market:
-        create_section_header("Marketplaces")
-
-        mpl_has = COL_MARKETPLACE_LISTED and COL_MARKETPLACE_LISTED in flt.columns
-
-        def mpl_chart():
-            mpl_series = normalize_yes_no(flt[COL_MARKETPLACE_LISTED])
-            mpl_pct = value_counts_pct(mpl_series)
-            donut_chart_clean(
-                mpl_pct,
-                "category",
-                "pct",
-                "Company listed in marketplaces",
-            )
-
-        mp_has_any = COL_MARKETPLACE_REV and COL_MARKETPLACE_REV in flt.columns and not flt[COL_MARKETPLACE_REV].dropna().empty
-
-        def mp_chart():
-            mp_rev = flt[COL_MARKETPLACE_REV].dropna()
-            mp_num = pd.to_numeric(mp_rev, errors="coerce")
-            if mp_num.notna().sum() > 0 and mp_num.notna().mean() > 0.7:
-                edges = [0, 5, 15, 30, 50, 101]
-                labels = [
-                    "Less than 5%",
-                    "5–15%",
-                    "15–30%",
-                    "30–50%",
-                    "More than 50%",
-                ]
-                pct_df = binned_pct_custom(mp_num, edges, labels)
-                if pct_df.empty:
-                    return
-                bar_chart_from_pct(
-                    pct_df,
-                    "bin",
-                    "pct",
-                    "Share of revenue from marketplaces",
-                    horizontal=False,
-                    max_categories=5,
-                )
-            else:
-                cat_pct = value_counts_pct(mp_rev.astype(str))
-                if cat_pct.empty:
-                    return
-                bar_chart_from_pct(
-                    cat_pct,
-                    "category",
-                    "pct",
-                    "Share of revenue from marketplaces",
-                    horizontal=False,
-                )
-
-        two_up_grid(mpl_has, mpl_chart, mp_has_any, mp_chart)
+        return build
 
     # ======================================================
     # Additional Insights (2x2 grid)
     # ======================================================
-    with tab_extra:
+    def tab_extra():
         create_section_header("Additional insights across remaining questions")
 
         st.markdown(
@@ -1531,70 +1211,21 @@ def main():
             unsafe_allow_html=True,
         )
 
-        skip_substrings = [
-            "StartDate",
-            "EndDate",
-            "Status",
-            "IPAddress",
-            "Progress",
-            "Duration",
-            "Finished",
-            "RecordedDate",
-            "ResponseId",
-            "Recipient",
-            "LocationLatitude",
-            "LocationLongitude",
-            "UserLanguage",
-            "Other – please specify",
-            "Other - please specify",
-            "additional feedback or comments you'd like to share",
-        ]
-
-        vendor_keywords = [
-            "google",
-            "salesforce",
-            "crossbeam",
-            "hubspot",
-            "microsoft",
-            "aws",
-            "azure",
-            "gcp",
-            "partnerstack",
-            "zendesk",
-            "slack",
-            "oracle",
-            "sap",
-            "workday",
+        profile = build_column_profile(df, dataset_version(df))
+        extra_candidates = [
+            c for c in profile.loc[profile["eligible"], "column"] if c not in used_cols
         ]
-        vendor_pattern = re.compile("|".join(vendor_keywords), re.IGNORECASE)
-
         extra_questions: list[dict] = []
 
-        for col in flt.columns:
-            if col in used_cols:
-                continue
-            if any(sub in col for sub in skip_substrings):
-                continue
-            if col == "RegionStd":
-                continue
-            series = flt[col]
-            s_nonnull = series.dropna()
-            if s_nonnull.empty:
-                continue
-            numeric_coerced = pd.to_numeric(s_nonnull, errors="coerce")
-            if numeric_coerced.notna().mean() > 0.9:
-                continue
-            n_unique = s_nonnull.astype(str).nunique()
-            if n_unique <= 1 or n_unique > 12:
-                continue
-            if s_nonnull.astype(str).str.contains(vendor_pattern, na=False).any():
-                continue
-            cat_pct = value_counts_pct(series)
-            if cat_pct.empty:
-                continue
-            extra_questions.append({"col": col, "pct": cat_pct})
-
-        extra_questions = extra_questions[:10]
+        # Eligibility comes from the per-dataset profile; only value counts depend on the filters.
+        # They are computed a batch at a time, only until enough non-empty questions are found.
+        pos = 0
+        while pos < len(extra_candidates) and len(extra_questions) < EXTRA_INSIGHTS_MAX:
+            chunk = extra_candidates[pos : pos + EXTRA_INSIGHTS_MAX - len(extra_questions)]
+            pos += len(chunk)
+            for col, cat_pct in zip(chunk, aggregate_batch([("vc", col) for col in chunk], "Additional Insights")):
+                if not cat_pct.empty:
+                    extra_questions.append({"col": col, "pct": cat_pct})
 
         if extra_questions:
             # 2x2 (or 2xN) grid: each row has 2 cards
@@ -1631,11 +1262,18 @@ def main():
                 "No additional summarized categorical questions detected beyond the main dashboard sections."
             )
 
+    tabs = [(label, registered_tab(label, layout)) for label, layout in DASHBOARD_TABS.items()]
+    tabs.append(("Additional Insights", tab_extra))
+    render_tabs(tabs, lazy=bool(st.secrets.get("lazy_tabs", True)))
+    if split_dim is not None:
+        survey_label = f"{year or CURRENT_SURVEY_YEAR}-by-{split_dim}"
+    render_report_export(tabs, selection, dataset_version(df), survey_label)
+
     # ----- Footer -----
     st.markdown(
-        """
+        f"""
         <div class="footer">
-            <strong>SOPL 2025 Insights Platform</strong> • Partnership analytics and strategic insights<br>
+            <strong>SOPL {shown_year} Insights Platform</strong> • Partnership analytics and strategic insights<br>
             <span style="color: #94a3b8; font-size: 0.8rem;">
                 Data sourced from State of Partnership Leaders Survey
             </span>
@@ -0,0 +1,177 @@
+"""Benchmark the data-to-chart pipeline on synthetic SOPL-shaped datasets.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pipeline.py --sizes 1000 10000 --output bench_results.json
+
+Each stage is timed in isolation (best and median of ``--repeat`` runs) and the
+results are written as JSON so runs from different versions can be diffed.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sopl_dashboard import charts, core  # noqa: E402
+from tests.synthetic import (  # noqa: E402
+    COL_EMPLOYEES,
+    COL_PRIMARY_GOAL,
+    COL_REGION,
+    COL_REVENUE,
+    COL_WIN_RATE,
+    make_synthetic_sopl,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# cold-import wall time expected of the headless modules (workers, CLIs, the aggregates API); reported, not enforced
+IMPORT_BUDGET_S = {"sopl_dashboard.core": 1.5, "sopl_dashboard.api": 1.5}
+IMPORT_MODULES = ["sopl_dashboard.core", "sopl_dashboard.charts", "sopl_dashboard.api", "app"]
+
+
+def _time(fn, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"seconds_min": min(runs), "seconds_median": statistics.median(runs), "repeats": repeat}
+
+
+def bench_size(n_rows: int, repeat: int) -> list[dict]:
+    df = make_synthetic_sopl(n_rows)
+    df["RegionStd"] = df[COL_REGION].map(core.normalize_region_label)
+    raw = df.drop(columns="RegionStd").to_csv(index=False).encode("utf-8")
+    selection = {"region": ["North America"], "revenue": core.REVENUE_ORDER[:2], "employees": None}
+    dims = {"region": "RegionStd", "revenue": COL_REVENUE, "employees": COL_EMPLOYEES}
+    multi_cols = [c for c in df.columns if core.PARTNERSHIP_HAVE_PREFIX in c]
+    win_edges, win_labels = [0, 25, 50, 75, 101], ["0–25%", "26–50%", "51–75%", "76–100%"]
+
+    findex = core.FilterIndex(df, dims)
+    rows = findex.rows(selection)
+    flt = df.take(rows)
+    cube = core.FilterCube(df, dims, core.MULTI_SELECT_PREFIXES)
+    cube.ensure(("bin", COL_WIN_RATE, tuple(win_edges), tuple(win_labels)))
+    catalog = core.ColumnCatalog(df.columns)
+    tab_charts = core.layout_charts(core.DASHBOARD_TABS["Strategic Direction"])
+    tab_specs = [spec for spec in (core.resolve_chart_spec(c, catalog) for c in tab_charts) if spec is not None]
+    for spec in tab_specs:
+        cube.ensure(spec)
+    parsed = core.parse_csv_bytes(raw, "utf-8")
+    earlier = core.build_snapshot(parsed.iloc[: n_rows - max(1, n_rows // 100)])
+    chart_rows = charts.chart_rows(core.value_counts_pct(flt[COL_PRIMARY_GOAL]), "category", "pct")
+
+    def legacy_filter():
+        out = df.copy()
+        out = out[out["RegionStd"].isin(selection["region"])]
+        return out[out[COL_REVENUE].isin(selection["revenue"])]
+
+    stages = {
+        "parse.detect_encoding": lambda: core.detect_encoding(raw),
+        "parse.read_csv": lambda: core.parse_csv_bytes(raw, "utf-8"),
+        "parse.repair_text": lambda: core.repair_replacement_chars(parsed.copy()),
+        "normalize.derived_columns": lambda: core.add_derived_columns(df.drop(columns="RegionStd")),
+        "filter.legacy_isin_copy": legacy_filter,
+        "filter.index_build": lambda: core.FilterIndex(df, dims),
+        "filter.index_rows": lambda: findex.rows(selection),
+        "filter.take_rows": lambda: df.take(rows),
+        "filter.row_subset_column": lambda: core.RowSubset(df, rows)[COL_PRIMARY_GOAL],
+        "aggregate.value_counts_pct": lambda: core.value_counts_pct(flt[COL_PRIMARY_GOAL]),
+        "aggregate.binned_pct_custom": lambda: core.binned_pct_custom(flt[COL_WIN_RATE], win_edges, win_labels),
+        "aggregate.multi_select_to_pct": lambda: core.multi_select_to_pct(flt, multi_cols),
+        "aggregate.multi_select_group_build": lambda: core.MultiSelectGroup.from_frame(df, multi_cols),
+        "cube.build": lambda: core.FilterCube(df, dims, core.MULTI_SELECT_PREFIXES),
+        "cube.value_counts_pct": lambda: cube.pct(("vc", COL_PRIMARY_GOAL), selection),
+        "cube.multi_select_pct": lambda: cube.pct(("multi", core.PARTNERSHIP_HAVE_PREFIX), selection),
+        "cube.pct_many_tab": lambda: cube.pct_many(tab_specs, selection),
+        "cube.split_by_revenue": lambda: cube.split_pct(("vc", COL_PRIMARY_GOAL), selection, "revenue"),
+        "refresh.full_build": lambda: core.build_snapshot(parsed),
+        "refresh.apply_delta_1pct": lambda: core.apply_response_delta(earlier, parsed),
+        "chart.donut_spec": lambda: charts.donut_chart_spec(chart_rows, "category", "Primary goal"),
+        "chart.bar_spec": lambda: charts.bar_chart_spec(chart_rows, "category", "Primary goal", True),
+    }
+
+    results = []
+    for name, fn in stages.items():
+        # the CSV parse dominates at 1M rows; one run is enough to see it
+        n = 1 if name == "parse.read_csv" and n_rows >= 1_000_000 else repeat
+        results.append({"stage": name, "rows": n_rows, **_time(fn, n)})
+        print(f"{n_rows:>9,} rows  {name:<36} {results[-1]['seconds_min'] * 1000:10.2f} ms", file=sys.stderr)
+    return results
+
+
+def import_seconds(module: str) -> tuple[float, list[str]]:
+    """Wall time to import ``module`` in a fresh interpreter, and which UI/chart libraries it pulled in."""
+    code = (
+        "import sys, time; t0 = time.perf_counter(); import {}; dt = time.perf_counter() - t0; "
+        "print(dt, *[m for m in ('streamlit', 'altair', 'vl_convert') if m in sys.modules])"
+    ).format(module)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    seconds, *loaded = out.stdout.split()
+    return float(seconds), loaded
+
+
+def bench_imports(repeat: int) -> list[dict]:
+    """Cold import time of each entry module, timed inside a fresh interpreter per run."""
+    results = []
+    for module in IMPORT_MODULES:
+        runs = [import_seconds(module)[0] for _ in range(repeat)]
+        results.append(
+            {
+                "stage": f"import.{module}",
+                "rows": 0,
+                "seconds_min": min(runs),
+                "seconds_median": statistics.median(runs),
+                "repeats": repeat,
+                "budget_s": IMPORT_BUDGET_S.get(module),
+            }
+        )
+        over = " (over budget)" if min(runs) > IMPORT_BUDGET_S.get(module, float("inf")) else ""
+        print(f"{'import':>14}  {module:<36} {min(runs) * 1000:10.2f} ms{over}", file=sys.stderr)
+    return results
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    results = bench_imports(args.repeat)
+    for n_rows in args.sizes:
+        results.extend(bench_size(n_rows, args.repeat))
+
+    payload = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(payload, indent=2))
+    print(f"wrote {len(results)} timings to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Server-side static export of dashboard charts with vl-convert.
+
+Kept out of ``app.py`` on purpose: pool workers unpickle ``export_chart`` by
+module name, and Streamlit swaps the script's ``__main__`` module on every
+rerun. This module only needs vl-convert, so workers stay light.
+"""
+import io
+import json
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+REPORT_FORMATS = ("png", "svg", "pdf")
+PNG_SCALE = 2  # retina-sharp PNGs; SVG and PDF are vector anyway
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def export_chart(job: tuple[str, str, str]) -> tuple[str, bytes]:
+    """Convert one ``(name, vega_lite_json, fmt)`` job to file bytes (runs in a pool worker)."""
+    import vl_convert as vlc
+
+    name, spec_json, fmt = job
+    if fmt == "svg":
+        data = vlc.vegalite_to_svg(spec_json).encode("utf-8")
+    elif fmt == "pdf":
+        data = vlc.vegalite_to_pdf(spec_json)
+    elif fmt == "png":
+        data = vlc.vegalite_to_png(spec_json, scale=PNG_SCALE)
+    else:
+        raise ValueError(f"unsupported report format: {fmt!r}")
+    return name, data
+
+
+def make_pool(max_workers: int = DEFAULT_MAX_WORKERS) -> ProcessPoolExecutor | None:
+    """Process pool for conversions, or None when there is only one core to use.
+
+    Workers are spawned, not forked: vl-convert runs its own threads, and forking
+    a process that has them (or Streamlit's server threads) can deadlock.
+    """
+    if max_workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _slug(text: str, limit: int = 60) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", str(text)).strip("-").lower()
+    return slug[:limit].rstrip("-") or "chart"
+
+
+def chart_filenames(charts: list[tuple[str, str, str]], fmt: str) -> list[str]:
+    """Stable ``NN-tab/NN-title.fmt`` names for ``(tab, title, spec)`` entries, in render order."""
+    names, tab_order, per_tab = [], {}, {}
+    for tab, title, _ in charts:
+        tab_no = tab_order.setdefault(tab, len(tab_order) + 1)
+        per_tab[tab] = per_tab.get(tab, 0) + 1
+        names.append(f"{tab_no:02d}-{_slug(tab)}/{per_tab[tab]:02d}-{_slug(title)}.{fmt}")
+    return names
+
+
+def build_report_zip(
+    charts: list[tuple[str, str, str]],
+    fmt: str,
+    manifest: dict | None = None,
+    pool: Executor | None = None,
+) -> bytes:
+    """Render every chart to ``fmt`` (in parallel when a pool is given) and zip them.
+
+    ``manifest.json`` lists each file with its tab and title next to the caller's
+    metadata (filter selection, dataset version).
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"unsupported report format: {fmt!r}")
+    names = chart_filenames(charts, fmt)
+    jobs = [(name, spec, fmt) for name, (_, _, spec) in zip(names, charts)]
+    if pool is None:
+        rendered = map(export_chart, jobs)
+    else:
+        rendered = pool.map(export_chart, jobs, chunksize=max(1, len(jobs) // 16))
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in rendered:
+            zf.writestr(name, data)
+        zf.writestr(
+            "manifest.json",
+            json.dumps(
+                {
+                    **(manifest or {}),
+                    "format": fmt,
+                    "charts": [
+                        {"file": name, "tab": tab, "title": title}
+                        for name, (tab, title, _) in zip(names, charts)
+                    ],
+                },
+                indent=2,
+                default=str,
+            ),
+        )
+    return buf.getvalue()
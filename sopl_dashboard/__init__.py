@@ -0,0 +1 @@
+"""Headless entry points for the SOPL dashboard (``python -m sopl_dashboard --help``)."""
@@ -0,0 +1,102 @@
+"""Command line for the headless dashboard services.
+
+    python -m sopl_dashboard serve --url <csv export url> [--host 0.0.0.0] [--port 8502]
+    python -m sopl_dashboard questions
+    python -m sopl_dashboard aggregate <question id> [--region ...] [--revenue ...] [--split region]
+    python -m sopl_dashboard precompute [--url ...] [--partition 2024]
+
+``--url`` defaults to ``$SOPL_GSHEET_URL``; a local CSV path works too. Snapshots are
+shared with the Streamlit app through ``SOPL_SNAPSHOT_DIR``.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+
+def _source_url(value: str | None) -> str:
+    url = value or os.environ.get("SOPL_GSHEET_URL")
+    if not url:
+        raise SystemExit("no data source: pass --url or set SOPL_GSHEET_URL")
+    return Path(url).resolve().as_uri() if Path(url).is_file() else url
+
+
+def _service(args):
+    from sopl_dashboard import core
+    from sopl_dashboard.api import AggregateService
+
+    refresh = args.refresh_interval if args.command == "serve" else 0
+    return AggregateService(core.DatasetStore(_source_url(args.url), refresh_interval=refresh))
+
+
+def main(argv=None):
+    from sopl_dashboard.api import FILTER_DIMENSIONS, DatasetUnavailable
+
+    parser = argparse.ArgumentParser(prog="python -m sopl_dashboard", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the JSON aggregates API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8502)
+    serve.add_argument("--refresh-interval", type=float, default=5 * 60, help="seconds between sheet checks")
+
+    commands.add_parser("questions", help="list question ids")
+
+    aggregate = commands.add_parser("aggregate", help="print one question's aggregate as JSON")
+    aggregate.add_argument("question")
+    for dim in FILTER_DIMENSIONS:
+        aggregate.add_argument(f"--{dim}", action="append", help="accepted value (repeatable)")
+    aggregate.add_argument("--split", choices=FILTER_DIMENSIONS)
+
+    precompute = commands.add_parser("precompute", help="build and save the snapshot containers boot from")
+    precompute.add_argument("--partition", default="", help="survey year partition (default: the current wave)")
+
+    for command in (serve, aggregate, precompute):
+        command.add_argument("--url", help="CSV export URL or file (default: $SOPL_GSHEET_URL)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    if args.command == "questions":
+        from sopl_dashboard.api import registered_questions
+
+        for qid, (tab, chart_def) in registered_questions().items():
+            print(f"{qid}\t{tab}\t{chart_def['title']}")
+        return
+
+    if args.command == "precompute":
+        from sopl_dashboard.precompute import precompute
+
+        json.dump(precompute(_source_url(args.url), args.partition), sys.stdout, indent=2)
+        print()
+        return
+
+    service = _service(args)
+    try:
+        if args.command == "aggregate":
+            selection = {dim: getattr(args, dim) for dim in FILTER_DIMENSIONS}
+            try:
+                body = service.aggregate(args.question, selection, args.split)
+            except (LookupError, ValueError, DatasetUnavailable) as exc:
+                raise SystemExit(str(exc.args[0]))
+            json.dump(body, sys.stdout, indent=2, default=str)
+            print()
+            return
+
+        from sopl_dashboard.api import make_server
+
+        server = make_server(service, args.host, args.port)
+        logging.getLogger("sopl.api").info("serving aggregates on http://%s:%d", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    finally:
+        service.store.stop()
+
+
+if __name__ == "__main__":
+    main()
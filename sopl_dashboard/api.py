@@ -0,0 +1,156 @@
+"""JSON aggregates API: the dashboard's chart percentages without the Streamlit UI.
+
+Answers come from the same snapshot, precomputed counts and row-level helpers as the
+charts, so a consumer sees exactly the numbers the page shows for the same filters.
+
+    GET /health
+    GET /questions
+    GET /aggregate?question=<id>[&region=...][&revenue=...][&employees=...][&split=<dimension>]
+
+Filter values repeat the parameter (``region=Europe&region=APAC``); labels such as
+"501 – 5,000" contain commas, so they are never comma-split.
+"""
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from sopl_dashboard import core
+
+FILTER_DIMENSIONS = ("region", "revenue", "employees")
+RESULT_CACHE_SIZE = 4096
+
+log = logging.getLogger("sopl.api")
+
+
+class UnknownQuestion(LookupError):
+    pass
+
+
+class DatasetUnavailable(RuntimeError):
+    """The store has no data yet: its first load failed (the sheet couldn't be fetched)."""
+
+
+def registered_questions() -> dict[str, tuple[str, dict]]:
+    """Question id -> (tab, chart definition) for every chart in ``DASHBOARD_TABS``."""
+    return {
+        chart_def["id"]: (tab, chart_def)
+        for tab, layout in core.DASHBOARD_TABS.items()
+        for chart_def in core.layout_charts(layout)
+    }
+
+
+def frame_records(frame) -> list[dict]:
+    """A result frame as JSON-ready records (labels as strings, numbers as numbers)."""
+    labels = {c: frame[c].astype(str) for c in frame.columns if c in ("segment", "category", "bin")}
+    return json.loads(frame.assign(**labels).to_json(orient="records"))
+
+
+class AggregateService:
+    """Aggregates per (dataset version, filter selection, question, split), behind one shared cache.
+
+    ``store`` is a ``DatasetStore``; its background refresh moves the dataset version on,
+    so cached answers for older data simply stop being asked for and age out.
+    """
+
+    def __init__(self, store: "core.DatasetStore", cache_size: int = RESULT_CACHE_SIZE):
+        self.store = store
+        self.cache = core.AggregateCache(maxsize=cache_size)
+        self.questions = registered_questions()
+
+    def list_questions(self) -> list[dict]:
+        return [
+            {"id": qid, "tab": tab, "title": chart_def["title"], "kind": chart_def["kind"]}
+            for qid, (tab, chart_def) in self.questions.items()
+        ]
+
+    def aggregate(self, question: str, selection: dict | None = None, split: str | None = None) -> dict:
+        """The question's percentages under ``selection`` (dimension -> accepted values)."""
+        if question not in self.questions:
+            raise UnknownQuestion(f"unknown question: {question!r}")
+        if split is not None and split not in FILTER_DIMENSIONS:
+            raise ValueError(f"split must be one of {', '.join(FILTER_DIMENSIONS)}, not {split!r}")
+        selection = {dim: list((selection or {}).get(dim) or []) or None for dim in FILTER_DIMENSIONS}
+        snapshot = self.store.current()
+        if snapshot is None:
+            raise DatasetUnavailable(f"dataset unavailable: {self.store.last_error or 'not loaded yet'}")
+        key = ("api", snapshot.version, core.selection_key(selection), question, split)
+        return self.cache.get_or_compute(key, lambda: self._compute(snapshot, question, selection, split))
+
+    def _compute(self, snapshot, question: str, selection: dict, split: str | None) -> dict:
+        tab, chart_def = self.questions[question]
+        body = {
+            "question": question,
+            "title": chart_def["title"],
+            "tab": tab,
+            "dataset_version": snapshot.version,
+            "selection": selection,
+            "split": split,
+            "results": [],
+        }
+        columns = tuple(snapshot.df.columns)
+        catalog = core.build_column_catalog(core.schema_hash(columns), columns)
+        spec = core.resolve_chart_spec(chart_def, catalog)
+        if spec is None:
+            return body  # question not asked in this dataset
+        cube = snapshot.cube
+        if split is not None:
+            if not cube.ensure(spec):
+                raise ValueError(f"{question!r} can't be split (not answerable from the precomputed counts)")
+            pct = cube.split_pct(spec, selection, split)
+        elif cube.ensure(spec):
+            pct = core.ordered_pct(chart_def, cube.pct(spec, selection))
+        else:
+            rows = core.RowSubset(snapshot.df, snapshot.findex.rows(selection))
+            pct = core.aggregate_rows(spec, rows[core.spec_columns(spec, catalog.prefix_cols)], catalog.prefix_cols)
+            pct = core.ordered_pct(chart_def, pct)
+        body["results"] = frame_records(pct) if pct is not None else []
+        return body
+
+
+def make_handler(service: AggregateService) -> type[BaseHTTPRequestHandler]:
+    class AggregateHandler(BaseHTTPRequestHandler):
+        server_version = "sopl-aggregates/1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            status = HTTPStatus.OK
+            try:
+                if url.path == "/health":
+                    body = {"status": "ok", **service.store.status()}
+                elif url.path == "/questions":
+                    body = {"questions": service.list_questions()}
+                elif url.path == "/aggregate":
+                    if "question" not in params:
+                        raise ValueError("missing 'question' parameter")
+                    selection = {dim: params.get(dim) for dim in FILTER_DIMENSIONS}
+                    split = params.get("split", [None])[0]
+                    body = service.aggregate(params["question"][0], selection, split)
+                else:
+                    status, body = HTTPStatus.NOT_FOUND, {"error": f"no such endpoint: {url.path}"}
+            except UnknownQuestion as exc:
+                status, body = HTTPStatus.NOT_FOUND, {"error": str(exc.args[0])}
+            except DatasetUnavailable as exc:
+                status, body = HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)}
+            except ValueError as exc:
+                status, body = HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+            except Exception as exc:
+                log.exception("aggregate request failed: %s", self.path)
+                status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+            payload = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            log.info("%s %s", self.address_string(), format % args)
+
+    return AggregateHandler
+
+
+def make_server(service: AggregateService, host: str = "127.0.0.1", port: int = 8502) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer((host, port), make_handler(service))
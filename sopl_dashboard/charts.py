@@ -0,0 +1,292 @@
+"""Vega-Lite spec builders for the dashboard charts.
+
+Altair is imported on the first spec build rather than at import time, so importing
+this module costs nothing for processes that never draw a chart.
+"""
+import functools
+
+import pandas as pd
+
+# ==================== BRAND COLORS ====================
+PL_CORE = {
+    "amaranth": "#EC3D72",
+    "casablanca": "#F9A644",
+    "minsk": "#3B308F",
+}
+PL_TINTS = {
+    "amaranth_light": "#F25A8A",
+    "casablanca_light": "#FBB85F",
+    "minsk_light": "#5146A1",
+}
+
+PL_COLORS = [
+    PL_CORE["minsk"],
+    PL_CORE["amaranth"],
+    PL_CORE["casablanca"],
+    PL_TINTS["minsk_light"],
+    PL_TINTS["amaranth_light"],
+    PL_TINTS["casablanca_light"],
+]
+
+
+# ==================== ALTAIR THEME ====================
+def atlas_light_theme():
+    return {
+        "config": {
+            "view": {"stroke": "transparent"},
+            "background": "#ffffff",
+            "range": {"category": PL_COLORS},
+            "axis": {
+                "labelColor": "#475569",
+                "titleColor": "#020617",
+                "titleFontWeight": 600,
+                "labelFontWeight": 600,
+                "gridColor": "#f1f5f9",
+                "domainColor": "#d4d4d8",
+                "labelLimit": 0,
+                "labelFontSize": 11,
+                "titleFontSize": 12,
+            },
+            "legend": {
+                "labelColor": "#475569",
+                "titleColor": "#020617",
+                "titleFontWeight": 700,
+                "labelFontWeight": 600,
+                "labelFontSize": 14,
+                "titleFontSize": 14,
+                "symbolSize": 200,
+                "symbolType": "circle",
+            },
+            "title": {
+                "color": "#020617",
+                "fontSize": 16,
+                "fontWeight": 700,
+                "anchor": "start",
+                "offset": 12,
+            },
+        }
+    }
+
+
+@functools.cache
+def _altair():
+    """Altair with the dashboard theme enabled, imported on first use."""
+    import altair as alt
+
+    alt.themes.register("atlas_light", atlas_light_theme)
+    alt.themes.enable("atlas_light")
+    alt.data_transformers.disable_max_rows()
+    alt.renderers.set_embed_options(
+        actions={"export": True, "source": False, "compiled": False, "editor": False}
+    )
+    return alt
+
+
+def chart_rows(df_pct: pd.DataFrame, cat_field: str, pct_field: str) -> tuple:
+    """Hashable (category, percent) rows in display order, used as the chart cache key."""
+    return tuple(zip(df_pct[cat_field].astype(str), df_pct[pct_field].astype(float)))
+
+
+def donut_chart_spec(rows: tuple, cat_field: str, title: str) -> str:
+    alt = _altair()
+    data = pd.DataFrame(list(rows), columns=[cat_field, "Percent"])
+
+    base = alt.Chart(data).encode(
+        theta=alt.Theta("Percent:Q", stack=True),
+        color=alt.Color(
+            f"{cat_field}:N",
+            legend=alt.Legend(title=None, orient="right"),
+            scale=alt.Scale(range=PL_COLORS),
+        ),
+        tooltip=[f"{cat_field}:N", alt.Tooltip("Percent:Q", format=".1f")],
+    )
+
+    donut = base.mark_arc(innerRadius=70, stroke="#fff", strokeWidth=2)
+
+    chart = donut.properties(
+        width=400,
+        height=320,
+        title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
+    ).configure_view(strokeWidth=0)
+
+    return chart.to_json()
+
+
+def with_comparison(df_pct: pd.DataFrame, prior_pct: pd.DataFrame | None, years: tuple[str, str]) -> pd.DataFrame:
+    """``df_pct`` tagged with another survey wave's shares; the chart helpers then draw year-vs-year bars."""
+    if prior_pct is None or prior_pct.empty or df_pct.empty:
+        return df_pct
+    out = df_pct.copy(deep=False)
+    out.attrs["compare"] = {
+        "years": tuple(years),
+        "prior": dict(chart_rows(prior_pct, prior_pct.columns[0], prior_pct.columns[1])),
+    }
+    return out
+
+
+def with_split(df_pct: pd.DataFrame, split_df: pd.DataFrame | None, dim_label: str, order=None) -> pd.DataFrame:
+    """``df_pct`` tagged with per-segment shares (see ``FilterCube.split_pct``); charts then get one bar per segment.
+
+    Segments follow ``order`` where given (revenue and employee bands), else sort by name.
+    """
+    if split_df is None or split_df.empty or df_pct.empty:
+        return df_pct
+    segments = [str(s) for s in pd.unique(split_df["segment"])]
+    if order:
+        known = [str(s) for s in order]
+        segments = [s for s in known if s in segments] + [s for s in segments if s not in known]
+    else:
+        segments = sorted(segments)
+    out = df_pct.copy(deep=False)
+    out.attrs["split"] = {
+        "dim": dim_label,
+        "segments": tuple(segments),
+        "rows": tuple(
+            zip(
+                split_df["segment"].astype(str),
+                split_df[split_df.columns[1]].astype(str),
+                split_df["pct"].astype(float),
+            )
+        ),
+    }
+    return out
+
+
+def grouped_bar_chart_spec(
+    rows: tuple, cat_field: str, series_field: str, title: str, order: tuple, facet: bool = False
+) -> str:
+    """Horizontal bars of ``(category, series, percent)`` rows: grouped per category, or one panel per series."""
+    alt = _altair()
+    data = pd.DataFrame(list(rows), columns=[cat_field, series_field, "Percent"])
+    data["PercentLabel"] = data["Percent"].map(lambda v: f"{v:.1f}%")
+    order = list(order)
+
+    encoding = {
+        "x": alt.X(
+            "Percent:Q",
+            title="Share of respondents (%)",
+            axis=alt.Axis(format=".0f", grid=True, gridColor="#f1f5f9"),
+        ),
+        "y": alt.Y(f"{cat_field}:N", sort=None, title=None, axis=alt.Axis(labelOverlap=False)),
+        "color": alt.Color(
+            f"{series_field}:N",
+            sort=order,
+            scale=alt.Scale(domain=order, range=PL_COLORS[: len(order)]),
+            legend=None if facet else alt.Legend(title=None, orient="top"),
+        ),
+        "tooltip": [
+            f"{cat_field}:N",
+            f"{series_field}:N",
+            alt.Tooltip("Percent:Q", format=".1f", title="Percentage"),
+        ],
+    }
+    if not facet:
+        encoding["yOffset"] = alt.YOffset(f"{series_field}:N", sort=order)
+    base = alt.Chart(data).encode(**encoding)
+
+    bars = base.mark_bar(cornerRadius=4)
+    labels = base.mark_text(
+        align="left",
+        baseline="middle",
+        dx=4,
+        color="#020617",
+        fontWeight=600,
+    ).encode(text=alt.Text("PercentLabel:N"))
+
+    n_categories = data[cat_field].nunique()
+    if facet:
+        chart = (bars + labels).properties(width=220, height=max(120, 28 * n_categories)).facet(
+            facet=alt.Facet(f"{series_field}:N", sort=order, title=None),
+            columns=3,
+            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
+        )
+    else:
+        chart = (bars + labels).properties(
+            height=max(260, 22 * len(data)),
+            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
+        )
+
+    return chart.configure_axisY(labelPadding=8).to_json()
+
+
+def bar_chart_spec(rows: tuple, cat_field: str, title: str, horizontal: bool) -> str:
+    alt = _altair()
+    data = pd.DataFrame(list(rows), columns=[cat_field, "Percent"])
+    data["PercentLabel"] = data["Percent"].map(lambda v: f"{v:.1f}%")
+
+    if horizontal:
+        base = alt.Chart(data).encode(
+            x=alt.X(
+                "Percent:Q",
+                title="Share of respondents (%)",
+                axis=alt.Axis(format=".0f", grid=True, gridColor="#f1f5f9"),
+            ),
+            y=alt.Y(
+                f"{cat_field}:N",
+                sort="-x",
+                title=None,
+                axis=alt.Axis(labelOverlap=False),
+            ),
+            color=alt.Color(
+                f"{cat_field}:N",
+                legend=None,
+                scale=alt.Scale(range=PL_COLORS),
+            ),
+            tooltip=[
+                f"{cat_field}:N",
+                alt.Tooltip("Percent:Q", format=".1f", title="Percentage"),
+            ],
+        )
+
+        bars = base.mark_bar(cornerRadius=4)
+        labels = base.mark_text(
+            align="left",
+            baseline="middle",
+            dx=4,
+            color="#020617",
+            fontWeight=600,
+        ).encode(text=alt.Text("PercentLabel:N"))
+
+        chart = (bars + labels).properties(
+            height=max(260, 32 * len(data)),
+            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
+        ).configure_axisY(labelPadding=8)
+    else:
+        base = alt.Chart(data).encode(
+            x=alt.X(
+                f"{cat_field}:N",
+                sort="-y",
+                title=None,
+                axis=alt.Axis(labelOverlap=False, labelAngle=0),
+            ),
+            y=alt.Y(
+                "Percent:Q",
+                title="Share of respondents (%)",
+                axis=alt.Axis(format=".0f", grid=True, gridColor="#f1f5f9"),
+            ),
+            color=alt.Color(
+                f"{cat_field}:N",
+                legend=None,
+                scale=alt.Scale(range=PL_COLORS),
+            ),
+            tooltip=[
+                f"{cat_field}:N",
+                alt.Tooltip("Percent:Q", format=".1f", title="Percentage"),
+            ],
+        )
+
+        bars = base.mark_bar(cornerRadius=4)
+        labels = base.mark_text(
+            align="center",
+            baseline="bottom",
+            dy=-6,
+            color="#020617",
+            fontWeight=600,
+        ).encode(text=alt.Text("PercentLabel:N"))
+
+        chart = (bars + labels).properties(
+            height=320,
+            title=alt.TitleParams(title, fontSize=16, fontWeight=700, anchor="start"),
+        )
+
+    return chart.to_json()
@@ -0,0 +1,1848 @@
+"""Data and aggregation core of the SOPL dashboard.
+
+Loading and snapshots, answer normalization, filtering, aggregates, the precomputed
+cube and the chart registry. Nothing here imports Streamlit or Altair, so workers, the
+CLIs, the aggregates API and the tests can use it without starting the UI stack;
+``app.py`` is the Streamlit page on top of it.
+"""
+import codecs
+import contextlib
+import contextvars
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+import types
+import urllib.request
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AGGREGATE_CACHE_SIZE = 2048  # memoized chart aggregates kept across reruns and sessions
+CUBE_MAX_CATEGORIES = 50  # columns with more distinct answers are not pre-counted
+COMPACT_MAX_CATEGORIES = 50  # text columns with at most this many answers are stored as categoricals
+
+# Multi-select (checkbox) question groups: one column per option, sharing a prefix
+INFLUENCE_PREFIX = "Besides Sourced Revenue, how else does your company measure"
+PARTNERSHIP_HAVE_PREFIX = "Which of the following Partnership types does your company have?"
+PARTNERSHIP_EXPAND_PREFIX = "Which partnership types are you planning to expand into"
+ROLES_PREFIX = "What roles exist on your Partner Team?"
+COL_TOP3_BUDGET_PREFIX = "What are the top 3 budget line items for your Partnerships organization, excluding headcount?"
+SAT_PREFIX = "How do you measure partner satisfaction?"
+MULTI_SELECT_PREFIXES = [
+    INFLUENCE_PREFIX,
+    PARTNERSHIP_HAVE_PREFIX,
+    PARTNERSHIP_EXPAND_PREFIX,
+    ROLES_PREFIX,
+    COL_TOP3_BUDGET_PREFIX,
+    SAT_PREFIX,
+]
+
+# Column resolution rules: an exact header, else the first column containing a substring.
+# Matching is done on quote/dash/whitespace-folded names, so curly vs straight variants need not be listed.
+COLUMN_SPECS = {
+    "COL_REGION": {"exact": "Please select the region where your company is headquartered."},
+    "COL_INDUSTRY": {"exact": "What industry sector does your company operate in?"},
+    "COL_REVENUE": {
+        "exact": "What is your companys estimated annual revenue?",
+        "substrings": ["company's estimated annual revenue", "estimated annual revenue"],
+    },
+    "COL_EMPLOYEES": {
+        "exact": "What is your companys total number of employees?",
+        "substrings": ["total number of employees"],
+    },
+    "COL_DEAL_SIZE": {
+        "exact": "How does your average deal size involving partners compare to direct or non-partner deals?"
+    },
+    "COL_CAC": {
+        "exact": "How does your customer acquisition cost (CAC) from partners compared to direct sales and marketing?"
+    },
+    "COL_SALES_CYCLE": {"exact": "How does your partner-led sales cycle compare to your direct sales cycle?"},
+    "COL_WIN_RATE": {"exact": "What’s your win rate for deals where partners are involved?"},
+    "COL_PRIMARY_GOAL": {"substrings": ["main goal for partnerships in the next 12 months"]},
+    "COL_EXEC_EXPECT": {
+        "substrings": ["executive teams expectations of partnerships", "executive team's expectations of partnerships"]
+    },
+    "COL_EXPECTED_REV": {"substrings": ["expected to come from partnerships in the next 12 months"]},
+    "COL_RETENTION": {"substrings": ["retention rate for partner-referred customers"]},
+    "COL_MOST_IMPACTFUL_TYPE": {"substrings": ["most impact", "most impactful type"]},
+    "COL_BIGGEST_CHALLENGE": {"substrings": ["biggest challenge in scaling your partner program"]},
+    "COL_MISS_GOALS_REASON": {"substrings": ["most likely reason your Partnerships team could miss its goals"]},
+    "COL_TEAM_SIZE": {"substrings": ["people are on your Partnerships team"]},
+    "COL_BUDGET": {"substrings": ["annual budget", "Partnerships teams annual budget"]},
+    "COL_USE_TECH": {"substrings": ["technology or automation tools to manage your partner ecosystem"]},
+    "COL_USE_AI": {"substrings": ["using AI in your partner organization"]},
+    "COL_MARKETPLACE_LISTED": {"substrings": ["company listed in", "listed in marketplaces"]},
+    "COL_MARKETPLACE_REV": {
+        "substrings": ["total revenue comes through cloud marketplaces", "revenue comes through cloud marketplaces"]
+    },
+    "COL_PARTNER_FOCUS": {"substrings": ["focus next 12 months"]},
+    "COL_STRATEGIC_BET": {"substrings": ["Strategic bet", "strategic bet next 12 months"]},
+    "COL_FORECAST_PERF": {"substrings": ["Forecasted performance", "forecasting your performance"]},
+    "COL_REPORTING": {"substrings": ["report to", "majority of your partner organization report"]},
+    "COL_TRAINING": {"substrings": ["level of training", "training or enablement"]},
+    "COL_TOTAL_PARTNERS": {"exact": "How many total partners do you have?"},
+    "COL_ACTIVE_PARTNERS": {"exact": "How many active partners generated revenue in the last 12 months?"},
+}
+
+REVENUE_ORDER = [
+    "Less than $50 million",
+    "$50M – $250M",
+    "$250M – $1B",
+    "$1B – $10B",
+    "More than $10B",
+]
+EMPLOYEE_ORDER = [
+    "Less than 100 employees",
+    "100 – 500 employees",
+    "501 – 5,000 employees",
+    "More than 5,000 employees",
+]
+# Order segments are drawn in when charts are split by a banded dimension
+SEGMENT_ORDERS = {"revenue": REVENUE_ORDER, "employees": EMPLOYEE_ORDER}
+
+# ==================== INSTRUMENTATION ====================
+_ACTIVE_PROFILE: contextvars.ContextVar = contextvars.ContextVar("sopl_profile", default=None)
+
+
+class RerunProfile:
+    """Stage records (wall time, rows processed, bytes emitted) collected during one rerun."""
+
+    def __init__(self):
+        self.records: list[dict] = []
+        self.meta: dict = {}
+        self._t0 = time.perf_counter()
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame.from_records(
+            self.records, columns=["stage", "ms", "rows", "bytes", "cache"]
+        )
+
+
+@contextlib.contextmanager
+def timed(stage: str, rows: int | None = None):
+    """Time a block on the active profile (no-op when profiling is off).
+
+    Yields the record dict so the block can fill in ``rows``, ``bytes`` or ``cache``.
+    """
+    rec = {"stage": stage, "ms": None, "rows": rows, "bytes": None, "cache": None}
+    profile = _ACTIVE_PROFILE.get()
+    if profile is None:
+        yield rec
+        return
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec["ms"] = (time.perf_counter() - t0) * 1000.0
+        profile.records.append(rec)
+
+
+def timed_stage(stage: str):
+    """Decorator form of :func:`timed`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def profiling(profile: RerunProfile | None):
+    """Make ``profile`` the active profile for the enclosed block (None: profiling off)."""
+    token = _ACTIVE_PROFILE.set(profile)
+    try:
+        yield profile
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+
+
+def annotate_profile(key: str, value) -> None:
+    """Attach run-level metadata (e.g. memory footprint) to the active profile, if any."""
+    profile = _ACTIVE_PROFILE.get()
+    if profile is not None:
+        profile.meta[key] = value
+
+
+def short_label(text, limit: int = 60) -> str:
+    """``text`` cut to ``limit`` characters with an ellipsis, for stage names."""
+    text = str(text)
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+# ==================== DATA / UTILS ====================
+SNAPSHOT_DIR = Path(os.environ.get("SOPL_SNAPSHOT_DIR", ".sopl_snapshots"))
+SNAPSHOT_MAX_AGE_S = 15 * 60  # a snapshot on disk older than this is revalidated right after a cold start
+SNAPSHOT_KEEP = 3  # dataset versions kept on disk besides those a pointer references
+FETCH_TIMEOUT_S = 30
+CURRENT_SURVEY_YEAR = 2025  # the wave behind `gsheet_url` unless the `survey_year` secret says otherwise
+refresh_logger = logging.getLogger("sopl.refresh")
+
+
+def fetch_sheet_bytes(url: str, timeout: float = FETCH_TIMEOUT_S) -> bytes:
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.read()
+
+
+def detect_encoding(raw: bytes) -> str:
+    """Pick the CSV encoding from the raw bytes instead of trial-parsing."""
+    if raw.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for enc in ("utf-8", "cp1252"):
+        try:
+            raw.decode(enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    # latin-1 maps every byte, so it never fails
+    return "latin-1"
+
+
+def parse_csv_bytes(raw: bytes, encoding: str | None = None) -> pd.DataFrame:
+    enc = encoding or detect_encoding(raw)
+    return pd.read_csv(io.BytesIO(raw), encoding=enc)
+
+
+# Byte 0x80-0xFF -> the character it shows as when UTF-8 is misread as cp1252 (latin-1 for the
+# five bytes cp1252 leaves undefined), and back
+_CP1252_CHARS = {b: bytes([b]).decode("cp1252", errors="ignore") or chr(b) for b in range(0x80, 0x100)}
+_CP1252_BYTES = {ch: b for b, ch in _CP1252_CHARS.items()}
+_CONT = "".join(re.escape(_CP1252_CHARS[b]) for b in range(0x80, 0xC0))
+# one misread multi-byte UTF-8 sequence: a lead byte and its continuation bytes ("Ã©", "â€™")
+_MOJIBAKE_RE = re.compile(f"[\u00c2-\u00df][{_CONT}]|[\u00e0-\u00ef][{_CONT}]{{2}}|[\u00f0-\u00f4][{_CONT}]{{3}}")
+
+
+def _redecode(match: re.Match) -> str:
+    try:
+        return bytes(_CP1252_BYTES[ch] for ch in match.group()).decode("utf-8")
+    except UnicodeDecodeError:
+        return match.group()
+
+
+def repair_text(text: str) -> str:
+    """``text`` with encoding damage undone.
+
+    UTF-8 sequences that were decoded as cp1252 or latin-1 ("Whatâ€™s") are re-decoded
+    one by one, so a value mixing misread and correct characters is fixed too; BOMs and
+    U+FFFD replacement markers (bytes lost to an earlier bad decode) are dropped.
+    """
+    text = _MOJIBAKE_RE.sub(_redecode, text)
+    return text.replace("\ufeff", "").replace("\ufffd", "")
+
+
+@timed_stage("repair text")
+def repair_replacement_chars(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply ``repair_text`` to every text cell and header of ``df`` in place and return it.
+
+    Each column is factorized and only its distinct answers are repaired, then mapped back
+    through the codes, so the cost follows the number of different answers, not cells.
+    Repaired cell counts per (repaired) column name are stored in ``df.attrs["sopl_repairs"]``.
+    """
+    repaired = {}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        if s.dtype != object:
+            continue
+        codes, uniques = pd.factorize(s)
+        fixed = np.array([repair_text(u) if isinstance(u, str) else u for u in uniques], dtype=object)
+        changed = fixed != uniques.astype(object)
+        if not changed.any():
+            continue
+        values = fixed[codes]
+        missing = codes < 0
+        values[missing] = s.to_numpy()[missing]
+        df.isetitem(i, values)
+        repaired[i] = int(np.count_nonzero(changed[codes[~missing]]))
+    df.columns = [repair_text(c) if isinstance(c, str) else c for c in df.columns]
+    repaired = {str(df.columns[i]): n for i, n in repaired.items()}
+    df.attrs["sopl_repairs"] = {"cells": sum(repaired.values()), "columns": repaired}
+    return df
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def source_id(url: str) -> str:
+    """Short hash of a sheet URL, recorded in the snapshot pointer instead of the (private) URL itself."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Content hash of the source CSV the frame was parsed from ("" if unknown)."""
+    return df.attrs.get("sopl_version", "")
+
+
+# bump whenever parsing or the load-time repair changes what a sheet's bytes parse to, so
+# snapshots written by an older pipeline are parsed again instead of reused
+PARSE_FORMAT = 2
+
+
+def _snapshot_path(key: str) -> Path:
+    return SNAPSHOT_DIR / f"sopl_{key}.v{PARSE_FORMAT}.parquet"
+
+
+def read_snapshot(key: str) -> pd.DataFrame | None:
+    path = _snapshot_path(key)
+    if not path.exists():
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:
+        return None
+    df.attrs["sopl_version"] = key
+    return df
+
+
+def _meta_path(partition: str = "") -> Path:
+    # one "latest" pointer per partition (survey year); snapshots themselves are content-addressed
+    return SNAPSHOT_DIR / (f"latest_{partition}.json" if partition else "latest.json")
+
+
+def _write_atomic(path: Path, write) -> None:
+    """Call ``write(tmp_path)`` on a temp file unique to this writer, then rename it over ``path``.
+
+    Replicas sharing ``SNAPSHOT_DIR`` may write the same file at once; each renames its own
+    complete copy into place, so readers never see a partial or interleaved file.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_snapshot(df: pd.DataFrame, key: str, encoding: str, partition: str = "", source: str = "") -> None:
+    try:
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        _write_atomic(_snapshot_path(key), lambda tmp: df.to_parquet(tmp, index=False))
+        meta = {"key": key, "encoding": encoding, "fetched_at": time.time(), "source": source}
+        _write_meta(partition, meta)
+        prune_snapshots()
+    except Exception:
+        # Snapshots are an optimisation only; a read-only disk must not break loading.
+        pass
+
+
+def _snapshot_key(path: Path) -> str:
+    # sopl_<key>.v<N>.parquet, sopl_<key>.built-v<N>.pkl
+    return path.name[len("sopl_"):].split(".", 1)[0]
+
+
+def prune_snapshots(keep: int | None = None) -> list[Path]:
+    """Delete snapshot files of versions no pointer references, except the ``keep`` newest (``SNAPSHOT_KEEP``).
+
+    Files of an older ``PARSE_FORMAT`` or ``SNAPSHOT_BUILD_FORMAT`` are never loaded again
+    and are always removed. Returns the deleted paths.
+    """
+    referenced = set()
+    for meta_path in SNAPSHOT_DIR.glob("latest*.json"):
+        try:
+            referenced.add(json.loads(meta_path.read_text())["key"])
+        except Exception:
+            continue
+    # never .tmp files: another process may be writing one
+    files = [p for p in SNAPSHOT_DIR.glob("sopl_*") if p.suffix in (".parquet", ".pkl")]
+    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    newest = []
+    for path in files:
+        key = _snapshot_key(path)
+        if key not in referenced and key not in newest:
+            newest.append(key)
+    kept = referenced | set(newest[: SNAPSHOT_KEEP if keep is None else keep])
+    removed = []
+    for path in files:
+        key = _snapshot_key(path)
+        if key not in kept or path not in (_snapshot_path(key), _built_snapshot_path(key)):
+            path.unlink(missing_ok=True)
+            removed.append(path)
+    return removed
+
+
+def _write_meta(partition: str, meta: dict) -> None:
+    _write_atomic(_meta_path(partition), lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+
+
+def latest_snapshot_meta(partition: str = "", source: str | None = None) -> dict | None:
+    """The partition's snapshot pointer; with ``source``, only if it was written for that sheet."""
+    try:
+        meta = json.loads(_meta_path(partition).read_text())
+    except Exception:
+        return None
+    # the snapshot directory may be shared by stores reading other sheets
+    return meta if source is None or meta.get("source") == source else None
+
+
+def record_fetch(key: str, partition: str = "", source: str = "") -> None:
+    """Note that the sheet was fetched just now and hashes to ``key`` (its snapshot is current)."""
+    meta = latest_snapshot_meta(partition) or {}
+    meta.update(key=key, fetched_at=time.time(), source=source)
+    try:
+        _write_meta(partition, meta)
+        prune_snapshots()
+    except Exception:
+        pass
+
+
+@timed_stage("parse csv / read snapshot")
+def load_from_bytes(raw: bytes, partition: str = "", source: str = "") -> pd.DataFrame:
+    key = content_hash(raw)
+    df = read_snapshot(key)
+    if df is not None:
+        return df
+    enc = detect_encoding(raw)
+    df = repair_replacement_chars(parse_csv_bytes(raw, enc))
+    write_snapshot(df, key, enc, partition, source)
+    df.attrs["sopl_version"] = key
+    return df
+
+
+def _ordered_categories(values, known_order: list[str]) -> list:
+    present = set(values)
+    return [v for v in known_order if v in present] + [v for v in values if v not in known_order]
+
+
+@timed_stage("compact dtypes")
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink the raw frame: categorical answers, UInt8 checkboxes, float32 percentages.
+
+    Low-cardinality text columns become ``pd.Categorical`` (revenue and employee bands
+    keep their natural order), multi-select option columns holding only 0/1 become
+    nullable ``UInt8`` and the numeric percentage questions become ``float32``.
+    The before/after footprint is stored in ``df.attrs["sopl_memory"]``.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    out = df.copy()
+    catalog = ColumnCatalog(df.columns)
+    converted = {"categorical": 0, "uint8": 0, "float32": 0}
+
+    checkbox_cols = {c for cols in catalog.prefix_cols.values() for c in cols}
+    for col in checkbox_cols:
+        num = pd.to_numeric(out[col], errors="coerce")
+        if num.notna().sum() == out[col].notna().sum() and num.dropna().isin([0, 1]).all():
+            out[col] = num.astype("UInt8")
+            converted["uint8"] += 1
+
+    for key in ("COL_WIN_RATE", "COL_RETENTION", "COL_EXPECTED_REV"):
+        col = catalog[key]
+        if col is not None and pd.api.types.is_numeric_dtype(out[col]):
+            out[col] = out[col].astype(np.float32)
+            converted["float32"] += 1
+
+    orders = {catalog["COL_REVENUE"]: REVENUE_ORDER, catalog["COL_EMPLOYEES"]: EMPLOYEE_ORDER}
+    for col in out.columns:
+        if col in checkbox_cols or out[col].dtype != object:
+            continue
+        s = out[col]
+        uniques = s.dropna().unique()
+        if len(uniques) > COMPACT_MAX_CATEGORIES or len(uniques) > 0.5 * s.notna().sum():
+            continue
+        if col in orders:
+            cats = _ordered_categories(list(uniques), orders[col])
+            out[col] = pd.Categorical(s, categories=cats, ordered=True)
+        else:
+            out[col] = s.astype("category")
+        converted["categorical"] += 1
+
+    after = int(out.memory_usage(deep=True).sum())
+    out.attrs["sopl_memory"] = {"before_bytes": before, "after_bytes": after, **converted}
+    return out
+
+
+def _read_only(values) -> np.ndarray:
+    arr = np.array(values, copy=True)
+    arr.flags.writeable = False
+    return arr
+
+
+@timed_stage("freeze frame")
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild ``df`` on read-only NumPy buffers so a frame shared across sessions can't be mutated.
+
+    Every column keeps its dtype (categoricals via read-only codes, nullable integers
+    via read-only values and mask); any in-place write raises ``ValueError``.
+    """
+    cols = {}
+    for col in df.columns:
+        arr = df[col].array
+        if isinstance(arr, pd.Categorical):
+            cols[col] = pd.Categorical.from_codes(_read_only(arr.codes), dtype=arr.dtype)
+        elif isinstance(arr, (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)):
+            values = arr.to_numpy(dtype=arr.dtype.numpy_dtype, na_value=0)
+            cols[col] = type(arr)(_read_only(values), _read_only(arr.isna()))
+        elif isinstance(df[col].dtype, np.dtype):
+            cols[col] = _read_only(df[col].to_numpy())
+        else:
+            cols[col] = arr
+    out = pd.DataFrame(cols, index=df.index, copy=False)
+    out.attrs = dict(df.attrs)
+    return out
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the load-time derived columns of ``NORMALIZATION_RULES`` to ``df`` in place and return it."""
+    catalog = ColumnCatalog(df.columns)
+    for name, (key, rule) in NORMALIZATION_RULES.items():
+        source = catalog[key]
+        df[name] = normalize_answers(df[source], rule) if source else None
+    return df
+
+
+def selection_key(selection: dict[str, list | None]) -> tuple:
+    """Canonical, hashable form of a filter selection (order of picks doesn't matter)."""
+    return tuple(
+        (dim, tuple(sorted(str(v) for v in values)) if values else None)
+        for dim, values in sorted(selection.items())
+    )
+
+
+def _detach(value):
+    # callers reorder/relabel frames in place, so never hand out the cached object
+    return value.copy() if hasattr(value, "copy") else value
+
+
+class AggregateCache:
+    """Thread-safe bounded LRU for small computed values, with hit/miss counters.
+
+    Holds chart aggregates (frames) and finished chart specs (JSON strings).
+    """
+
+    def __init__(self, maxsize: int = AGGREGATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return _detach(self._data[key])
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return _detach(value)
+
+    def contains(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+def value_counts_pct(series: pd.Series, keep_empty: bool = False) -> pd.DataFrame:
+    s = series.dropna()
+    if s.empty:
+        return pd.DataFrame(columns=["category", "pct"])
+    counts = s.value_counts()
+    if not keep_empty:
+        # categorical answers list every category; only report the ones actually chosen
+        counts = counts[counts > 0]
+    total_non_null = len(s)
+    pct = (counts / total_non_null) * 100.0
+    out = pct.reset_index()
+    out.columns = ["category", "pct"]
+    return out
+
+
+def binned_pct_custom(series: pd.Series, edges: list[float], labels: list[str]) -> pd.DataFrame:
+    s = pd.to_numeric(series, errors="coerce").dropna()
+    if s.empty:
+        return pd.DataFrame(columns=["bin", "pct"])
+    binned = pd.cut(s, bins=edges, labels=labels, include_lowest=True, right=False)
+    pct_df = value_counts_pct(binned, keep_empty=True).rename(columns={"category": "bin"})
+    return pct_df
+
+
+def bin_or_value_counts_pct(series: pd.Series, edges: list[float], labels: list[str]) -> pd.DataFrame:
+    """Binned shares when the answers are mostly numeric, plain answer shares otherwise."""
+    s = series.dropna()
+    num = pd.to_numeric(s, errors="coerce")
+    if num.notna().sum() > 0 and num.notna().mean() > 0.7:
+        return binned_pct_custom(num, edges, labels)
+    return value_counts_pct(s.astype(str))
+
+
+def _default_label_from_col(col_name: str) -> str:
+    if '"' in col_name:
+        parts = col_name.split('"')
+        if len(parts) >= 3:
+            return parts[1].strip()
+    if " – " in col_name:
+        return col_name.split(" – ", 1)[0].split("?")[-1].strip()
+    if "? " in col_name:
+        return col_name.split("? ", 1)[1].strip()
+    return col_name.strip()
+
+
+class MultiSelectGroup:
+    """Checkbox answers of one multi-select question, prepared once per dataset.
+
+    ``matrix`` is a C-contiguous uint8 (rows × options) array of ticked boxes and
+    ``answered`` flags rows that touched any option, so a filtered aggregate is a
+    single masked column-sum plus an any-row count.
+    """
+
+    def __init__(self, cols: list[str], matrix: np.ndarray, answered: np.ndarray, labels: np.ndarray):
+        self.cols = cols
+        self.matrix = matrix
+        self.answered = answered
+        self.labels = labels
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cols: list[str], label_parser=_default_label_from_col):
+        sub = df[cols]
+        if all(pd.api.types.is_numeric_dtype(t) for t in sub.dtypes):
+            values = sub.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = sub.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        matrix = np.ascontiguousarray((present & (values != 0)).astype(np.uint8))
+        labels = np.array([label_parser(c) for c in cols], dtype=object)
+        return cls(list(cols), matrix, present.any(axis=1), labels)
+
+    def counts(self, rows: np.ndarray | None = None) -> tuple[np.ndarray, int]:
+        """Per-option tick counts and number of respondents, over ``rows`` (None = all)."""
+        if rows is None:
+            return self.matrix.sum(axis=0, dtype=np.int64), int(self.answered.sum())
+        return self.matrix[rows].sum(axis=0, dtype=np.int64), int(self.answered[rows].sum())
+
+    def to_pct(self, rows: np.ndarray | None = None) -> pd.DataFrame:
+        counts, n_resp = self.counts(rows)
+        return counts_to_multi_pct(self.labels, counts, n_resp)
+
+    def apply_delta(self, keep: np.ndarray | None, added: "MultiSelectGroup") -> "MultiSelectGroup":
+        """Group over this group's rows at ``keep`` (None = all) followed by ``added``'s rows."""
+        matrix = self.matrix if keep is None else self.matrix[keep]
+        answered = self.answered if keep is None else self.answered[keep]
+        return MultiSelectGroup(
+            self.cols,
+            np.ascontiguousarray(np.vstack([matrix, added.matrix])),
+            np.concatenate([answered, added.answered]),
+            self.labels,
+        )
+
+
+def counts_to_multi_pct(labels, counts, n_resp) -> pd.DataFrame:
+    if n_resp == 0:
+        return pd.DataFrame(columns=["category", "pct"])
+    out = pd.DataFrame({"category": labels, "pct": counts / n_resp * 100.0})
+    return out.sort_values("pct", ascending=False, kind="stable")
+
+
+def multi_select_to_pct(
+    df: pd.DataFrame, cols: list[str], label_parser=_default_label_from_col
+) -> pd.DataFrame:
+    if not cols:
+        return pd.DataFrame(columns=["category", "pct"])
+    return MultiSelectGroup.from_frame(df, cols, label_parser).to_pct()
+
+
+def normalize_region_label(x):
+    if pd.isna(x):
+        return None
+    s = str(x)
+    if "North America" in s:
+        return "North America"
+    if "Latin America" in s:
+        return "Latin America"
+    if "Asia-Pacific" in s or "Asia Pacific" in s or "APAC" in s:
+        return "Asia Pacific"
+    if "Europe" in s or "EMEA" in s:
+        return "Europe"
+    return s
+
+
+# ----- Load-time normalization rules -----
+_YES_NO_LABELS = {
+    "1": "Yes",
+    "1.0": "Yes",
+    "true": "Yes",
+    "yes": "Yes",
+    "y": "Yes",
+    "0": "No",
+    "0.0": "No",
+    "false": "No",
+    "no": "No",
+    "n": "No",
+}
+_NO_DATA_RE = re.compile("I don’t have this data|I don't have this data", re.IGNORECASE)
+
+
+def yes_no_label(answer) -> str:
+    text = str(answer)
+    return _YES_NO_LABELS.get(text.strip().lower(), text)
+
+
+def exec_expect_short(answer) -> str:
+    """Leading level of an expectations answer: ``High - growth engine`` -> ``High``."""
+    return str(answer).split(" - ", 1)[0]
+
+
+def known_budget(answer) -> str | None:
+    text = str(answer)
+    return None if _NO_DATA_RE.search(text) else text
+
+
+# Derived column -> (COLUMN_SPECS key of its source question, rule). A rule maps one distinct
+# answer to its label (None drops the answer); the results are stored as categorical columns.
+NORMALIZATION_RULES = {
+    "RegionStd": ("COL_REGION", normalize_region_label),
+    "ExecExpectShort": ("COL_EXEC_EXPECT", exec_expect_short),
+    "BudgetKnown": ("COL_BUDGET", known_budget),
+    "MarketplaceListedStd": ("COL_MARKETPLACE_LISTED", yes_no_label),
+}
+
+
+def normalize_answers(series: pd.Series, rule) -> pd.Series:
+    """``rule`` applied to every answer of ``series``, as a categorical aligned to its rows.
+
+    The rule runs once per distinct answer (factorize, map the uniques, remap the codes),
+    so the cost follows the number of different answers rather than the number of rows.
+    """
+    codes, uniques = pd.factorize(series)
+    labels, categories = pd.factorize(pd.Series([rule(u) for u in uniques], dtype=object))
+    # answers the rule drops and missing rows (code -1) both end up in the trailing -1 slot
+    remap = np.append(labels, -1)
+    return pd.Series(pd.Categorical.from_codes(remap[codes], categories=categories), index=series.index)
+
+
+def find_col(df: pd.DataFrame, exact: str | None = None, substrings: list[str] | None = None):
+    if exact and exact in df.columns:
+        return exact
+    if substrings:
+        for s in substrings:
+            matches = [c for c in df.columns if s in c]
+            if matches:
+                return matches[0]
+    return None
+
+
+_FOLD_TABLE = str.maketrans(
+    {
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201b": "'",
+        "\u2032": "'",
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u2013": "-",
+        "\u2014": "-",
+        "\u2011": "-",
+        "\u2212": "-",
+        "\u00a0": " ",
+    }
+)
+
+
+def fold_column_name(name: str) -> str:
+    """Fold curly quotes, dash variants and runs of whitespace so header lookups are variant-proof."""
+    return re.sub(r"\s+", " ", str(name).translate(_FOLD_TABLE)).strip()
+
+
+def normalize(text) -> str:
+    """Lowercase words of ``text`` with quote/dash variants folded and punctuation dropped, for loose matching."""
+    return " ".join(re.sub(r"[^\w]+", " ", fold_column_name(text).lower()).split())
+
+
+# Partner-count answer bands -> (low, high) partners; high is exclusive, None for the open-ended band
+TOTAL_PARTNERS_MAP = {"Less than 50": (0, 50), "50 - 499": (50, 500), "500+": (500, None)}
+ACTIVE_PARTNERS_MAP = {"Less than 10": (0, 10), "10-49": (10, 50), "50+": (50, None)}
+
+
+def mid_from_bins(label, bins: dict) -> float | None:
+    """Midpoint of answer band ``label`` in ``bins`` (the lower bound if open-ended); None if unknown.
+
+    Labels are matched with ``normalize``, so "50 – 499" finds "50 - 499".
+    """
+    if not isinstance(label, str):
+        return None
+    bounds = {normalize(k): v for k, v in bins.items()}.get(normalize(label))
+    if bounds is None:
+        return None
+    low, high = bounds
+    return float(low) if high is None else (low + high) / 2.0
+
+
+def schema_hash(columns) -> str:
+    return hashlib.sha256("\x1f".join(map(str, columns)).encode("utf-8")).hexdigest()[:16]
+
+
+class ColumnCatalog:
+    """Every ``COLUMN_SPECS`` and multi-select prefix resolution for one schema, computed once.
+
+    ``catalog["COL_REVENUE"]`` is a dict lookup; ``catalog.prefix_cols[prefix]`` lists
+    the option columns of a multi-select group in frame order.
+    """
+
+    def __init__(self, columns, specs: dict | None = None, prefixes: list[str] | None = None):
+        self.columns = tuple(columns)
+        self.folded = tuple(fold_column_name(c) for c in self.columns)
+        self._by_folded: dict[str, int] = {}
+        self._tokens: dict[str, list[int]] = {}
+        for i, name in enumerate(self.folded):
+            self._by_folded.setdefault(name, i)
+            for tok in set(name.split(" ")):
+                self._tokens.setdefault(tok, []).append(i)
+
+        specs = COLUMN_SPECS if specs is None else specs
+        prefixes = MULTI_SELECT_PREFIXES if prefixes is None else prefixes
+        self.cols = types.MappingProxyType(
+            {key: self.find(spec.get("exact"), spec.get("substrings")) for key, spec in specs.items()}
+        )
+        self.prefix_cols = types.MappingProxyType({p: self.containing(p) for p in prefixes})
+
+    def __getitem__(self, key: str) -> str | None:
+        return self.cols[key]
+
+    def counterpart(self, col: str, other: "ColumnCatalog") -> str | None:
+        """The column in ``other``'s schema asking the same question as ``col`` does here.
+
+        Known questions map through their ``COLUMN_SPECS`` key, so rewordings between survey
+        waves still line up; anything else matches by folded header text.
+        """
+        for key, mine in self.cols.items():
+            if mine == col:
+                return other.cols.get(key)
+        return other.find(exact=col)
+
+    def _candidates(self, folded_sub: str) -> list[int]:
+        # Inner tokens of a substring are whole tokens of any match; the edges may be partial.
+        inner = folded_sub.split(" ")[1:-1]
+        if not inner:
+            return list(range(len(self.columns)))
+        postings = [set(self._tokens.get(tok, ())) for tok in inner]
+        return sorted(set.intersection(*postings))
+
+    def containing(self, sub: str) -> tuple[str, ...]:
+        folded_sub = fold_column_name(sub)
+        return tuple(self.columns[i] for i in self._candidates(folded_sub) if folded_sub in self.folded[i])
+
+    def find(self, exact: str | None = None, substrings: list[str] | None = None) -> str | None:
+        if exact:
+            if exact in self.columns:
+                return exact
+            i = self._by_folded.get(fold_column_name(exact))
+            if i is not None:
+                return self.columns[i]
+        for sub in substrings or []:
+            matches = self.containing(sub)
+            if matches:
+                return matches[0]
+        return None
+
+
+_CATALOGS: dict[str, ColumnCatalog] = {}
+
+
+def build_column_catalog(schema: str, columns: tuple) -> ColumnCatalog:
+    """The process-wide ``ColumnCatalog`` for a schema (``schema_hash(columns)``), built on first use."""
+    catalog = _CATALOGS.get(schema)
+    if catalog is None:
+        catalog = _CATALOGS[schema] = ColumnCatalog(columns)
+    return catalog
+
+
+class FilterIndex:
+    """Boolean row bitmaps per value of each filter dimension, built once per dataset.
+
+    A selection maps dimension -> list of accepted values (``None`` = no filter);
+    values are OR-ed within a dimension and dimensions are AND-ed together.
+    """
+
+    def __init__(self, df: pd.DataFrame, dims: dict[str, str | None]):
+        self.dims = dims
+        self.n_rows = len(df)
+        self.bitmaps: dict[str, dict] = {}
+        for dim, col in dims.items():
+            if col is None or col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            self.bitmaps[dim] = {val: codes == i for i, val in enumerate(uniques)}
+
+    def options(self, dim: str) -> list:
+        return list(self.bitmaps.get(dim, {}))
+
+    def mask(self, selection: dict[str, list | None]) -> np.ndarray | None:
+        out = None
+        for dim, values in selection.items():
+            if not values or dim not in self.bitmaps:
+                continue
+            dim_mask = np.zeros(self.n_rows, dtype=bool)
+            for v in values:
+                bm = self.bitmaps[dim].get(v)
+                if bm is not None:
+                    dim_mask |= bm
+            out = dim_mask if out is None else out & dim_mask
+        return out
+
+    def rows(self, selection: dict[str, list | None]) -> np.ndarray | None:
+        """Row positions matching ``selection``, or ``None`` when nothing is filtered."""
+        m = self.mask(selection)
+        return None if m is None else np.flatnonzero(m)
+
+    def apply_delta(self, keep: np.ndarray | None, added: pd.DataFrame) -> "FilterIndex":
+        """Index over this index's rows at ``keep`` (None = all) followed by the ``added`` rows."""
+        fresh = FilterIndex(added, self.dims)
+        n_kept = self.n_rows if keep is None else len(keep)
+        out = FilterIndex.__new__(FilterIndex)
+        out.dims, out.n_rows, out.bitmaps = self.dims, n_kept + len(added), {}
+        for dim, old in self.bitmaps.items():
+            new = fresh.bitmaps.get(dim, {})
+            merged = {}
+            for val in list(old) + [v for v in new if v not in old]:
+                if val in old:
+                    head = old[val] if keep is None else old[val][keep]
+                else:
+                    head = np.zeros(n_kept, dtype=bool)
+                bm = np.concatenate([head, new.get(val, np.zeros(len(added), dtype=bool))])
+                if bm.any():
+                    merged[val] = bm
+            out.bitmaps[dim] = merged
+        return out
+
+
+class RowSubset:
+    """Filtered view of the shared frame: the frame plus matching row positions.
+
+    Indexing gathers just the requested column(s) for those rows (remembered for the
+    rerun), so a selection never copies the whole dataset; with ``rows=None`` the
+    shared read-only columns are returned as they are.
+    """
+
+    def __init__(self, df: pd.DataFrame, rows: np.ndarray | None):
+        self.df = df
+        self.rows = rows
+        self.columns = df.columns
+        self._gathered: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            frame = self.df[key]
+            return frame if self.rows is None else frame.take(self.rows)
+        if key not in self._gathered:
+            col = self.df[key]
+            self._gathered[key] = col if self.rows is None else col.take(self.rows)
+        return self._gathered[key]
+
+
+# Aggregate spec kind -> row-level transform applied before counting answers.
+# Spec tuples double as AggregateCache keys: ("vc", col), ("bin", col, edges, labels), ("multi", prefix).
+SINGLE_SELECT_TRANSFORMS = {
+    "vc": lambda s: s,
+    "vc_str": lambda s: s.dropna().astype(str),
+}
+
+
+def aggregate_rows(spec: tuple, rows: pd.DataFrame, prefix_cols) -> pd.DataFrame:
+    """``spec`` computed from row-level data (the filtered rows holding the columns it reads)."""
+    kind = spec[0]
+    if kind == "multi":
+        return multi_select_to_pct(rows, list(prefix_cols.get(spec[1], ())))
+    series = rows[spec[1]]
+    if kind == "bin":
+        return binned_pct_custom(series, list(spec[2]), list(spec[3]))
+    if kind == "bin_or_vc":
+        return bin_or_value_counts_pct(series, list(spec[2]), list(spec[3]))
+    return value_counts_pct(SINGLE_SELECT_TRANSFORMS[kind](series))
+
+
+def spec_columns(spec: tuple, prefix_cols) -> list[str]:
+    return list(prefix_cols.get(spec[1], ())) if spec[0] == "multi" else [spec[1]]
+
+
+class FilterCube:
+    """Raw answer counts per (region × revenue × employees) cell.
+
+    Each aggregate spec is counted once per dataset over every cell; any filter
+    selection is then answered by summing the selected cells and dividing, without
+    touching row-level data. Rows missing a dimension value get their own cell so
+    "All" selections still include them.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        dims: dict[str, str | None],
+        prefixes: list[str] | None = None,
+        groups: dict[str, MultiSelectGroup] | None = None,
+    ):
+        self._df = df
+        self._groups = dict(groups or {})
+        self._lock = threading.Lock()
+        self.dim_cols: dict[str, str] = {}
+        self.dim_values: dict[str, list] = {}
+        shape = []
+        cell = np.zeros(len(df), dtype=np.int64)
+        for dim, col in dims.items():
+            if col is None or col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            codes = np.where(codes < 0, len(uniques), codes)
+            self.dim_cols[dim] = col
+            self.dim_values[dim] = list(uniques)
+            cell = cell * (len(uniques) + 1) + codes
+            shape.append(len(uniques) + 1)
+        self.shape = tuple(shape)
+        self.n_cells = int(np.prod(shape)) if shape else 1
+        self.cell = cell
+        self.specs: dict[tuple, dict] = {}
+
+        for col in df.columns:
+            if df[col].nunique(dropna=True) <= CUBE_MAX_CATEGORIES:
+                self.ensure(("vc", col))
+        for prefix in prefixes or []:
+            self.ensure(("multi", prefix))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def supports(self, spec: tuple) -> bool:
+        return spec[0] in SINGLE_SELECT_TRANSFORMS or spec[0] in ("bin", "multi")
+
+    def ensure(self, spec: tuple) -> bool:
+        """Count ``spec`` over all cells if not done yet; False if it can't be cubed."""
+        if spec in self.specs:
+            return True
+        if not self.supports(spec):
+            return False
+        kind = spec[0]
+        if kind == "multi":
+            group = self._groups.get(spec[1])
+            if group is None:
+                cols = [c for c in self._df.columns if spec[1] in c]
+                group = MultiSelectGroup.from_frame(self._df, cols) if cols else None
+            entry = self._count_multi(group) if group is not None else None
+        elif spec[1] not in self._df.columns:
+            entry = None
+        else:
+            entry = self._count_single(self._transform(spec, self._df[spec[1]]), keep_zeros=kind == "bin")
+        if entry is None:
+            return False
+        with self._lock:
+            self.specs[spec] = entry
+        return True
+
+    @staticmethod
+    def _transform(spec: tuple, series: pd.Series) -> pd.Series:
+        """The answer series a single-select spec counts, aligned to ``series``' rows."""
+        if spec[0] == "bin":
+            _, _, edges, labels = spec
+            num = pd.to_numeric(series, errors="coerce")
+            return pd.cut(num, bins=list(edges), labels=list(labels), include_lowest=True, right=False)
+        # transforms may drop rows, so realign
+        return SINGLE_SELECT_TRANSFORMS[spec[0]](series).reindex(series.index)
+
+    @staticmethod
+    def _cell_counts(cells: np.ndarray, codes: np.ndarray, n_cells: int, n_cat: int) -> np.ndarray:
+        valid = codes >= 0
+        flat = cells[valid] * n_cat + codes[valid]
+        return np.bincount(flat, minlength=n_cells * n_cat).reshape(n_cells, n_cat)
+
+    @staticmethod
+    def _cell_sums(cells: np.ndarray, group: MultiSelectGroup, n_cells: int) -> tuple[np.ndarray, np.ndarray]:
+        sums = np.column_stack(
+            [np.bincount(cells, weights=group.matrix[:, j], minlength=n_cells) for j in range(len(group.cols))]
+        )
+        return sums, np.bincount(cells[group.answered], minlength=n_cells)
+
+    def _count_single(self, series: pd.Series, keep_zeros: bool = False) -> dict:
+        codes, uniques = pd.factorize(series)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            uniques = series.cat.categories
+            codes = series.cat.codes.to_numpy()
+        return {
+            "kind": "single",
+            "categories": np.asarray(uniques, dtype=object),
+            "counts": self._cell_counts(self.cell, codes, self.n_cells, len(uniques)),
+            # binned charts show empty bins (see binned_pct_custom); answer charts don't
+            "keep_zeros": keep_zeros,
+        }
+
+    def _count_multi(self, group: MultiSelectGroup) -> dict:
+        sums, answered = self._cell_sums(self.cell, group, self.n_cells)
+        return {"kind": "multi", "cols": group.cols, "labels": group.labels, "sums": sums, "answered": answered}
+
+    def _cells_for(self, frame: pd.DataFrame) -> np.ndarray:
+        """Cell code of each row of ``frame`` in this cube's layout."""
+        cell = np.zeros(len(frame), dtype=np.int64)
+        for dim, values in self.dim_values.items():
+            codes = pd.Categorical(frame[self.dim_cols[dim]], categories=values).codes.astype(np.int64)
+            cell = cell * (len(values) + 1) + np.where(codes < 0, len(values), codes)
+        return cell
+
+    def apply_delta(
+        self,
+        df: pd.DataFrame,
+        keep: np.ndarray | None,
+        added: pd.DataFrame,
+        groups: dict[str, MultiSelectGroup] | None = None,
+    ) -> "FilterCube":
+        """Cube for ``df``, which is this cube's rows at ``keep`` (None = all) followed by ``added``.
+
+        Existing dimension values and answer categories keep their slots and new ones are
+        appended, so every counted spec is updated by subtracting the dropped rows and adding
+        the new ones: the cost follows the size of the change, not of the dataset.
+        """
+        removed = np.setdiff1d(np.arange(len(self.cell)), keep) if keep is not None else np.empty(0, np.int64)
+        out = FilterCube.__new__(FilterCube)
+        out._df, out._groups, out._lock = df, dict(groups or {}), threading.Lock()
+        out.dim_cols = self.dim_cols
+        out.dim_values = {}
+        for dim, values in self.dim_values.items():
+            known = set(values)
+            out.dim_values[dim] = values + [v for v in pd.unique(added[self.dim_cols[dim]].dropna()) if v not in known]
+        out.shape = tuple(len(v) + 1 for v in out.dim_values.values())
+        out.n_cells = int(np.prod(out.shape)) if out.shape else 1
+
+        # new cell of every old cell: same value slots, the "missing" slot moves to the end
+        slot = np.zeros(self.n_cells, dtype=np.int64)
+        if self.shape:
+            idx = np.unravel_index(np.arange(self.n_cells), self.shape)
+            moved = [np.where(i == n - 1, m - 1, i) for i, n, m in zip(idx, self.shape, out.shape)]
+            slot = np.ravel_multi_index(moved, out.shape)
+        removed_cells = slot[self.cell[removed]]
+        added_cells = out._cells_for(added)
+        out.cell = np.concatenate([slot[self.cell if keep is None else self.cell[keep]], added_cells])
+
+        out.specs = {}
+        # sessions may still be adding specs through ensure() while the refresh thread runs this
+        with self._lock:
+            counted = list(self.specs.items())
+        for spec, entry in counted:
+            if entry["kind"] == "multi":
+                cols = entry["cols"]
+                sums = np.zeros((out.n_cells, len(cols)))
+                answered = np.zeros(out.n_cells, dtype=np.int64)
+                sums[slot], answered[slot] = entry["sums"], entry["answered"]
+                gone_sums, gone_answered = out._cell_sums(
+                    removed_cells, MultiSelectGroup.from_frame(self._df[cols].take(removed), cols), out.n_cells
+                )
+                new_sums, new_answered = out._cell_sums(
+                    added_cells, MultiSelectGroup.from_frame(added, cols), out.n_cells
+                )
+                out.specs[spec] = {
+                    **entry,
+                    "sums": sums - gone_sums + new_sums,
+                    "answered": answered - gone_answered + new_answered,
+                }
+                continue
+            gone = self._transform(spec, self._df[spec[1]].take(removed))
+            new = self._transform(spec, added[spec[1]])
+            cats = list(entry["categories"])
+            known = set(cats)
+            incoming = new.cat.categories if isinstance(new.dtype, pd.CategoricalDtype) else pd.unique(new.dropna())
+            cats += [c for c in incoming if c not in known]
+            counts = np.zeros((out.n_cells, len(cats)), dtype=np.int64)
+            counts[slot, : len(entry["categories"])] = entry["counts"]
+            for cells, series, sign in ((removed_cells, gone, -1), (added_cells, new, 1)):
+                codes = pd.Categorical(series, categories=cats).codes
+                counts += sign * out._cell_counts(cells, codes, out.n_cells, len(cats))
+            out.specs[spec] = {**entry, "categories": np.asarray(cats, dtype=object), "counts": counts}
+        return out
+
+    def cell_mask(self, selection: dict[str, list | None]) -> np.ndarray:
+        axes = []
+        for dim, values in self.dim_values.items():
+            n = len(values) + 1
+            picked = selection.get(dim)
+            if not picked:
+                axes.append(np.ones(n, dtype=bool))
+                continue
+            axis = np.zeros(n, dtype=bool)
+            for i, v in enumerate(values):
+                if v in picked:
+                    axis[i] = True
+            axes.append(axis)
+        if not axes:
+            return np.ones(1, dtype=bool)
+        mask = axes[0]
+        for axis in axes[1:]:
+            mask = np.logical_and.outer(mask, axis)
+        return mask.reshape(-1)
+
+    def pct(self, spec: tuple, selection: dict[str, list | None]) -> pd.DataFrame:
+        """Same frame the row-level helper would return for ``spec`` on the filtered rows."""
+        return self._pct_in_cells(spec, self.cell_mask(selection))
+
+    def pct_many(self, specs: list[tuple], selection: dict[str, list | None]) -> list[pd.DataFrame]:
+        """``pct`` for several specs, resolving the selection to cells once."""
+        cells = self.cell_mask(selection)
+        return [self._pct_in_cells(spec, cells) for spec in specs]
+
+    def _pct_in_cells(self, spec: tuple, cells: np.ndarray) -> pd.DataFrame:
+        entry = self.specs[spec]
+        if entry["kind"] == "multi":
+            return counts_to_multi_pct(
+                entry["labels"], entry["sums"][cells].sum(axis=0), int(entry["answered"][cells].sum())
+            )
+
+        cat_field = "bin" if spec[0] == "bin" else "category"
+        counts = entry["counts"][cells].sum(axis=0)
+        total = counts.sum()
+        if total == 0:
+            return pd.DataFrame(columns=[cat_field, "pct"])
+        keep = np.ones(len(counts), dtype=bool) if entry["keep_zeros"] else counts > 0
+        order = np.argsort(-counts[keep], kind="stable")
+        return pd.DataFrame(
+            {
+                cat_field: entry["categories"][keep][order],
+                "pct": counts[keep][order] / total * 100.0,
+            }
+        )
+
+    def split_pct(self, spec: tuple, selection: dict[str, list | None], dim: str) -> pd.DataFrame | None:
+        """``pct`` for every value of ``dim`` at once, as long (segment, category, pct, respondents) rows.
+
+        The selected cells are summed along the other dimensions in one reduction, so a
+        full breakdown costs about as much as a single chart. Rows missing ``dim`` are left
+        out; None if ``dim`` is not a dimension of this cube.
+        """
+        if dim not in self.dim_values:
+            return None
+        entry = self.specs[spec]
+        values = self.dim_values[dim]
+        axis = list(self.dim_values).index(dim)
+        other_axes = tuple(i for i in range(len(self.shape)) if i != axis)
+        cells = self.cell_mask(selection).reshape(self.shape)
+
+        def by_segment(per_cell: np.ndarray) -> np.ndarray:
+            grid = per_cell.reshape(self.shape + per_cell.shape[1:])
+            grid = np.where(cells.reshape(cells.shape + (1,) * (grid.ndim - cells.ndim)), grid, 0)
+            return grid.sum(axis=other_axes)[: len(values)]
+
+        cat_field = "bin" if spec[0] == "bin" else "category"
+        if entry["kind"] == "multi":
+            counts, respondents = by_segment(entry["sums"]), by_segment(entry["answered"])
+            categories = np.asarray(entry["labels"], dtype=object)
+            keep = np.ones(len(categories), dtype=bool)
+        else:
+            counts = by_segment(entry["counts"])
+            respondents = counts.sum(axis=1)
+            categories = entry["categories"]
+            keep = np.ones(len(categories), dtype=bool) if entry["keep_zeros"] else counts.sum(axis=0) > 0
+        order = np.flatnonzero(keep)[np.argsort(-counts.sum(axis=0)[keep], kind="stable")]
+        answered = np.flatnonzero(respondents > 0)
+        if not len(answered) or not len(order):
+            return pd.DataFrame(columns=["segment", cat_field, "pct", "respondents"])
+        pct = counts[np.ix_(answered, order)] / respondents[answered, None] * 100.0
+        return pd.DataFrame(
+            {
+                "segment": np.repeat(np.asarray(values, dtype=object)[answered], len(order)),
+                cat_field: np.tile(categories[order], len(answered)),
+                "pct": pct.reshape(-1),
+                "respondents": np.repeat(respondents[answered], len(order)).astype(np.int64),
+            }
+        )
+
+
+# ----- Dataset snapshots and incremental refresh -----
+RESPONSE_ID_COL = "ResponseId"
+REFRESH_INTERVAL_S = 5 * 60  # how often the sheet is checked for new responses (0 = never)
+REFRESH_RETRY_S = 30  # first retry after a failed fetch; doubles per failure
+REFRESH_BACKOFF_MAX_S = 30 * 60
+
+
+def response_fingerprints(raw: pd.DataFrame) -> pd.Series | None:
+    """Row hash of each parsed response, indexed by ResponseId (None if rows can't be keyed)."""
+    if RESPONSE_ID_COL not in raw.columns:
+        return None
+    ids = raw[RESPONSE_ID_COL]
+    if ids.isna().any() or ids.duplicated().any():
+        return None
+    return pd.Series(pd.util.hash_pandas_object(raw, index=False).to_numpy(), index=ids.to_numpy())
+
+
+def conform_dtypes(added: pd.DataFrame, base: pd.DataFrame) -> tuple[pd.DataFrame, dict] | None:
+    """Cast new rows to ``base``'s (compacted) dtypes.
+
+    Returns the cast rows and any ``base`` columns whose categories had to be widened
+    for them, or None when a value doesn't fit (e.g. text in a checkbox column).
+    """
+    cast, widened = {}, {}
+    for col in base.columns:
+        dtype, s = base[col].dtype, added[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            fresh = [v for v in pd.unique(s.dropna()) if v not in dtype.categories]
+            if fresh:
+                dtype = pd.CategoricalDtype(list(dtype.categories) + fresh, ordered=dtype.ordered)
+                widened[col] = base[col].cat.set_categories(dtype.categories)
+            cast[col] = s.astype(dtype)
+        elif dtype == "UInt8":
+            num = pd.to_numeric(s, errors="coerce")
+            if (num.notna() != s.notna()).any() or not num.dropna().isin([0, 1]).all():
+                return None
+            cast[col] = num.astype(dtype)
+        else:
+            try:
+                cast[col] = s.astype(dtype)
+            except (TypeError, ValueError):
+                return None
+    return pd.DataFrame(cast, index=added.index), widened
+
+
+def multi_select_groups(df: pd.DataFrame) -> dict[str, MultiSelectGroup]:
+    columns = tuple(df.columns)
+    catalog = build_column_catalog(schema_hash(columns), columns)
+    return {
+        prefix: MultiSelectGroup.from_frame(df, list(cols))
+        for prefix, cols in catalog.prefix_cols.items()
+        if cols
+    }
+
+
+class SurveySnapshot:
+    """One dataset version with its filter index, cube and response fingerprints.
+
+    Snapshots are never modified: a refresh builds a new one and the store swaps it in.
+    """
+
+    def __init__(self, df, findex, cube, groups, fingerprints, raw_columns, refresh: dict):
+        self.df = df
+        self.findex = findex
+        self.cube = cube
+        self.groups = groups
+        self.fingerprints = fingerprints
+        self.raw_columns = raw_columns
+        self.refresh = refresh
+
+    @property
+    def version(self) -> str:
+        return dataset_version(self.df)
+
+    def __setstate__(self, state):
+        # unpickled buffers are writable again; re-freeze and keep the cube on the same frame
+        self.__dict__.update(state)
+        self.df = freeze_frame(self.df)
+        self.cube._df = self.df
+
+
+def filter_dims(df: pd.DataFrame) -> dict[str, str | None]:
+    columns = tuple(df.columns)
+    catalog = build_column_catalog(schema_hash(columns), columns)
+    return {"region": "RegionStd", "revenue": catalog["COL_REVENUE"], "employees": catalog["COL_EMPLOYEES"]}
+
+
+@timed_stage("build snapshot")
+def build_snapshot(raw: pd.DataFrame) -> SurveySnapshot:
+    """Full build from a parsed sheet: compact, derive, freeze, index and cube."""
+    t0 = time.perf_counter()
+    df = freeze_frame(add_derived_columns(compact_dtypes(raw)))
+    dims = filter_dims(df)
+    groups = multi_select_groups(df)
+    return SurveySnapshot(
+        df,
+        FilterIndex(df, dims),
+        FilterCube(df, dims, MULTI_SELECT_PREFIXES, groups=groups),
+        groups,
+        response_fingerprints(raw),
+        list(raw.columns),
+        {"mode": "full", "rows": len(df), "ms": (time.perf_counter() - t0) * 1000.0, "at": time.time()},
+    )
+
+
+@timed_stage("apply response delta")
+def apply_response_delta(snapshot: SurveySnapshot, raw: pd.DataFrame) -> SurveySnapshot | None:
+    """New snapshot holding ``raw``'s responses, built from the ones that are new or changed.
+
+    Rows are matched on ResponseId and compared by row hash; changed and deleted rows
+    are dropped and new or changed rows appended, and the filter index, multi-select
+    groups and cube are updated from those rows only. Returns None when the sheet can't
+    be diffed (schema change, missing or duplicate ids, values that don't fit the
+    compacted dtypes) and a full rebuild is needed.
+    """
+    t0 = time.perf_counter()
+    fps = response_fingerprints(raw)
+    old = snapshot.fingerprints
+    if fps is None or old is None or list(raw.columns) != snapshot.raw_columns:
+        return None
+    common = old.index.intersection(fps.index)
+    changed = common[old[common].to_numpy() != fps[common].to_numpy()]
+    dropped = old.index.difference(fps.index).union(changed)
+    is_added = ~fps.index.isin(old.index) | fps.index.isin(changed)
+    keep = np.flatnonzero(~old.index.isin(dropped)) if len(dropped) else None
+
+    added_raw = add_derived_columns(raw.loc[is_added].reset_index(drop=True))
+    conformed = conform_dtypes(added_raw, snapshot.df)
+    if conformed is None:
+        return None
+    added, widened = conformed
+    base = snapshot.df.copy(deep=False)
+    for col, values in widened.items():
+        base[col] = values
+    kept = base if keep is None else base.take(keep)
+    df = freeze_frame(pd.concat([kept, added], ignore_index=True))
+    df.attrs = {
+        **snapshot.df.attrs,
+        "sopl_version": raw.attrs.get("sopl_version", ""),
+        "sopl_repairs": raw.attrs.get("sopl_repairs"),
+    }
+
+    groups = {
+        prefix: group.apply_delta(keep, MultiSelectGroup.from_frame(added, group.cols))
+        for prefix, group in snapshot.groups.items()
+    }
+    return SurveySnapshot(
+        df,
+        snapshot.findex.apply_delta(keep, added),
+        snapshot.cube.apply_delta(df, keep, added, groups),
+        groups,
+        pd.concat([old if keep is None else old.iloc[keep], fps[is_added]]),
+        snapshot.raw_columns,
+        {
+            "mode": "incremental",
+            "rows": len(df),
+            "added": int(is_added.sum()) - len(changed),
+            "changed": len(changed),
+            "removed": len(dropped) - len(changed),
+            "ms": (time.perf_counter() - t0) * 1000.0,
+            "at": time.time(),
+        },
+    )
+
+
+def refresh_snapshot(
+    snapshot: SurveySnapshot, raw_bytes: bytes, partition: str = "", source: str = ""
+) -> SurveySnapshot:
+    """Snapshot for freshly fetched sheet bytes: unchanged, incrementally updated, or rebuilt."""
+    if content_hash(raw_bytes) == snapshot.version:
+        return snapshot
+    raw = load_from_bytes(raw_bytes, partition, source)
+    return apply_response_delta(snapshot, raw) or build_snapshot(raw)
+
+
+SNAPSHOT_BUILD_FORMAT = 2  # bump whenever SurveySnapshot, FilterIndex or FilterCube change shape, or PARSE_FORMAT
+
+
+def _built_snapshot_path(key: str) -> Path:
+    return SNAPSHOT_DIR / f"sopl_{key}.built-v{SNAPSHOT_BUILD_FORMAT}.pkl"
+
+
+def write_built_snapshot(snapshot: SurveySnapshot) -> Path:
+    """Persist a fully built snapshot (frame, filter index, cube, groups) next to its parquet file.
+
+    Written at image build time by ``python -m sopl_dashboard precompute`` so a fresh
+    container skips the parse and build. These are pickles: only load files you built.
+    """
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = _built_snapshot_path(snapshot.version)
+
+    def write(tmp):
+        with open(tmp, "wb") as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    _write_atomic(path, write)
+    return path
+
+
+def read_built_snapshot(key: str) -> SurveySnapshot | None:
+    """The prebuilt snapshot for dataset version ``key``, or None if absent, stale or unreadable."""
+    path = _built_snapshot_path(key)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as fh:
+            snapshot = pickle.load(fh)
+    except Exception:
+        return None
+    return snapshot if isinstance(snapshot, SurveySnapshot) and snapshot.version == key else None
+
+
+class DatasetStore:
+    """Process-wide current snapshot, served stale-while-revalidate.
+
+    Sessions only read ``snapshot``. A daemon thread refetches the sheet every
+    ``refresh_interval`` seconds, backing off exponentially while fetches fail, and swaps
+    the refreshed snapshot in with a single assignment. On a cold start the last snapshot
+    on disk is served at once (prebuilt, when one was precomputed), however old, and
+    revalidated in the background; only without one does the first visitor wait for the sheet.
+    Snapshots written for a different ``url`` are never served.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        partition: str = "",
+        refresh_interval: float = REFRESH_INTERVAL_S,
+        fetch_timeout: float = FETCH_TIMEOUT_S,
+        retry_after: float = REFRESH_RETRY_S,
+        backoff_max: float = REFRESH_BACKOFF_MAX_S,
+        max_age: float = SNAPSHOT_MAX_AGE_S,
+    ):
+        self.url = url
+        self.partition = partition
+        self.refresh_interval = refresh_interval
+        self.fetch_timeout = fetch_timeout
+        self.retry_after = retry_after
+        self.backoff_max = backoff_max
+        self.max_age = max_age
+        self.snapshot: SurveySnapshot | None = None
+        self.as_of: float | None = None  # when the sheet last confirmed the served data
+        self.failures = 0
+        self.last_error: str | None = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def current(self) -> SurveySnapshot | None:
+        """The served snapshot; None while the first load keeps failing.
+
+        Only the first call loads; after a failed first load the background thread retries
+        on the usual backoff, so visitors never wait on a fetch that is known to fail.
+        """
+        if self.snapshot is None and self._thread is None:
+            with self._lock:
+                if self.snapshot is None and self._thread is None:
+                    self._load_initial()
+        return self.snapshot
+
+    def _load_initial(self) -> None:
+        meta = latest_snapshot_meta(self.partition, source_id(self.url))
+        snapshot = read_built_snapshot(meta["key"]) if meta else None
+        if snapshot is None and meta:
+            raw = read_snapshot(meta["key"])
+            snapshot = build_snapshot(raw) if raw is not None else None
+        if snapshot is not None:
+            self.snapshot, self.as_of = snapshot, meta.get("fetched_at", 0.0)
+            if time.time() - self.as_of >= self.max_age:
+                self._wake.set()
+        else:
+            try:
+                raw_bytes = fetch_sheet_bytes(self.url, self.fetch_timeout)
+                raw = load_from_bytes(raw_bytes, self.partition, source_id(self.url))
+            except Exception as exc:
+                self._failed(exc)
+            else:
+                self.snapshot, self.as_of = build_snapshot(raw), time.time()
+                self.failures, self.last_error = 0, None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sopl-refresh", daemon=True)
+            self._thread.start()
+
+    def next_delay(self) -> float | None:
+        """Seconds until the next fetch (None: only when woken, periodic refresh is off)."""
+        if self.failures:
+            return min(self.retry_after * 2 ** (self.failures - 1), self.backoff_max)
+        if self.refresh_interval <= 0:
+            return None
+        return max(0.0, (self.as_of or 0.0) + self.refresh_interval - time.time())
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.refresh()
+
+    def stop(self) -> None:
+        """End background refreshing; the current snapshot stays available."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def refresh(self) -> None:
+        """Fetch the sheet once and swap in the refreshed snapshot; a failure keeps the current one."""
+        with self._lock:
+            try:
+                raw_bytes = fetch_sheet_bytes(self.url, self.fetch_timeout)
+                if self.snapshot is None:  # the first load failed
+                    snapshot = build_snapshot(load_from_bytes(raw_bytes, self.partition, source_id(self.url)))
+                else:
+                    snapshot = refresh_snapshot(self.snapshot, raw_bytes, self.partition, source_id(self.url))
+            except Exception as exc:
+                self._failed(exc)
+                return
+            record_fetch(snapshot.version, self.partition, source_id(self.url))
+            self.snapshot, self.as_of = snapshot, time.time()
+            self.failures, self.last_error = 0, None
+
+    def _failed(self, exc: Exception) -> None:
+        self.failures += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"
+        refresh_logger.warning("sheet fetch failed (%d in a row): %s", self.failures, self.last_error)
+
+    def status(self) -> dict:
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version if snapshot is not None else None,
+            "rows": len(snapshot.df) if snapshot is not None else 0,
+            "as_of": self.as_of,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "next_check_s": self.next_delay(),
+            "last_refresh": snapshot.refresh if snapshot is not None else None,
+        }
+
+
+# Additional Insights: metadata/free-text columns and vendor-specific questions are left out
+EXTRA_SKIP_SUBSTRINGS = [
+    "StartDate",
+    "EndDate",
+    "Status",
+    "IPAddress",
+    "Progress",
+    "Duration",
+    "Finished",
+    "RecordedDate",
+    "ResponseId",
+    "Recipient",
+    "LocationLatitude",
+    "LocationLongitude",
+    "UserLanguage",
+    "Other – please specify",
+    "Other - please specify",
+    "additional feedback or comments you'd like to share",
+]
+VENDOR_KEYWORDS = [
+    "google",
+    "salesforce",
+    "crossbeam",
+    "hubspot",
+    "microsoft",
+    "aws",
+    "azure",
+    "gcp",
+    "partnerstack",
+    "zendesk",
+    "slack",
+    "oracle",
+    "sap",
+    "workday",
+]
+VENDOR_PATTERN = re.compile("|".join(VENDOR_KEYWORDS), re.IGNORECASE)
+
+
+def profile_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per column with the Additional Insights eligibility checks.
+
+    A column is eligible when it is not on the skip list, is mostly non-numeric,
+    has 2-12 distinct answers and none of them name a vendor.
+    """
+    records = []
+    for col in df.columns:
+        rec = {"column": col, "skipped": any(sub in col for sub in EXTRA_SKIP_SUBSTRINGS)}
+        s_nonnull = df[col].dropna()
+        rec["non_null"] = len(s_nonnull)
+        if rec["skipped"] or s_nonnull.empty:
+            rec.update(numeric_ratio=np.nan, n_unique=0, vendor=False, eligible=False)
+            records.append(rec)
+            continue
+        rec["numeric_ratio"] = pd.to_numeric(s_nonnull, errors="coerce").notna().mean()
+        uniques = pd.Series(s_nonnull.astype(str).unique())
+        rec["n_unique"] = len(uniques)
+        # vendor names are matched on distinct answers only
+        rec["vendor"] = bool(uniques.str.contains(VENDOR_PATTERN, na=False).any())
+        rec["eligible"] = (
+            rec["numeric_ratio"] <= 0.9 and 1 < rec["n_unique"] <= 12 and not rec["vendor"]
+        )
+        records.append(rec)
+    return pd.DataFrame.from_records(
+        records, columns=["column", "skipped", "non_null", "numeric_ratio", "n_unique", "vendor", "eligible"]
+    )
+
+
+# ==================== CHART REGISTRY ====================
+def chart(title: str, column: str, kind: str = "vc", view: str = "bar", **options) -> dict:
+    """One dashboard chart: its question, how answers are aggregated and how they are drawn.
+
+    ``column`` is a ``COLUMN_SPECS`` key, a derived column (``NORMALIZATION_RULES``) or, for
+    ``kind="multi"``, a multi-select prefix. ``kind`` is an aggregate spec kind ("vc", "vc_str",
+    "bin", "bin_or_vc", "multi"); binned kinds take ``bins=(edges, labels)``. ``view`` is "donut"
+    or "bar"; bars take ``horizontal`` and ``max_categories`` (for "bin_or_vc", only when the answers
+    could be binned), and ``order`` fixes category order.
+    The ``id`` (the slugified title) is how the aggregates API refers to the chart.
+    """
+    chart_id = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return {"id": chart_id, "title": title, "column": column, "kind": kind, "view": view, **options}
+
+
+WIN_RATE_BINS = ([0, 25, 50, 75, 101], ["0–25%", "26–50%", "51–75%", "76–100%"])
+RETENTION_BINS = ([0, 50, 75, 95, 100, 201], ["0–50%", "51–75%", "76–95%", "96–100%", "More than 100%"])
+EXPECTED_REV_BINS = ([0, 50, 75, 100, 201], ["Less than 50%", "50–75%", "75–100%", "More than 100%"])
+MARKETPLACE_REV_BINS = ([0, 5, 15, 30, 50, 101], ["Less than 5%", "5–15%", "15–30%", "30–50%", "More than 50%"])
+
+# Tab label -> layout. A string is a section header, a tuple is a row of up to two chart
+# cards, and a bare chart is one full-width card. "Additional Insights" is built from the
+# dataset's remaining questions instead (see tab_extra in render_dashboard).
+DASHBOARD_TABS = {
+    "Firmographics": [
+        "Company profile",
+        (
+            chart("HQ region", "RegionStd", view="donut"),
+            chart("Company annual revenue", "COL_REVENUE", view="donut", order=REVENUE_ORDER),
+        ),
+        (
+            chart("Total employee count", "COL_EMPLOYEES", view="donut", order=EMPLOYEE_ORDER),
+            chart("Industry sector", "COL_INDUSTRY", view="donut"),
+        ),
+    ],
+    "Performance": [
+        "Partner impact & performance",
+        (
+            chart("Deal size vs direct", "COL_DEAL_SIZE", view="donut"),
+            chart("CAC vs direct", "COL_CAC", view="donut"),
+        ),
+        (
+            chart("Win rate with partners", "COL_WIN_RATE", "bin", bins=WIN_RATE_BINS, horizontal=False),
+            chart(
+                "Partner-referred customer retention",
+                "COL_RETENTION",
+                "bin",
+                bins=RETENTION_BINS,
+                horizontal=False,
+                max_categories=5,
+            ),
+        ),
+        "Measuring partner influence beyond sourced revenue",
+        chart("Partner influence impact measures", INFLUENCE_PREFIX, "multi", max_categories=None),
+    ],
+    "Strategic Direction": [
+        "Strategic direction",
+        (
+            chart("Primary goal for partnerships", "COL_PRIMARY_GOAL"),
+            chart("Executive expectations", "ExecExpectShort"),
+        ),
+        (
+            chart(
+                "Expected share of revenue from partnerships",
+                "COL_EXPECTED_REV",
+                "bin",
+                bins=EXPECTED_REV_BINS,
+                horizontal=False,
+            ),
+            chart("Partnership focus in the next 12 months", "COL_PARTNER_FOCUS"),
+        ),
+        (
+            chart("Strategic bet for the next 12 months", "COL_STRATEGIC_BET"),
+            chart("Forecasted performance vs goals", "COL_FORECAST_PERF"),
+        ),
+    ],
+    "Partnership Portfolio": [
+        "Partnership portfolio",
+        (
+            chart("Most impactful partnership type", "COL_MOST_IMPACTFUL_TYPE", view="donut"),
+            chart("Current partnership types", PARTNERSHIP_HAVE_PREFIX, "multi", max_categories=None),
+        ),
+        (
+            chart("Partnership types planned for expansion", PARTNERSHIP_EXPAND_PREFIX, "multi", max_categories=None),
+            chart("Number of total partners", "COL_TOTAL_PARTNERS", horizontal=False),
+        ),
+        (chart("Active partners generating revenue (last 12 months)", "COL_ACTIVE_PARTNERS", horizontal=False),),
+    ],
+    "Challenges & Risks": [
+        "Challenges & risks",
+        (
+            chart("Biggest challenge in scaling the program", "COL_BIGGEST_CHALLENGE"),
+            chart("Most likely reason goals may be missed", "COL_MISS_GOALS_REASON"),
+        ),
+        chart("How partner satisfaction is measured", SAT_PREFIX, "multi", max_categories=None),
+    ],
+    "Team & Investment": [
+        "Team & investment",
+        (
+            chart("Partnerships team size", "COL_TEAM_SIZE", view="donut"),
+            chart("Annual partnerships budget", "BudgetKnown"),
+        ),
+        (
+            chart("Where the Partnerships team reports", "COL_REPORTING", "vc_str", max_categories=8),
+            chart(
+                "Top 3 budget line items (excluding headcount)", COL_TOP3_BUDGET_PREFIX, "multi", max_categories=None
+            ),
+        ),
+        (
+            chart("Partner training & enablement level", "COL_TRAINING", "vc_str", max_categories=8),
+            chart("Roles that exist on the Partner Team", ROLES_PREFIX, "multi", max_categories=None),
+        ),
+    ],
+    "Technology & AI": [
+        "Technology & AI",
+        (
+            chart("Currently using partner tech/automation", "COL_USE_TECH", view="donut"),
+            chart("Currently using AI in the partner organization", "COL_USE_AI", view="donut"),
+        ),
+    ],
+    "Marketplaces": [
+        "Marketplaces",
+        (
+            chart("Company listed in marketplaces", "MarketplaceListedStd", view="donut"),
+            chart(
+                "Share of revenue from marketplaces",
+                "COL_MARKETPLACE_REV",
+                "bin_or_vc",
+                bins=MARKETPLACE_REV_BINS,
+                horizontal=False,
+                max_categories=5,
+            ),
+        ),
+    ],
+}
+
+
+def layout_charts(layout: list) -> list[dict]:
+    """Every chart of a tab layout, in render order."""
+    rows = [entry if isinstance(entry, tuple) else (entry,) for entry in layout if not isinstance(entry, str)]
+    return [c for row in rows for c in row]
+
+
+def resolve_chart_spec(chart_def: dict, catalog: ColumnCatalog) -> tuple | None:
+    """The aggregate spec a chart needs on this schema, or None if its question isn't in the data."""
+    kind, column = chart_def["kind"], chart_def["column"]
+    if kind == "multi":
+        return ("multi", column) if catalog.prefix_cols.get(column) else None
+    col = catalog.cols.get(column, column)
+    if col is None or col not in catalog.columns:
+        return None
+    if "bins" in chart_def:
+        edges, labels = chart_def["bins"]
+        return (kind, col, tuple(edges), tuple(labels))
+    return (kind, col)
+
+
+def ordered_pct(chart_def: dict, pct: pd.DataFrame) -> pd.DataFrame:
+    """``pct`` in the chart's fixed category order, if it declares one."""
+    if "order" not in chart_def:
+        return pct
+    cat_field = "bin" if "bin" in pct.columns else "category"
+    pct = pct.assign(**{cat_field: pd.Categorical(pct[cat_field], categories=chart_def["order"], ordered=True)})
+    return pct.sort_values(cat_field)
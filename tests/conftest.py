@@ -0,0 +1,9 @@
+import pytest
+
+from tests.synthetic import make_synthetic_sopl
+
+
+@pytest.fixture
+def synthetic_sopl():
+    """``make_synthetic_sopl(n_rows, seed=0)``: a frame with the dashboard's real column names."""
+    return make_synthetic_sopl
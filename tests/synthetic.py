@@ -0,0 +1,54 @@
+"""Synthetic SOPL-shaped survey frames shared by the tests and the pipeline benchmark."""
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard import core
+
+COL_REGION = "Please select the region where your company is headquartered."
+COL_INDUSTRY = "What industry sector does your company operate in?"
+COL_REVENUE = "What is your company’s estimated annual revenue?"
+COL_EMPLOYEES = "What is your company’s total number of employees?"
+COL_DEAL_SIZE = "How does your average deal size involving partners compare to direct or non-partner deals?"
+COL_WIN_RATE = "What’s your win rate for deals where partners are involved?"
+COL_RETENTION = "What is the retention rate for partner-referred customers?"
+COL_PRIMARY_GOAL = "What is your main goal for partnerships in the next 12 months?"
+COL_EXEC_EXPECT = "How would you describe your executive team’s expectations of partnerships?"
+
+MULTI_SELECT_OPTIONS = {
+    core.INFLUENCE_PREFIX + " partner impact?": ["Influenced pipeline", "Co-sell", "Retention", "Expansion"],
+    core.PARTNERSHIP_HAVE_PREFIX: ["Resellers", "Technology", "Systems integrators", "Referral", "Agencies"],
+    core.PARTNERSHIP_EXPAND_PREFIX + "?": ["Resellers", "Technology", "Systems integrators", "Marketplaces"],
+    core.ROLES_PREFIX: ["Partner manager", "PartnerOps", "Partner marketing", "Channel sales"],
+    core.COL_TOP3_BUDGET_PREFIX: ["Events", "Tools", "MDF", "Incentives"],
+    core.SAT_PREFIX: ["NPS", "Surveys", "QBRs"],
+}
+
+
+def make_synthetic_sopl(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """A frame with the dashboard's real column names and plausible answer mixes."""
+    rng = np.random.default_rng(seed)
+
+    def pick(options, p=None):
+        return rng.choice(np.array(options, dtype=object), n_rows, p=p)
+
+    data = {
+        "ResponseId": [f"R_{i:08d}" for i in range(n_rows)],
+        COL_REGION: pick(
+            ["North America (US, Canada)", "Europe", "EMEA - Middle East & Africa", "APAC", "Latin America", None],
+            p=[0.45, 0.2, 0.08, 0.12, 0.1, 0.05],
+        ),
+        COL_INDUSTRY: pick(["SaaS", "Fintech", "Healthcare", "Cybersecurity", "Other"]),
+        COL_REVENUE: pick(core.REVENUE_ORDER + [None]),
+        COL_EMPLOYEES: pick(core.EMPLOYEE_ORDER + [None]),
+        COL_DEAL_SIZE: pick(["Larger", "About the same", "Smaller", None]),
+        COL_WIN_RATE: np.where(rng.random(n_rows) < 0.1, np.nan, rng.integers(0, 101, n_rows)),
+        COL_RETENTION: np.where(rng.random(n_rows) < 0.2, np.nan, rng.integers(0, 200, n_rows)),
+        COL_PRIMARY_GOAL: pick(["Grow sourced revenue", "Improve retention", "Enter new markets", None]),
+        COL_EXEC_EXPECT: pick(["High - growth engine", "Moderate - supporting motion", "Low - experimental"]),
+    }
+    for prefix, options in MULTI_SELECT_OPTIONS.items():
+        answered = rng.random(n_rows) < 0.8
+        for option in options:
+            ticked = answered & (rng.random(n_rows) < 0.4)
+            data[f"{prefix} {option}"] = np.where(ticked, 1.0, np.nan)
+    return pd.DataFrame(data)
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from sopl_dashboard.core import AggregateCache, selection_key
+
+
+def test_selection_key_is_order_insensitive():
+    a = selection_key({"region": ["Europe", "North America"], "revenue": None})
+    b = selection_key({"revenue": None, "region": ["North America", "Europe"]})
+    assert a == b
+    assert selection_key({"region": []}) == selection_key({"region": None})
+
+
+def test_hits_misses_and_isolation():
+    cache = AggregateCache(maxsize=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"category": ["A"], "pct": [100.0]})
+
+    first = cache.get_or_compute(("k",), compute)
+    first.loc[0, "pct"] = 0.0  # caller mutation must not leak into the cache
+    second = cache.get_or_compute(("k",), compute)
+    assert len(calls) == 1
+    assert second.loc[0, "pct"] == 100.0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = AggregateCache(maxsize=2)
+    for k in ("a", "b"):
+        cache.get_or_compute(k, pd.DataFrame)
+    cache.get_or_compute("a", pd.DataFrame)  # refresh "a"
+    cache.get_or_compute("c", pd.DataFrame)  # evicts "b"
+    cache.get_or_compute("a", pd.DataFrame)
+    assert cache.stats()["hits"] == 2
+    cache.get_or_compute("b", pd.DataFrame)
+    assert cache.stats()["misses"] == 4
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,84 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sopl_dashboard import core
+from sopl_dashboard.__main__ import main
+from sopl_dashboard.api import AggregateService, DatasetUnavailable, make_server, registered_questions
+from tests.synthetic import COL_PRIMARY_GOAL
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    sheet = tmp_path / "sopl.csv"
+    sheet.write_bytes(synthetic_sopl(400, seed=3).to_csv(index=False).encode("utf-8"))
+    svc = AggregateService(core.DatasetStore(sheet.as_uri(), refresh_interval=0))
+    yield svc
+    svc.store.stop()
+
+
+def _get(server, path):
+    host, port = server.server_address[:2]
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}{path}") as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def test_question_ids_are_unique():
+    charts = [c for layout in core.DASHBOARD_TABS.values() for c in core.layout_charts(layout)]
+    assert len(registered_questions()) == len(charts)
+
+
+def test_aggregate_matches_dashboard_helpers(service):
+    body = service.aggregate("primary-goal-for-partnerships", {"region": ["Europe"]})
+    df = service.store.current().df
+    expected = core.value_counts_pct(df.loc[df["RegionStd"] == "Europe", COL_PRIMARY_GOAL])
+    assert [r["category"] for r in body["results"]] == expected["category"].tolist()
+    assert [r["pct"] for r in body["results"]] == pytest.approx(expected["pct"].tolist())
+    assert body["selection"] == {"region": ["Europe"], "revenue": None, "employees": None}
+
+    again = service.aggregate("primary-goal-for-partnerships", {"region": ["Europe"]})
+    assert again == body and service.cache.hits == 1
+
+
+def test_http_endpoints(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, body = _get(server, "/aggregate?question=hq-region&split=revenue")
+        assert status == 200
+        assert {"segment", "category", "pct", "respondents"} <= set(body["results"][0])
+        status, body = _get(server, "/questions")
+        assert status == 200 and any(q["id"] == "hq-region" for q in body["questions"])
+        assert _get(server, "/aggregate?question=nope")[0] == 404
+        assert _get(server, "/aggregate?question=hq-region&split=industry")[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unavailable_dataset_is_reported(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    missing = (tmp_path / "missing.csv").as_uri()
+    service = AggregateService(core.DatasetStore(missing, refresh_interval=0))
+    with pytest.raises(DatasetUnavailable, match="missing.csv"):
+        service.aggregate("hq-region")
+
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, body = _get(server, "/aggregate?question=hq-region")
+        assert status == 503 and body["error"].startswith("dataset unavailable")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["aggregate", "hq-region", "--url", missing])
+    assert exit_info.value.code.startswith("dataset unavailable")
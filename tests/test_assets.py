@@ -0,0 +1,23 @@
+import base64
+import os
+
+import app
+from app import img_to_base64
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert img_to_base64(str(tmp_path / "nope.png")) is None
+
+
+def test_encoded_once_and_refreshed_on_change(tmp_path):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"first")
+    app._encode_file_base64.cache_clear()
+    assert img_to_base64(str(logo)) == base64.b64encode(b"first").decode()
+    img_to_base64(str(logo))
+    assert app._encode_file_base64.cache_info().hits == 1
+
+    logo.write_bytes(b"second")
+    st = logo.stat()
+    os.utime(logo, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert img_to_base64(str(logo)) == base64.b64encode(b"second").decode()
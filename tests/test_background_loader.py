@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from sopl_dashboard import core
+from sopl_dashboard.core import DatasetStore
+
+
+@pytest.fixture
+def stores():
+    made = []
+
+    def make(*args, **kwargs):
+        made.append(DatasetStore(*args, **kwargs))
+        return made[-1]
+
+    yield make
+    for store in made:
+        store.stop()
+
+
+@pytest.fixture
+def sheet(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path / "snapshots")
+    path = tmp_path / "sheet.csv"
+
+    def write(n_rows):
+        path.write_bytes(synthetic_sopl(n_rows).to_csv(index=False).encode("utf-8"))
+
+    write(40)
+    return path, write
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_cold_start_fetches_then_refreshes_in_background(sheet, stores):
+    path, write = sheet
+    store = stores(path.as_uri(), refresh_interval=0.05)
+    first = store.current()
+    assert len(first.df) == 40 and store.as_of is not None
+    write(45)
+    assert wait_for(lambda: len(store.snapshot.df) == 45)
+    assert store.snapshot.refresh["mode"] == "incremental"
+    # the snapshot a session already holds is never modified
+    assert len(first.df) == 40
+
+
+def test_failures_keep_snapshot_and_back_off(sheet, stores):
+    path, _ = sheet
+    store = stores(path.as_uri(), refresh_interval=0, retry_after=10, backoff_max=25)
+    snapshot = store.current()
+    assert store.next_delay() is None
+    store.url = path.with_name("missing.csv").as_uri()
+    delays = []
+    for _ in range(3):
+        store.refresh()
+        delays.append(store.next_delay())
+    assert store.snapshot is snapshot
+    assert store.failures == 3 and "missing.csv" in store.last_error
+    assert delays == [10, 20, 25]
+    store.url = path.as_uri()
+    store.refresh()
+    assert store.failures == 0 and store.last_error is None
+
+
+def test_stale_disk_snapshot_served_without_waiting(sheet, stores):
+    path, _ = sheet
+    stores(path.as_uri(), refresh_interval=0).current()
+    meta = core.latest_snapshot_meta()
+    meta["fetched_at"] -= 3600
+    (core.SNAPSHOT_DIR / "latest.json").write_text(core.json.dumps(meta))
+
+    path.unlink()  # the sheet is unreachable from now on
+    store = stores(path.as_uri(), refresh_interval=0, max_age=60)
+    snapshot = store.current()
+    assert len(snapshot.df) == 40
+    assert store.as_of == meta["fetched_at"]
+    # revalidation was kicked off in the background and failed without touching the data
+    assert wait_for(lambda: store.failures == 1)
+    assert store.snapshot is snapshot
+
+
+def test_snapshot_of_another_sheet_is_not_served(sheet, stores):
+    path, _ = sheet
+    stores(path.as_uri(), refresh_interval=0).current()
+    store = stores(path.with_name("other.csv").as_uri(), refresh_interval=0)
+    assert store.current() is None
+    assert store.failures == 1 and "other.csv" in store.last_error
+
+
+def test_failed_cold_load_is_retried_in_background_only(sheet, stores, monkeypatch):
+    path, _ = sheet
+    fetches = []
+    fetch = core.fetch_sheet_bytes
+
+    def counting_fetch(url, timeout):
+        fetches.append(url)
+        return fetch(url, timeout)
+
+    monkeypatch.setattr(core, "fetch_sheet_bytes", counting_fetch)
+    store = stores(path.with_name("late.csv").as_uri(), refresh_interval=0, retry_after=0.2)
+    assert store.current() is None and store.next_delay() == 0.2
+    # inside the backoff window: no fetch on the visitor's rerun
+    assert store.current() is None and len(fetches) == 1
+
+    path.rename(path.with_name("late.csv"))
+    assert wait_for(lambda: store.snapshot is not None)
+    assert len(store.current().df) == 40 and store.failures == 0
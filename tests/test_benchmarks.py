@@ -0,0 +1,17 @@
+from benchmarks.bench_pipeline import bench_size
+from sopl_dashboard import core
+from tests.synthetic import COL_REVENUE
+
+
+def test_synthetic_frame_uses_dashboard_columns(synthetic_sopl):
+    df = synthetic_sopl(50)
+    assert len(df) == 50
+    assert core.find_col(df, substrings=["company’s estimated annual revenue"]) == COL_REVENUE
+    for prefix in core.MULTI_SELECT_PREFIXES:
+        assert any(prefix in c for c in df.columns)
+
+
+def test_bench_size_reports_every_stage():
+    results = bench_size(200, repeat=1)
+    assert {r["stage"] for r in results} >= {"parse.read_csv", "filter.index_rows", "chart.bar_spec"}
+    assert all(r["rows"] == 200 and r["seconds_min"] >= 0 for r in results)
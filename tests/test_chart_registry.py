@@ -0,0 +1,66 @@
+import pandas as pd
+
+from sopl_dashboard import core
+from sopl_dashboard.core import (
+    DASHBOARD_TABS,
+    SINGLE_SELECT_TRANSFORMS,
+    ColumnCatalog,
+    WIN_RATE_BINS,
+    add_derived_columns,
+    aggregate_rows,
+    build_snapshot,
+    chart,
+    layout_charts,
+    resolve_chart_spec,
+)
+from tests.synthetic import COL_PRIMARY_GOAL, COL_WIN_RATE
+
+
+def test_registry_is_well_formed():
+    kinds = set(SINGLE_SELECT_TRANSFORMS) | {"bin", "bin_or_vc", "multi"}
+    for label, layout in DASHBOARD_TABS.items():
+        charts = layout_charts(layout)
+        assert charts, label
+        titles = [c["title"] for c in charts]
+        assert len(titles) == len(set(titles)), label
+        for c in charts:
+            assert c["kind"] in kinds and c["view"] in ("donut", "bar")
+            assert ("bins" in c) == c["kind"].startswith("bin")
+        assert all(len(entry) <= 2 for entry in layout if isinstance(entry, tuple))
+
+
+def test_specs_resolve_against_the_schema(synthetic_sopl):
+    df = add_derived_columns(synthetic_sopl(50))
+    catalog = ColumnCatalog(df.columns)
+    assert resolve_chart_spec(chart("Goal", "COL_PRIMARY_GOAL"), catalog) == ("vc", COL_PRIMARY_GOAL)
+    assert resolve_chart_spec(chart("Expect", "ExecExpectShort"), catalog) == ("vc", "ExecExpectShort")
+    win = resolve_chart_spec(chart("Win", "COL_WIN_RATE", "bin", bins=WIN_RATE_BINS), catalog)
+    assert win == ("bin", COL_WIN_RATE, tuple(WIN_RATE_BINS[0]), tuple(WIN_RATE_BINS[1]))
+    assert resolve_chart_spec(chart("Roles", core.ROLES_PREFIX, "multi"), catalog) == ("multi", core.ROLES_PREFIX)
+    assert resolve_chart_spec(chart("CAC", "COL_CAC"), catalog) is None
+    assert resolve_chart_spec(chart("Nope", "Not a question", "multi"), catalog) is None
+
+
+def test_row_level_aggregates_match_the_cube(synthetic_sopl):
+    snapshot = build_snapshot(synthetic_sopl(400))
+    df, cube = snapshot.df, snapshot.cube
+    catalog = ColumnCatalog(df.columns)
+    selection = {"region": ["Europe", "North America"], "revenue": None, "employees": None}
+    rows = df[df["RegionStd"].isin(selection["region"]).to_numpy()]
+    specs = [
+        resolve_chart_spec(c, catalog)
+        for layout in DASHBOARD_TABS.values()
+        for c in layout_charts(layout)
+        if c["kind"] != "bin_or_vc"
+    ]
+    specs = [spec for spec in specs if spec is not None]
+    assert len(specs) > 10
+    assert all(cube.ensure(spec) for spec in specs)
+    for spec, from_cube in zip(specs, cube.pct_many(specs, selection)):
+        from_rows = aggregate_rows(spec, rows, catalog.prefix_cols)
+        pd.testing.assert_frame_equal(
+            from_cube.reset_index(drop=True).astype({"pct": float}),
+            from_rows.reset_index(drop=True).astype({from_rows.columns[0]: object, "pct": float}),
+            check_dtype=False,
+            check_categorical=False,
+        )
@@ -0,0 +1,70 @@
+import json
+
+import pandas as pd
+
+import app
+from sopl_dashboard import charts
+from sopl_dashboard.charts import chart_rows, bar_chart_spec, donut_chart_spec
+from sopl_dashboard.core import AggregateCache
+
+
+def test_chart_rows_keep_display_order():
+    df = pd.DataFrame({"category": ["b", "a"], "pct": [60, 40.0]})
+    assert chart_rows(df, "category", "pct") == (("b", 60.0), ("a", 40.0))
+
+
+def test_specs_are_vega_lite_json_with_inline_data():
+    rows = (("Europe", 60.0), ("North America", 40.0))
+    for spec_json in (donut_chart_spec(rows, "category", "HQ"), bar_chart_spec(rows, "bin", "Win", False)):
+        spec = json.loads(spec_json)
+        assert spec["$schema"].startswith("https://vega.github.io/schema/vega-lite/")
+        (values,) = spec["datasets"].values()
+        assert len(values) == 2
+
+
+def test_identical_charts_skip_altair(monkeypatch):
+    cache = AggregateCache(maxsize=8)
+    monkeypatch.setattr(app, "get_chart_spec_cache", lambda: cache)
+    builds = []
+    rows = (("Yes", 100.0),)
+
+    def build():
+        builds.append(1)
+        return donut_chart_spec(rows, "category", "AI")
+
+    first = app.cached_chart_spec(("donut", "AI", rows, "category"), build)
+    second = app.cached_chart_spec(("donut", "AI", rows, "category"), build)
+    assert first == second
+    assert len(builds) == 1
+
+
+def test_split_charts_follow_segment_order_and_chart_categories(monkeypatch):
+    monkeypatch.setattr(app, "get_chart_spec_cache", lambda: AggregateCache(maxsize=8))
+    pct = pd.DataFrame({"category": ["Yes", "No", "Maybe"], "pct": [50.0, 30.0, 20.0]})
+    split = pd.DataFrame(
+        {
+            "segment": ["L", "L", "L", "S", "S", "S"],
+            "category": ["Yes", "No", "Maybe"] * 2,
+            "pct": [60.0, 30.0, 10.0, 40.0, 30.0, 30.0],
+        }
+    )
+    tagged = charts.with_split(pct, split, "Size", order=["S", "M", "L"])
+    assert tagged.attrs["split"]["segments"] == ("S", "L")
+
+    captured = []
+    token = app._REPORT_COLLECTOR.set(captured)
+    try:
+        app.bar_chart_from_pct(tagged, "category", "pct", "Answer", max_categories=2)
+    finally:
+        app._REPORT_COLLECTOR.reset(token)
+    spec = json.loads(captured[0][1])
+    (values,) = spec["datasets"].values()
+    assert [(v["category"], v["Size"]) for v in values] == [("Yes", "S"), ("Yes", "L"), ("No", "S"), ("No", "L")]
+    assert spec["layer"][0]["encoding"]["yOffset"]["field"] == "Size"
+
+
+def test_many_segments_are_faceted():
+    rows = tuple((cat, seg, 10.0) for cat in "ab" for seg in "pqrstu")
+    spec = json.loads(charts.grouped_bar_chart_spec(rows, "category", "Band", "Answer", tuple("pqrstu"), facet=True))
+    assert spec["facet"]["field"] == "Band"
+    assert "yOffset" not in json.dumps(spec)
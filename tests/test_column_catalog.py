@@ -0,0 +1,50 @@
+from sopl_dashboard.core import ColumnCatalog, fold_column_name, schema_hash
+
+COLUMNS = [
+    "ResponseId",
+    "What is your company’s estimated annual revenue?",
+    "What's your win rate for deals where partners are involved?",
+    "How would you describe your executive team’s  expectations of partnerships?",
+    "Which of the following Partnership types does your company have? Resellers",
+    "Which of the following Partnership types does your company have? Technology",
+    "What roles exist on your Partner Team? PartnerOps",
+    "Revenue band – 2024",
+]
+
+
+def test_fold_column_name():
+    assert fold_column_name("company’s  revenue – “band”") == "company's revenue - \"band\""
+
+
+def test_curly_and_straight_variants_resolve_to_the_same_column():
+    catalog = ColumnCatalog(COLUMNS)
+    assert catalog["COL_REVENUE"] == COLUMNS[1]
+    # spec lists the curly apostrophe, header has a straight one
+    assert catalog["COL_WIN_RATE"] == COLUMNS[2]
+    # whitespace runs are folded too
+    assert catalog["COL_EXEC_EXPECT"] == COLUMNS[3]
+    assert catalog["COL_DEAL_SIZE"] is None
+
+
+def test_prefix_groups_keep_frame_order():
+    catalog = ColumnCatalog(COLUMNS)
+    have = "Which of the following Partnership types does your company have?"
+    assert catalog.prefix_cols[have] == (COLUMNS[4], COLUMNS[5])
+    assert catalog.prefix_cols["What roles exist on your Partner Team?"] == (COLUMNS[6],)
+
+
+def test_find_matches_dash_variants_and_is_immutable():
+    catalog = ColumnCatalog(COLUMNS)
+    assert catalog.find(substrings=["Revenue band - 2024"]) == COLUMNS[7]
+    assert catalog.find(substrings=["band"]) == COLUMNS[7]
+    try:
+        catalog.cols["COL_REVENUE"] = "x"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("catalog mapping should be read-only")
+
+
+def test_schema_hash_changes_with_columns():
+    assert schema_hash(COLUMNS) == schema_hash(list(COLUMNS))
+    assert schema_hash(COLUMNS) != schema_hash(COLUMNS[:-1])
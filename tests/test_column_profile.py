@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import profile_columns
+
+
+def test_profile_eligibility_rules():
+    n = 20
+    df = pd.DataFrame(
+        {
+            "ResponseId": [f"R_{i}" for i in range(n)],
+            "Do you run a partner council?": ["Yes", "No"] * 10,
+            "How many partners?": np.arange(n),
+            "Which CRM do you use?": ["Salesforce", "Other"] * 10,
+            "Constant": ["x"] * n,
+            "Free text": [f"answer {i}" for i in range(n)],
+            "Empty": [None] * n,
+        }
+    )
+    profile = profile_columns(df).set_index("column")
+    eligible = profile.index[profile["eligible"]].tolist()
+    assert eligible == ["Do you run a partner council?"]
+    assert profile.loc["ResponseId", "skipped"]
+    assert profile.loc["Which CRM do you use?", "vendor"]
+    assert profile.loc["How many partners?", "numeric_ratio"] == 1.0
+    assert profile.loc["Free text", "n_unique"] == n
+    assert profile.loc["Empty", "non_null"] == 0
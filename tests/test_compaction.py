@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import EMPLOYEE_ORDER, REVENUE_ORDER, compact_dtypes, value_counts_pct
+
+REV = "What is your company’s estimated annual revenue?"
+EMP = "What is your company’s total number of employees?"
+WIN = "What’s your win rate for deals where partners are involved?"
+ROLE = "What roles exist on your Partner Team? PartnerOps"
+
+
+def make_df(n=200):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "ResponseId": [f"R_{i}" for i in range(n)],
+            REV: rng.choice(REVENUE_ORDER[::-1], n),
+            EMP: rng.choice(EMPLOYEE_ORDER[:2], n),
+            WIN: rng.integers(0, 100, n).astype(float),
+            ROLE: np.where(rng.random(n) < 0.5, 1.0, np.nan),
+            "Do you run a partner council?": rng.choice(["Yes", "No"], n),
+        }
+    )
+
+
+def test_compaction_dtypes_and_orderings():
+    out = compact_dtypes(make_df())
+    assert out["ResponseId"].dtype == object
+    assert out[REV].cat.ordered
+    assert list(out[REV].cat.categories) == REVENUE_ORDER
+    assert list(out[EMP].cat.categories) == EMPLOYEE_ORDER[:2]
+    assert out[WIN].dtype == np.float32
+    assert str(out[ROLE].dtype) == "UInt8"
+    assert out["Do you run a partner council?"].dtype == "category"
+
+
+def test_compaction_reports_smaller_footprint():
+    out = compact_dtypes(make_df())
+    mem = out.attrs["sopl_memory"]
+    assert mem["after_bytes"] < mem["before_bytes"]
+    assert mem["categorical"] == 3 and mem["uint8"] == 1 and mem["float32"] == 1
+
+
+def test_value_counts_unchanged_by_compaction():
+    raw = make_df()
+    out = compact_dtypes(raw)
+    for col in (REV, EMP, "Do you run a partner council?"):
+        subset = out[col].iloc[:20]
+        got = value_counts_pct(subset)
+        want = value_counts_pct(raw[col].iloc[:20])
+        assert dict(zip(got["category"], got["pct"])) == dict(zip(want["category"], want["pct"]))
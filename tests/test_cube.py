@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import FilterCube, binned_pct_custom, multi_select_to_pct, value_counts_pct
+
+PREFIX = "Which tools? "
+
+
+def make_df(n=400, seed=1):
+    rng = np.random.default_rng(seed)
+    regions = np.array(["Europe", "North America", "Asia Pacific", None], dtype=object)
+    return pd.DataFrame(
+        {
+            "RegionStd": rng.choice(regions, n),
+            "rev": rng.choice(["A", "B", "C"], n),
+            "emp": rng.choice(["S", "L"], n),
+            "q": rng.choice(["Yes", "No", "Maybe", None], n),
+            "num": rng.integers(0, 100, n).astype(float),
+            PREFIX + "CRM": np.where(rng.random(n) < 0.4, 1.0, np.nan),
+            PREFIX + "PRM": np.where(rng.random(n) < 0.2, 1.0, np.nan),
+        }
+    )
+
+
+def filtered(df, sel):
+    m = np.ones(len(df), dtype=bool)
+    for dim, col in (("region", "RegionStd"), ("revenue", "rev"), ("employees", "emp")):
+        if sel.get(dim):
+            m &= df[col].isin(sel[dim]).to_numpy()
+    return df[m]
+
+
+SELECTIONS = [
+    {},
+    {"region": ["Europe"]},
+    {"region": ["Europe", "Asia Pacific"], "revenue": ["B"]},
+    {"revenue": ["A", "C"], "employees": ["L"]},
+    {"region": ["Latin America"]},
+]
+
+
+def as_dict(frame, key):
+    return dict(zip(frame[key], frame["pct"]))
+
+
+def test_single_select_matches_value_counts():
+    df = make_df()
+    cube = FilterCube(df, {"region": "RegionStd", "revenue": "rev", "employees": "emp"})
+    for sel in SELECTIONS:
+        got = cube.pct(("vc", "q"), sel)
+        want = value_counts_pct(filtered(df, sel)["q"])
+        assert as_dict(got, "category") == as_dict(want, "category")
+
+
+def test_binned_matches_binned_pct_custom():
+    df = make_df()
+    cube = FilterCube(df, {"region": "RegionStd", "revenue": "rev", "employees": "emp"})
+    edges, labels = (0, 25, 50, 101), ("low", "mid", "high")
+    assert cube.ensure(("bin", "num", edges, labels))
+    for sel in SELECTIONS:
+        got = cube.pct(("bin", "num", edges, labels), sel)
+        want = binned_pct_custom(filtered(df, sel)["num"], list(edges), list(labels))
+        assert as_dict(got, "bin") == as_dict(want, "bin")
+
+
+def test_multi_select_matches_row_level():
+    df = make_df()
+    cube = FilterCube(df, {"region": "RegionStd", "revenue": "rev", "employees": "emp"}, [PREFIX])
+    cols = [c for c in df.columns if PREFIX in c]
+    for sel in SELECTIONS:
+        got = cube.pct(("multi", PREFIX), sel)
+        want = multi_select_to_pct(filtered(df, sel), cols)
+        assert as_dict(got, "category").keys() == as_dict(want, "category").keys()
+        for k, v in as_dict(want, "category").items():
+            assert np.isclose(as_dict(got, "category")[k], v)
+
+
+def test_unknown_specs_are_not_cubed():
+    cube = FilterCube(make_df(), {"region": "RegionStd"})
+    assert not cube.ensure(("bin_or_vc", "num", (0, 1), ("a",)))
+    assert not cube.ensure(("vc", "missing column"))
+
+
+def test_split_matches_one_filtered_pct_per_segment():
+    df = make_df()
+    cube = FilterCube(df, {"region": "RegionStd", "revenue": "rev", "employees": "emp"}, [PREFIX])
+    edges, labels = (0, 25, 50, 101), ("low", "mid", "high")
+    for spec in [("vc", "q"), ("bin", "num", edges, labels), ("multi", PREFIX)]:
+        assert cube.ensure(spec)
+        key = "bin" if spec[0] == "bin" else "category"
+        for sel in SELECTIONS:
+            for dim in ("region", "revenue"):
+                got = cube.split_pct(spec, sel, dim)
+                for segment in cube.dim_values[dim]:
+                    rows = got[got["segment"] == segment]
+                    if sel.get(dim) and segment not in sel[dim]:
+                        assert rows.empty
+                        continue
+                    want = as_dict(cube.pct(spec, {**sel, dim: [segment]}), key)
+                    assert {k: v for k, v in as_dict(rows, key).items() if v > 0 or k in want}.keys() == want.keys()
+                    for k, v in want.items():
+                        assert np.isclose(as_dict(rows, key)[k], v)
+
+
+def test_split_on_unknown_dimension_is_none():
+    cube = FilterCube(make_df(), {"region": "RegionStd"})
+    assert cube.split_pct(("vc", "q"), {}, "revenue") is None
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import FilterIndex
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "RegionStd": ["Europe", "North America", "Europe", None, "Asia Pacific"],
+            "rev": ["A", "B", "B", "A", None],
+            "emp": ["S", "S", "L", "L", "S"],
+        }
+    )
+
+
+def reference_rows(df, regions, revenue, employees):
+    flt = df
+    if regions:
+        flt = flt[flt["RegionStd"].isin(regions)]
+    if revenue:
+        flt = flt[flt["rev"].isin(revenue)]
+    if employees:
+        flt = flt[flt["emp"].isin(employees)]
+    return df.index.get_indexer(flt.index)
+
+
+def test_no_selection_returns_none():
+    idx = FilterIndex(make_df(), {"region": "RegionStd", "revenue": "rev", "employees": "emp"})
+    assert idx.rows({"region": None, "revenue": None, "employees": None}) is None
+
+
+def test_selection_matches_isin_chain():
+    df = make_df()
+    idx = FilterIndex(df, {"region": "RegionStd", "revenue": "rev", "employees": "emp"})
+    cases = [
+        (["Europe"], None, None),
+        (["Europe", "North America"], ["B"], None),
+        (None, ["A"], ["L"]),
+        (["Asia Pacific"], None, ["S"]),
+        (["Latin America"], None, None),
+    ]
+    for regions, revenue, employees in cases:
+        got = idx.rows({"region": regions, "revenue": revenue, "employees": employees})
+        np.testing.assert_array_equal(got, reference_rows(df, regions, revenue, employees))
+
+
+def test_options_skip_missing_values_and_columns():
+    idx = FilterIndex(make_df(), {"region": "RegionStd", "revenue": None})
+    assert sorted(idx.options("region")) == ["Asia Pacific", "Europe", "North America"]
+    assert idx.options("revenue") == []
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+UI_MODULES = ("streamlit", "altair", "vl_convert")
+
+
+def loaded_ui_modules(module: str) -> list[str]:
+    """UI/chart libraries in ``sys.modules`` after importing ``module`` in a fresh interpreter."""
+    code = f"import sys, {module}; print(*[m for m in {UI_MODULES!r} if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return out.stdout.split()
+
+
+@pytest.mark.parametrize("module", ["sopl_dashboard.core", "sopl_dashboard.api"])
+def test_headless_modules_import_without_ui_stack(module):
+    assert loaded_ui_modules(module) == []
+
+
+def test_charts_import_altair_on_first_spec():
+    assert loaded_ui_modules("sopl_dashboard.charts") == []
+
+
+def test_importing_app_draws_nothing():
+    code = (
+        "import streamlit as st\n"
+        "def boom(*a, **k): raise AssertionError('UI call at import')\n"
+        "st.set_page_config = st.markdown = boom\n"
+        "import app\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT, capture_output=True)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sopl_dashboard import core
+from sopl_dashboard.core import apply_response_delta, build_snapshot, parse_csv_bytes, refresh_snapshot
+from tests.synthetic import COL_REGION, COL_REVENUE, COL_WIN_RATE
+
+WIN_BINS = ("bin", COL_WIN_RATE, (0, 25, 50, 75, 101), ("0–25%", "26–50%", "51–75%", "76–100%"))
+
+
+def as_raw(df: pd.DataFrame) -> pd.DataFrame:
+    raw = parse_csv_bytes(df.to_csv(index=False).encode("utf-8"))
+    raw.attrs["sopl_version"] = str(pd.util.hash_pandas_object(raw).sum())
+    return raw
+
+
+@pytest.fixture
+def sheets(synthetic_sopl):
+    full = synthetic_sopl(400, seed=1)
+    before = full.iloc[:300].copy()
+    # in the later sheet: one response edited, one deleted, a brand-new region and revenue band
+    after = full.drop(index=[5]).copy()
+    after.loc[10, COL_REVENUE] = "Over $100B"
+    after.loc[350, COL_REGION] = "Antarctica"
+    return as_raw(before), as_raw(after)
+
+
+def by_category(frame: pd.DataFrame) -> dict:
+    cat_field = frame.columns[0]
+    return {str(k): round(float(v), 9) for k, v in zip(frame[cat_field], frame["pct"])}
+
+
+def assert_same_dataset(inc, full):
+    key = core.RESPONSE_ID_COL
+    assert sorted(inc.df[key]) == sorted(full.df[key])
+    assert inc.version == full.version
+    selections = [
+        {"region": None, "revenue": None, "employees": None},
+        {"region": ["Europe", "Antarctica"], "revenue": None, "employees": None},
+        {"region": None, "revenue": ["Over $100B", core.REVENUE_ORDER[0]], "employees": None},
+    ]
+    for sel in selections:
+        inc_rows, full_rows = inc.findex.rows(sel), full.findex.rows(sel)
+        if inc_rows is None:
+            assert full_rows is None
+            continue
+        assert sorted(inc.df[key].take(inc_rows)) == sorted(full.df[key].take(full_rows))
+    inc.cube.ensure(WIN_BINS)
+    full.cube.ensure(WIN_BINS)
+    assert set(full.cube.specs) <= set(inc.cube.specs)
+    for spec in full.cube.specs:
+        for sel in selections:
+            assert by_category(inc.cube.pct(spec, sel)) == by_category(full.cube.pct(spec, sel)), spec
+
+
+def test_delta_matches_full_rebuild(sheets):
+    before, after = sheets
+    base = build_snapshot(before)
+    base.cube.ensure(WIN_BINS)
+    inc = apply_response_delta(base, after)
+    assert inc is not None
+    assert inc.refresh["mode"] == "incremental"
+    assert (inc.refresh["added"], inc.refresh["changed"], inc.refresh["removed"]) == (100, 1, 1)
+    assert_same_dataset(inc, build_snapshot(after))
+    # the old snapshot is untouched and still serves its own version
+    assert len(base.df) == 300 and base.findex.n_rows == 300
+
+
+def test_unkeyable_sheet_falls_back_to_full_build(sheets):
+    before, after = sheets
+    base = build_snapshot(before)
+    assert apply_response_delta(base, after.drop(columns=core.RESPONSE_ID_COL)) is None
+    after.loc[1, core.RESPONSE_ID_COL] = after.loc[0, core.RESPONSE_ID_COL]
+    assert apply_response_delta(base, after) is None
+
+
+def test_refresh_with_unchanged_bytes_keeps_snapshot(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    raw_bytes = synthetic_sopl(50).to_csv(index=False).encode("utf-8")
+    snap = build_snapshot(core.load_from_bytes(raw_bytes))
+    assert refresh_snapshot(snap, raw_bytes) is snap
+    more = synthetic_sopl(60).to_csv(index=False).encode("utf-8")
+    new = refresh_snapshot(snap, more)
+    assert new.refresh["mode"] == "incremental" and new.refresh["added"] == 10
+    assert np.array_equal(new.df[core.RESPONSE_ID_COL].to_numpy()[:50], snap.df[core.RESPONSE_ID_COL].to_numpy())
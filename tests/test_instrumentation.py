@@ -0,0 +1,27 @@
+from sopl_dashboard.core import RerunProfile, profiling, timed, timed_stage
+
+
+def test_timed_is_noop_without_active_profile():
+    with timed("stage", rows=3) as rec:
+        rec["bytes"] = 10
+    assert rec["ms"] is None
+
+
+def test_timed_records_on_active_profile():
+    profile = RerunProfile()
+    with profiling(profile):
+        with timed("load", rows=5) as rec:
+            rec["bytes"] = 42
+
+        @timed_stage("decorated")
+        def work():
+            return "ok"
+
+        assert work() == "ok"
+    with timed("after"):
+        pass
+
+    frame = profile.to_frame()
+    assert frame["stage"].tolist() == ["load", "decorated"]
+    assert frame.loc[0, "rows"] == 5 and frame.loc[0, "bytes"] == 42
+    assert (frame["ms"] >= 0).all()
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pandas as pd
+
+from sopl_dashboard import core
+from sopl_dashboard.core import detect_encoding, load_from_bytes, parse_csv_bytes
+
+
+def test_detect_encoding_bom():
+    assert detect_encoding(b"\xef\xbb\xbfa,b\n1,2\n") == "utf-8-sig"
+
+
+def test_detect_encoding_utf8():
+    assert detect_encoding("col\ncompany’s\n".encode("utf-8")) == "utf-8"
+
+
+def test_detect_encoding_cp1252_smart_quotes():
+    assert detect_encoding(b"col\n\x93Hello\x94\n") == "cp1252"
+
+
+def test_detect_encoding_latin1_fallback():
+    # 0x81 is undefined in cp1252 and invalid utf-8
+    assert detect_encoding(b"col\n\x81\n") == "latin-1"
+
+
+def test_parse_csv_bytes_cp1252():
+    df = parse_csv_bytes(b"col\n\x93Hello\x94\n")
+    assert df.loc[0, "col"] == "“Hello”"
+
+
+def test_load_from_bytes_writes_and_reuses_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    raw = b"Region,Count\nEurope,1\nNorth America,2\n"
+    first = load_from_bytes(raw)
+    assert list(tmp_path.glob("*.parquet"))
+    assert core.latest_snapshot_meta()["key"] == core.dataset_version(first)
+
+    # Second load must come from the snapshot, not the parser
+    monkeypatch.setattr(core, "parse_csv_bytes", lambda *a, **k: pd.DataFrame())
+    second = load_from_bytes(raw)
+    pd.testing.assert_frame_equal(first, second)
+    assert core.dataset_version(second) == core.dataset_version(first)
+
+
+def test_old_snapshots_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(core, "SNAPSHOT_KEEP", 2)
+    first = load_from_bytes(b"Region\nEurope\n", partition="2024")
+    (tmp_path / f"sopl_{core.dataset_version(first)}.built-v0.pkl").write_bytes(b"old format")
+    (tmp_path / "sopl_0123456789abcdef.tmp").write_bytes(b"being written")
+    versions = [core.dataset_version(load_from_bytes(f"Region\nEurope\n{'APAC' * i}\n".encode())) for i in range(5)]
+    keys = {core._snapshot_key(p) for p in tmp_path.glob("sopl_*") if p.suffix != ".tmp"}
+    # both pointers' versions (the first, 2024, and the newest) plus the two next newest
+    assert keys == {core.dataset_version(first), *versions[-3:]}
+    assert not list(tmp_path.glob("*.built-v0.pkl"))
+    assert (tmp_path / "sopl_0123456789abcdef.tmp").exists()
+
+
+def test_snapshot_writes_go_through_unique_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    renamed = []
+    replace = core.os.replace
+
+    def recording_replace(src, dst):
+        renamed.append((Path(src).name, Path(dst).name))
+        replace(src, dst)
+
+    monkeypatch.setattr(core.os, "replace", recording_replace)
+    df = pd.DataFrame({"Region": ["Europe"]})
+    core.write_snapshot(df, "k", "utf-8")
+    core.write_snapshot(df, "k", "utf-8")
+    parquet_tmps = [src for src, dst in renamed if dst == core._snapshot_path("k").name]
+    assert len(set(parquet_tmps)) == 2
+    assert {dst for _, dst in renamed} == {core._snapshot_path("k").name, "latest.json"}
+    assert not list(tmp_path.glob("*.tmp"))
+    assert core.latest_snapshot_meta()["key"] == "k"
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import MultiSelectGroup, multi_select_to_pct
+
+COLS = ['Which tools? "CRM"', 'Which tools? "PRM"', 'Which tools? "BI"']
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            COLS[0]: [1.0, np.nan, 1.0, np.nan],
+            COLS[1]: ["1", "1", None, None],
+            COLS[2]: [np.nan, np.nan, np.nan, np.nan],
+        }
+    )
+
+
+def test_group_matrix_and_labels():
+    group = MultiSelectGroup.from_frame(make_df(), COLS)
+    assert group.matrix.dtype == np.uint8
+    assert group.matrix.flags["C_CONTIGUOUS"]
+    assert list(group.labels) == ["CRM", "PRM", "BI"]
+    assert list(group.answered) == [True, True, True, False]
+
+
+def test_counts_over_rows():
+    group = MultiSelectGroup.from_frame(make_df(), COLS)
+    counts, n_resp = group.counts(np.array([0, 1]))
+    assert list(counts) == [1, 2, 0]
+    assert n_resp == 2
+
+
+def test_multi_select_to_pct():
+    out = multi_select_to_pct(make_df(), COLS)
+    got = dict(zip(out["category"], out["pct"]))
+    assert got.keys() == {"CRM", "PRM", "BI"}
+    assert np.allclose([got["CRM"], got["PRM"], got["BI"]], [200 / 3, 200 / 3, 0.0])
+    assert out["pct"].is_monotonic_decreasing
+
+
+def test_no_respondents():
+    df = make_df().iloc[[3]]
+    assert multi_select_to_pct(df, COLS).empty
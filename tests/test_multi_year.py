@@ -0,0 +1,57 @@
+import json
+
+import pandas as pd
+
+from sopl_dashboard import charts, core
+from sopl_dashboard.charts import with_comparison
+from sopl_dashboard.core import ColumnCatalog, DatasetStore
+from tests.synthetic import COL_EXEC_EXPECT, COL_REVENUE
+
+
+def test_counterpart_follows_spec_keys_across_rewordings():
+    current = ColumnCatalog([COL_REVENUE, COL_EXEC_EXPECT, "RegionStd", "Only this year?"])
+    prior = ColumnCatalog(
+        [
+            "What is your company's estimated annual revenue (USD)?",
+            "How would you describe your executive teams expectations of partnerships?",
+            "RegionStd",
+        ]
+    )
+    assert current.counterpart(COL_EXEC_EXPECT, prior) == prior.columns[1]
+    assert current.counterpart("RegionStd", prior) == "RegionStd"
+    assert current.counterpart("Only this year?", prior) is None
+
+
+def test_with_comparison_tags_a_copy():
+    pct = pd.DataFrame({"category": ["A", "B"], "pct": [60.0, 40.0]})
+    prior = pd.DataFrame({"category": ["B", "C"], "pct": [70.0, 30.0]})
+    out = with_comparison(pct, prior, ("2025", "2024"))
+    assert out.attrs["compare"] == {"years": ("2025", "2024"), "prior": {"B": 70.0, "C": 30.0}}
+    assert "compare" not in pct.attrs
+    # survives the sorting and trimming the chart helpers do
+    assert out.sort_values("pct").iloc[:1].attrs["compare"]["years"] == ("2025", "2024")
+    assert with_comparison(pct, pd.DataFrame(columns=["category", "pct"]), ("2025", "2024")) is pct
+
+
+def test_comparison_spec_groups_bars_by_year():
+    rows = (("A", "2025", 60.0), ("A", "2024", 0.0), ("B", "2025", 40.0), ("B", "2024", 70.0))
+    spec = json.loads(charts.grouped_bar_chart_spec(rows, "category", "Year", "Primary goal", ("2025", "2024")))
+    assert spec["layer"][0]["encoding"]["yOffset"]["field"] == "Year"
+    assert spec["layer"][0]["encoding"]["color"]["scale"]["domain"] == ["2025", "2024"]
+
+
+def test_partitions_keep_separate_snapshots(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    sheets = {}
+    for year, n_rows in (("2025", 30), ("2024", 20)):
+        sheets[year] = tmp_path / f"{year}.csv"
+        sheets[year].write_bytes(synthetic_sopl(n_rows, seed=int(year)).to_csv(index=False).encode("utf-8"))
+        core.load_from_bytes(sheets[year].read_bytes(), partition=year)
+    assert core.latest_snapshot_meta("2025")["key"] != core.latest_snapshot_meta("2024")["key"]
+    assert core.latest_snapshot_meta() is None
+
+    store = DatasetStore(sheets["2024"].as_uri(), "2024", refresh_interval=0)
+    try:
+        assert len(store.current().df) == 20
+    finally:
+        store.stop()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard.core import (
+    NORMALIZATION_RULES,
+    add_derived_columns,
+    exec_expect_short,
+    known_budget,
+    normalize_answers,
+    normalize_region_label,
+    yes_no_label,
+)
+from tests.synthetic import COL_EXEC_EXPECT, COL_REGION
+
+
+def test_rules():
+    assert normalize_region_label("EMEA - Middle East & Africa") == "Europe"
+    assert exec_expect_short("High - growth engine") == "High"
+    assert exec_expect_short("Unsure") == "Unsure"
+    assert known_budget("I don’t have this data") is None
+    assert known_budget("i don't have this data") is None
+    assert known_budget("$100k-$1M") == "$100k-$1M"
+    assert [yes_no_label(v) for v in (1.0, 0, "YES ", "n", True, "Maybe")] == ["Yes", "No", "Yes", "No", "Yes", "Maybe"]
+
+
+def test_rules_run_once_per_distinct_answer():
+    series = pd.Series(["a - x", "b - y", None, "a - x", "a - z"] * 1000)
+    calls = []
+
+    def rule(answer):
+        calls.append(answer)
+        return exec_expect_short(answer)
+
+    out = normalize_answers(series, rule)
+    assert len(calls) == 3
+    assert isinstance(out.dtype, pd.CategoricalDtype)
+    assert out.astype(object).where(out.notna(), None).tolist() == [
+        exec_expect_short(v) if v is not None else None for v in series
+    ]
+
+
+def test_dropped_answers_become_missing():
+    out = normalize_answers(pd.Series(["$1M", "I don't have this data", np.nan], index=[5, 6, 7]), known_budget)
+    assert out.index.tolist() == [5, 6, 7]
+    assert out.isna().tolist() == [False, True, True]
+    assert list(out.cat.categories) == ["$1M"]
+
+
+def test_derived_columns_match_row_by_row_normalization(synthetic_sopl):
+    raw = synthetic_sopl(500)
+    df = add_derived_columns(raw.copy())
+    assert set(NORMALIZATION_RULES) <= set(df.columns)
+    expected = raw[COL_REGION].map(normalize_region_label)
+    assert df["RegionStd"].astype(object).fillna("-").tolist() == expected.fillna("-").tolist()
+    assert df["ExecExpectShort"].astype(object).tolist() == [exec_expect_short(v) for v in raw[COL_EXEC_EXPECT]]
@@ -0,0 +1,42 @@
+import pytest
+
+from sopl_dashboard import core
+from sopl_dashboard.precompute import precompute
+from tests.synthetic import COL_PRIMARY_GOAL
+
+
+def test_store_boots_from_precomputed_snapshot(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    sheet = tmp_path / "sopl.csv"
+    sheet.write_bytes(synthetic_sopl(200, seed=5).to_csv(index=False).encode("utf-8"))
+    summary = precompute(sheet.as_uri(), "2025")
+    assert summary["rows"] == 200 and summary["cubed_specs"] > 0
+    assert core.latest_snapshot_meta("2025")["key"] == summary["dataset_version"]
+
+    # never rebuilt from the parquet file when the prebuilt snapshot is there
+    monkeypatch.setattr(core, "build_snapshot", None)
+    sheet.unlink()  # nor fetched
+    store = core.DatasetStore(sheet.as_uri(), "2025", refresh_interval=0, max_age=1e9)
+    try:
+        snapshot = store.current()
+    finally:
+        store.stop()
+    assert snapshot.version == summary["dataset_version"]
+    assert snapshot.cube._df is snapshot.df
+    assert not snapshot.df[COL_PRIMARY_GOAL].array.codes.flags.writeable
+    spec = ("vc", COL_PRIMARY_GOAL)
+    assert snapshot.cube.pct(spec, {"region": ["Europe"]})["pct"].sum() == pytest.approx(100.0)
+
+
+def test_unreadable_prebuilt_snapshot_falls_back_to_parquet(tmp_path, monkeypatch, synthetic_sopl):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    sheet = tmp_path / "sopl.csv"
+    sheet.write_bytes(synthetic_sopl(50, seed=6).to_csv(index=False).encode("utf-8"))
+    version = precompute(sheet.as_uri())["dataset_version"]
+    core._built_snapshot_path(version).write_bytes(b"not a pickle")
+    assert core.read_built_snapshot(version) is None
+    store = core.DatasetStore(sheet.as_uri(), refresh_interval=0, max_age=1e9)
+    try:
+        assert len(store.current().df) == 50
+    finally:
+        store.stop()
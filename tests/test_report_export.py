@@ -0,0 +1,64 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+import app
+from sopl_dashboard import charts
+import report_export
+from report_export import build_report_zip, chart_filenames, make_pool
+
+
+def _charts():
+    bar = charts.bar_chart_spec((("Resellers", 60.0), ("Referral", 40.0)), "category", "Partner types", True)
+    donut = charts.donut_chart_spec((("Yes", 70.0), ("No", 30.0)), "category", "Uses AI?")
+    return [("Firmographics", "Partner types", bar), ("Technology & AI", "Uses AI?", donut)]
+
+
+def test_filenames_are_grouped_by_tab_in_render_order():
+    charts = [("Performance", "Win rate", ""), ("Performance", "Win rate", ""), ("Team & Investment", "Budget", "")]
+    assert chart_filenames(charts, "svg") == [
+        "01-performance/01-win-rate.svg",
+        "01-performance/02-win-rate.svg",
+        "02-team-investment/01-budget.svg",
+    ]
+
+
+def test_svg_zip_with_manifest():
+    data = build_report_zip(_charts(), "svg", manifest={"dataset_version": "abc"})
+    zf = zipfile.ZipFile(io.BytesIO(data))
+    manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["dataset_version"] == "abc" and manifest["format"] == "svg"
+    assert [c["title"] for c in manifest["charts"]] == ["Partner types", "Uses AI?"]
+    for entry in manifest["charts"]:
+        assert zf.read(entry["file"]).lstrip().startswith(b"<svg")
+
+
+def test_pool_renders_png_and_pdf():
+    pool = make_pool(2)
+    try:
+        for fmt, magic in (("png", b"\x89PNG"), ("pdf", b"%PDF")):
+            zf = zipfile.ZipFile(io.BytesIO(build_report_zip(_charts(), fmt, pool=pool)))
+            files = [n for n in zf.namelist() if n.endswith(f".{fmt}")]
+            assert len(files) == 2
+            assert all(zf.read(n).startswith(magic) for n in files)
+    finally:
+        pool.shutdown()
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        build_report_zip(_charts(), "gif")
+    assert make_pool(1) is None
+    assert report_export.REPORT_FORMATS == ("png", "svg", "pdf")
+
+
+def test_render_vega_spec_collects_instead_of_drawing():
+    collected = []
+    token = app._REPORT_COLLECTOR.set(collected)
+    try:
+        app.render_vega_spec('{"mark": "bar"}', "Some chart")
+    finally:
+        app._REPORT_COLLECTOR.reset(token)
+    assert collected == [("Some chart", '{"mark": "bar"}')]
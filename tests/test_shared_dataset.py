@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sopl_dashboard.core import RowSubset, add_derived_columns, compact_dtypes, freeze_frame
+
+REGION = "Please select the region where your company is headquartered."
+REV = "What is your company’s estimated annual revenue?"
+ROLE = "What roles exist on your Partner Team? PartnerOps"
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "ResponseId": ["R_1", "R_2", "R_3", "R_4"],
+            REGION: ["Europe", "North America (US, Canada)", None, "Europe"],
+            REV: ["Less than $50 million", "$50M – $250M", "Less than $50 million", None],
+            ROLE: [1.0, np.nan, 1.0, np.nan],
+            "Win rate": [10.0, 20.0, np.nan, 40.0],
+        }
+    )
+
+
+def test_frozen_frame_keeps_values_and_rejects_writes():
+    df = add_derived_columns(compact_dtypes(make_df()))
+    frozen = freeze_frame(df)
+    pd.testing.assert_frame_equal(frozen, df)
+    assert frozen.attrs == df.attrs
+    for col in frozen.columns:
+        with pytest.raises(ValueError, match="read-only"):
+            frozen.iloc[0, frozen.columns.get_loc(col)] = frozen.iloc[1, frozen.columns.get_loc(col)]
+
+
+def test_region_std_derived_at_load():
+    df = add_derived_columns(make_df())
+    assert df["RegionStd"].tolist()[:2] == ["Europe", "North America"]
+    assert df["RegionStd"].isna().tolist() == [False, False, True, False]
+
+
+def test_row_subset_gathers_only_requested_rows():
+    df = freeze_frame(make_df())
+    rows = np.array([0, 3])
+    view = RowSubset(df, rows)
+    assert len(view) == 2 and list(view.columns) == list(df.columns)
+    pd.testing.assert_series_equal(view["Win rate"], df["Win rate"].take(rows))
+    assert view["Win rate"] is view["Win rate"]
+    pd.testing.assert_frame_equal(view[[ROLE, REV]], df[[ROLE, REV]].take(rows))
+
+    unfiltered = RowSubset(df, None)
+    assert len(unfiltered) == 4
+    assert np.shares_memory(unfiltered["Win rate"].to_numpy(), df["Win rate"].to_numpy())
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from sopl_dashboard import core
+from sopl_dashboard.core import repair_replacement_chars, repair_text
+
+
+def test_repair_text_undoes_mojibake_and_markers():
+    assert repair_text("Whatâ€™s your win rate?") == "What’s your win rate?"
+    assert repair_text("$50M â€“ $250M") == "$50M – $250M"
+    assert repair_text("SÃ£o Paulo") == "São Paulo"
+    assert repair_text("﻿ResponseId") == "ResponseId"
+    assert repair_text("Hello�") == "Hello"
+    for clean in ("café", "Âge", "A – B", "naïve", "50+"):
+        assert repair_text(clean) == clean
+
+
+def test_repair_maps_uniques_back_and_counts_cells():
+    df = pd.DataFrame(
+        {
+            "﻿q": ["Whatâ€™s", None, "Whatâ€™s", "ok", np.nan, "x�"],
+            "num": [1, 2, 3, 4, 5, 6],
+            "clean": list("abcdef"),
+        }
+    )
+    out = repair_replacement_chars(df)
+    assert out is df
+    assert list(out.columns) == ["q", "num", "clean"]
+    assert out["q"].iloc[[0, 2, 3, 5]].tolist() == ["What’s", "What’s", "ok", "x"]
+    assert out["q"].iloc[1] is None and np.isnan(out["q"].iloc[4])
+    assert out.attrs["sopl_repairs"] == {"cells": 3, "columns": {"q": 3}}
+
+
+def test_mixed_encoding_export_is_repaired_on_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    # mostly UTF-8, but one stray cp1252 byte makes the whole file decode as cp1252
+    raw = "q\nWhat’s next\ncafé ".encode("utf-8") + b"\x96 bar\n"
+    assert core.detect_encoding(raw) == "cp1252"
+    df = core.load_from_bytes(raw)
+    assert df["q"].tolist() == ["What’s next", "café – bar"]
+    assert df.attrs["sopl_repairs"]["cells"] == 2
+
+
+def test_snapshots_from_an_older_parse_are_not_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_DIR", tmp_path)
+    raw = "q\nWhatâ€™s next\n".encode("utf-8")
+    key = core.content_hash(raw)
+    # what the pipeline before the repair pass wrote for these bytes
+    pd.DataFrame({"q": ["Whatâ€™s next"]}).to_parquet(tmp_path / f"sopl_{key}.parquet", index=False)
+    core.write_snapshot(pd.DataFrame({"q": ["Whatâ€™s next"]}), key, "utf-8")
+    monkeypatch.setattr(core, "PARSE_FORMAT", core.PARSE_FORMAT + 1)
+    df = core.load_from_bytes(raw)
+    assert df["q"].tolist() == ["What’s next"]
+    assert not (tmp_path / f"sopl_{key}.parquet").exists()